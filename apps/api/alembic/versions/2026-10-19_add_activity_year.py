@@ -0,0 +1,89 @@
+"""add activity year
+
+Revision ID: 9e3b5a71c4d8
+Revises: d2a84f6c0b19
+Create Date: 2026-10-19 15:20:52.904117
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e3b5a71c4d8"
+down_revision = "d2a84f6c0b19"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_year",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("year", sa.SmallInteger(), nullable=False),
+        sa.Column("completions", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("minutes", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("activity_year_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", "year", name=op.f("activity_year_pkey")),
+    )
+    # Backfill from history: one 366-slot array per user and year, completions
+    # and minutes bucketed by UTC day like the incremental updates.
+    op.execute(
+        """
+        WITH activity AS (
+            SELECT user_id,
+                   date(timezone('UTC', completed_at)) AS day,
+                   count(*) AS completions,
+                   0 AS minutes
+            FROM node_completion
+            GROUP BY 1, 2
+            UNION ALL
+            SELECT user_id,
+                   date(timezone('UTC', started_at)) AS day,
+                   0 AS completions,
+                   sum(duration_min) AS minutes
+            FROM time_entry
+            WHERE duration_min IS NOT NULL
+            GROUP BY 1, 2
+        ),
+        per_day AS (
+            SELECT user_id, day, sum(completions) AS completions,
+                   sum(minutes) AS minutes
+            FROM activity
+            GROUP BY 1, 2
+        ),
+        years AS (
+            SELECT DISTINCT user_id, extract(year FROM day)::int AS year
+            FROM per_day
+        )
+        INSERT INTO activity_year (user_id, year, completions, minutes)
+        SELECT years.user_id,
+               years.year,
+               array_agg(coalesce(per_day.completions, 0)::int ORDER BY slot),
+               array_agg(coalesce(per_day.minutes, 0)::int ORDER BY slot)
+        FROM years
+        CROSS JOIN generate_series(1, 366) AS slot
+        LEFT JOIN per_day
+            ON per_day.user_id = years.user_id
+            AND per_day.day = make_date(years.year, 1, 1) + (slot - 1)
+            AND extract(year FROM per_day.day) = years.year
+        GROUP BY years.user_id, years.year
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activity_year")
@@ -0,0 +1,67 @@
+"""add attachment uploads
+
+Revision ID: 6e2a9c4f1b83
+Revises: 3b8f1c6e2d47
+Create Date: 2026-10-19 23:48:31.502917
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6e2a9c4f1b83"
+down_revision = "3b8f1c6e2d47"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attachment_upload",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("attachment_upload_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            "user_id", "sha256", name=op.f("attachment_upload_pkey")
+        ),
+    )
+    # Uploads pending before this revision, so the first sweep sees them.
+    op.execute(
+        """
+        INSERT INTO attachment_upload (user_id, sha256, created_at)
+        SELECT a.user_id, a.sha256, max(a.created_at)
+        FROM doc_attachment a
+        WHERE a.status = 'PENDING'
+          AND NOT EXISTS (
+            SELECT 1 FROM attachment_blob b
+            WHERE b.user_id = a.user_id AND b.sha256 = a.sha256
+          )
+        GROUP BY a.user_id, a.sha256
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO job (kind, user_id)
+        SELECT DISTINCT 'attachments.sweep_uploads', user_id
+        FROM attachment_upload
+        ON CONFLICT DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM job WHERE kind = 'attachments.sweep_uploads'")
+    op.drop_table("attachment_upload")
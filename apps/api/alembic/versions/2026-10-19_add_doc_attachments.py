@@ -0,0 +1,99 @@
+"""add doc attachments
+
+Revision ID: 8c1f4e2a9d07
+Revises: 333542ef649c
+Create Date: 2026-10-19 09:12:44.118204
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c1f4e2a9d07"
+down_revision = "333542ef649c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "attachment_blob",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("storage_key", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("attachment_blob_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("user_id", "sha256", name=op.f("attachment_blob_pkey")),
+    )
+    op.create_table(
+        "doc_attachment",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("doc_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("filename", sa.Text(), nullable=False),
+        sa.Column("content_type", sa.Text(), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "READY", name="attachment_status"),
+            server_default="PENDING",
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["doc_id"],
+            ["doc.id"],
+            name=op.f("doc_attachment_doc_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("doc_attachment_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("doc_attachment_pkey")),
+    )
+    op.create_index(
+        "idx_doc_attachment_doc", "doc_attachment", ["doc_id"], unique=False
+    )
+    op.create_index(
+        "idx_doc_attachment_blob",
+        "doc_attachment",
+        ["user_id", "sha256"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_doc_attachment_blob", table_name="doc_attachment")
+    op.drop_index("idx_doc_attachment_doc", table_name="doc_attachment")
+    op.drop_table("doc_attachment")
+    op.drop_table("attachment_blob")
+    postgresql.ENUM(name="attachment_status").drop(op.get_bind(), checkfirst=True)
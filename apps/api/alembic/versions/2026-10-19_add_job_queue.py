@@ -0,0 +1,66 @@
+"""add job queue
+
+Revision ID: 77b78e44e82a
+Revises: 1f6a0d3b8e52
+Create Date: 2026-10-19 18:05:31.447210
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "77b78e44e82a"
+down_revision = "1f6a0d3b8e52"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("kind", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "run_after",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["user.id"],
+            name=op.f("job_user_id_fkey"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("job_pkey")),
+    )
+    op.create_index(
+        "idx_job_pending",
+        "job",
+        ["kind", "user_id"],
+        unique=True,
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+    )
+    op.create_index("idx_job_run_after", "job", ["run_after"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("idx_job_run_after", table_name="job")
+    op.drop_index(
+        "idx_job_pending",
+        table_name="job",
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+    )
+    op.drop_table("job")
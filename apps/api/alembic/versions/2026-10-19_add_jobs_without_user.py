@@ -0,0 +1,51 @@
+"""add jobs without user
+
+Revision ID: 3b8f1c6e2d47
+Revises: 9d41b7e3a6c2
+Create Date: 2026-10-19 23:12:05.318442
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3b8f1c6e2d47"
+down_revision = "9d41b7e3a6c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.alter_column("job", "user_id", existing_type=sa.UUID(), nullable=True)
+    op.drop_index(
+        "idx_job_pending",
+        table_name="job",
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+    )
+    op.create_index(
+        "idx_job_pending",
+        "job",
+        ["kind", "user_id"],
+        unique=True,
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM job WHERE user_id IS NULL")
+    op.drop_index(
+        "idx_job_pending",
+        table_name="job",
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+    )
+    op.create_index(
+        "idx_job_pending",
+        "job",
+        ["kind", "user_id"],
+        unique=True,
+        postgresql_where=sa.text("locked_at IS NULL AND attempts = 0"),
+    )
+    op.alter_column("job", "user_id", existing_type=sa.UUID(), nullable=False)
@@ -0,0 +1,66 @@
+"""add node counters
+
+Revision ID: 9d41b7e3a6c2
+Revises: 5c2e9a71d4f0
+Create Date: 2026-10-19 21:40:17.206318
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9d41b7e3a6c2"
+down_revision = "5c2e9a71d4f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "node",
+        sa.Column("completion_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "node",
+        sa.Column("last_completed_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column(
+        "node",
+        sa.Column("tracked_minutes", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Backfill once; afterwards the completion and time tracking services
+    # keep the counters current.
+    op.execute(
+        """
+        UPDATE node
+        SET completion_count = completions.total,
+            last_completed_at = completions.last_completed_at
+        FROM (
+            SELECT node_id, count(*) AS total, max(completed_at) AS last_completed_at
+            FROM node_completion
+            GROUP BY node_id
+        ) AS completions
+        WHERE node.id = completions.node_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE node
+        SET tracked_minutes = entries.minutes
+        FROM (
+            SELECT node_id, sum(duration_min) AS minutes
+            FROM time_entry
+            WHERE duration_min IS NOT NULL
+            GROUP BY node_id
+        ) AS entries
+        WHERE node.id = entries.node_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("node", "tracked_minutes")
+    op.drop_column("node", "last_completed_at")
+    op.drop_column("node", "completion_count")
@@ -0,0 +1,54 @@
+"""add track counters
+
+Revision ID: 5c2e9a71d4f0
+Revises: 77b78e44e82a
+Create Date: 2026-10-19 20:12:08.913544
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5c2e9a71d4f0"
+down_revision = "77b78e44e82a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "track",
+        sa.Column("node_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "track",
+        sa.Column("completion_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    # Backfill once; afterwards the node and completion services keep the
+    # counters current.
+    op.execute(
+        """
+        UPDATE track
+        SET node_count = counts.nodes,
+            completion_count = counts.completions
+        FROM (
+            SELECT node.track_id,
+                   count(DISTINCT node.id) AS nodes,
+                   count(node_completion.id) AS completions
+            FROM node
+            JOIN track ON track.id = node.track_id
+            LEFT JOIN node_completion
+                ON node_completion.node_id = node.id
+                AND node_completion.user_id = track.user_id
+            GROUP BY node.track_id
+        ) AS counts
+        WHERE track.id = counts.track_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("track", "completion_count")
+    op.drop_column("track", "node_count")
@@ -0,0 +1,30 @@
+"""index completions by user and time
+
+Revision ID: 4b7d2c9e1f30
+Revises: 8c1f4e2a9d07
+Create Date: 2026-10-19 11:03:27.540931
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4b7d2c9e1f30"
+down_revision = "8c1f4e2a9d07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_completion_user_completed_at",
+        "node_completion",
+        ["user_id", "completed_at"],
+        unique=False,
+    )
+    op.drop_index("idx_completion_user", table_name="node_completion")
+
+
+def downgrade() -> None:
+    op.create_index("idx_completion_user", "node_completion", ["user_id"], unique=False)
+    op.drop_index("idx_completion_user_completed_at", table_name="node_completion")
@@ -0,0 +1,28 @@
+"""index user stats by xp
+
+Revision ID: d2a84f6c0b19
+Revises: 4b7d2c9e1f30
+Create Date: 2026-10-19 13:41:08.275316
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d2a84f6c0b19"
+down_revision = "4b7d2c9e1f30"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_user_stats_xp",
+        "user_stats",
+        ["xp_total", "user_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_user_stats_xp", table_name="user_stats")
@@ -0,0 +1,98 @@
+"""unique active time entry
+
+Revision ID: 1f6a0d3b8e52
+Revises: 9e3b5a71c4d8
+Create Date: 2026-10-19 16:48:13.602871
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1f6a0d3b8e52"
+down_revision = "9e3b5a71c4d8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Close all but the latest running timer of each user; the older ones end
+    # when the latest one was started.
+    close_duplicates = sa.text(
+        """
+        WITH closed AS (
+            UPDATE time_entry
+            SET ended_at = greatest(time_entry.started_at, latest.started_at)
+            FROM (
+                SELECT DISTINCT ON (user_id) id, user_id, started_at
+                FROM time_entry
+                WHERE ended_at IS NULL
+                ORDER BY user_id, started_at DESC, id
+            ) AS latest
+            WHERE time_entry.user_id = latest.user_id
+              AND time_entry.ended_at IS NULL
+              AND time_entry.id <> latest.id
+            RETURNING time_entry.user_id,
+                      date(timezone('UTC', time_entry.started_at)) AS day,
+                      time_entry.duration_min
+        )
+        SELECT user_id, day, sum(duration_min)::int AS minutes
+        FROM closed
+        GROUP BY 1, 2
+        HAVING sum(duration_min) > 0
+        """
+    )
+    bind = op.get_bind()
+    closed = bind.execute(close_duplicates).all()
+    # activity_year was backfilled while these were running; add their minutes
+    # to the day they started, like stopping a timer does.
+    add_minutes = sa.text(
+        """
+        INSERT INTO activity_year (user_id, year, completions, minutes)
+        VALUES (
+            :user_id,
+            :year,
+            array_fill(0, ARRAY[366]),
+            array_fill(0, ARRAY[:slot - 1])
+                || ARRAY[:minutes]
+                || array_fill(0, ARRAY[366 - :slot])
+        )
+        ON CONFLICT (user_id, year) DO UPDATE
+        SET minutes = activity_year.minutes[1 : :slot - 1]
+                || ARRAY[activity_year.minutes[:slot] + :minutes]
+                || activity_year.minutes[:slot + 1 : 366],
+            updated_at = now()
+        """
+    ).bindparams(
+        sa.bindparam("user_id", type_=sa.UUID()),
+        sa.bindparam("year", type_=sa.SmallInteger()),
+        sa.bindparam("slot", type_=sa.Integer()),
+        sa.bindparam("minutes", type_=sa.Integer()),
+    )
+    for row in closed:
+        bind.execute(
+            add_minutes,
+            {
+                "user_id": row.user_id,
+                "year": row.day.year,
+                "slot": row.day.timetuple().tm_yday,
+                "minutes": row.minutes,
+            },
+        )
+    op.create_index(
+        "idx_time_entry_active",
+        "time_entry",
+        ["user_id"],
+        unique=True,
+        postgresql_where=sa.text("ended_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_time_entry_active",
+        table_name="time_entry",
+        postgresql_where=sa.text("ended_at IS NULL"),
+    )
@@ -0,0 +1,159 @@
+"""End-to-end HTTP benchmark of the API.
+
+    python -m benchmarks [--users N] [--concurrency N] [--duration SEC] \\
+        [--json out.json] [--baseline previous.json]
+
+Boots ``src.main:app`` under uvicorn against the database configured in the
+environment (or targets ``--base-url``), seeds benchmark users through the
+API and drives scripted user journeys with ``--concurrency`` virtual users.
+Reports throughput and p50/p95/p99 latency per endpoint; ``--json`` writes
+the report for comparing commits with ``--baseline``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import subprocess
+import time
+from collections.abc import Sequence
+from contextlib import nullcontext
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.journeys import ApiClient, UserJourney
+from benchmarks.report import Recorder, compare, format_report, load_report
+from benchmarks.seed import seed_users
+from benchmarks.server import serve
+
+logger = logging.getLogger("benchmarks")
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(base_url: str, args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency + args.seed_concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        started = time.perf_counter()
+        users = await seed_users(
+            client,
+            users=args.users,
+            tracks_per_user=args.tracks,
+            nodes_per_track=args.nodes,
+            completions_per_user=args.completions,
+            concurrency=args.seed_concurrency,
+            rng=rng,
+        )
+        logger.info(
+            "Seeded %d users in %.1fs", len(users), time.perf_counter() - started
+        )
+
+        recorder = Recorder()
+        journeys = [
+            UserJourney(
+                ApiClient(client, recorder),
+                users[index % len(users)],
+                complete_ratio=args.complete_ratio,
+                think_time=args.think_ms / 1000,
+                iterations_per_session=args.iterations_per_session,
+                rng=random.Random(rng.random()),
+            )
+            for index in range(args.concurrency)
+        ]
+        deadline = time.monotonic() + args.warmup + args.duration
+        tasks = [asyncio.create_task(journey.run(deadline)) for journey in journeys]
+        if args.warmup:
+            await asyncio.sleep(args.warmup)
+            recorder.reset()
+            logger.info("Warm-up done, measuring for %ss", args.duration)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        recorder.stop()
+
+    failed = [result for result in results if isinstance(result, BaseException)]
+    for error in failed[:5]:
+        logger.error("Virtual user failed: %r", error)
+    return recorder.report(
+        {
+            "commit": _git_commit(),
+            "started_at": datetime.now(UTC).isoformat(),
+            "base_url": base_url,
+            "workers": None if args.base_url else args.workers,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "duration_sec": args.duration,
+            "warmup_sec": args.warmup,
+            "think_ms": args.think_ms,
+            "failed_virtual_users": len(failed),
+        }
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_argument_group("target")
+    target.add_argument("--base-url", help="benchmark a running server instead")
+    target.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    data = parser.add_argument_group("data")
+    data.add_argument("--users", type=int, default=20)
+    data.add_argument("--tracks", type=int, default=5, help="tracks per user")
+    data.add_argument("--nodes", type=int, default=20, help="nodes per track")
+    data.add_argument(
+        "--completions",
+        type=int,
+        default=50,
+        help="completions seeded per new user",
+    )
+    data.add_argument("--seed-concurrency", type=int, default=8)
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", type=int, help="virtual users (default: users)")
+    load.add_argument("--duration", type=float, default=30, help="seconds measured")
+    load.add_argument("--warmup", type=float, default=5, help="seconds not measured")
+    load.add_argument("--think-ms", type=float, default=0, help="mean think time")
+    load.add_argument("--complete-ratio", type=float, default=0.3)
+    load.add_argument("--iterations-per-session", type=int, default=10)
+    load.add_argument("--timeout", type=float, default=30, help="request timeout")
+    load.add_argument("--seed", type=int, default=1, help="random seed")
+    output = parser.add_argument_group("output")
+    output.add_argument("--json", type=Path, help="write the report to this file")
+    output.add_argument("--baseline", type=Path, help="report to compare against")
+    args = parser.parse_args(argv)
+    args.concurrency = args.concurrency or args.users
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    server = (
+        nullcontext(args.base_url) if args.base_url else serve(workers=args.workers)
+    )
+    with server as base_url:
+        report = asyncio.run(run_benchmark(base_url, args))
+
+    print(format_report(report))
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        print()
+        print(compare(load_report(args.baseline), report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,609 @@
+"""Bulk-load a synthetic dataset with ``COPY FROM STDIN``.
+
+    python -m benchmarks.dataset --users 1000 [--completions 2000] [--seed 1]
+
+Writes users with refresh sessions, tracks, nodes, habit schedules,
+completions, time entries, docs, badges and the derived ``user_stats``,
+``activity_year`` and track and node counters, in transactions of
+``--batch-users`` users. Per-user volumes are drawn around the given means;
+completions, time entries and refresh sessions follow a log-normal
+distribution (``--skew``), so a few users have far more history than the
+rest, as in production.
+
+Users are ``bench-NNNNNN@example.com`` with the benchmark password, so
+``python -m benchmarks`` reuses them instead of seeding its own.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID, uuid4
+
+import numpy as np
+from fastapi_users.password import PasswordHelper
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from benchmarks.journeys import PASSWORD, bench_email
+from src.auth.models import User
+from src.badges.models import Badge
+from src.badges.services import BADGE_RULES, BadgeCategory
+from src.database import engine
+from src.gamification.recompute import summarize
+from src.leaderboard.services import drop_leaderboards
+from src.nodes.models import HabitFrequency, NodeType
+
+__all__ = ["DatasetShape", "generate_dataset"]
+
+logger = logging.getLogger(__name__)
+
+# Columns written per table, in COPY order; generated columns are left out.
+COLUMNS: dict[str, tuple[str, ...]] = {
+    "user": (
+        "id",
+        "email",
+        "hashed_password",
+        "is_active",
+        "is_superuser",
+        "is_verified",
+        "full_name",
+        "created_at",
+        "updated_at",
+    ),
+    "refresh_session": (
+        "id",
+        "user_id",
+        "token_hash",
+        "user_agent",
+        "ip",
+        "created_at",
+        "expires_at",
+        "revoked_at",
+    ),
+    "track": ("id", "user_id", "name", "color", "position", "created_at"),
+    "node": (
+        "id",
+        "track_id",
+        "type",
+        "title",
+        "base_xp",
+        "is_locked",
+        "position",
+        "created_at",
+    ),
+    "habit_schedule": ("node_id", "frequency", "meta"),
+    "node_completion": (
+        "id",
+        "user_id",
+        "node_id",
+        "completed_at",
+        "source",
+        "earned_xp",
+    ),
+    "time_entry": ("id", "user_id", "node_id", "started_at", "ended_at"),
+    "doc": (
+        "id",
+        "user_id",
+        "track_id",
+        "node_id",
+        "title",
+        "content_md",
+        "created_at",
+    ),
+    "user_stats": (
+        "user_id",
+        "level",
+        "xp_total",
+        "current_streak_days",
+        "last_active_date",
+    ),
+    "user_badge": ("user_id", "badge_id", "awarded_at"),
+}
+
+# Same aggregation as the activity_year backfill migration, for one batch.
+ACTIVITY_YEARS_SQL = """
+WITH activity AS (
+    SELECT user_id, date(timezone('UTC', completed_at)) AS day,
+           count(*) AS completions, 0 AS minutes
+    FROM node_completion WHERE user_id = ANY($1::uuid[])
+    GROUP BY 1, 2
+    UNION ALL
+    SELECT user_id, date(timezone('UTC', started_at)) AS day,
+           0 AS completions, sum(duration_min) AS minutes
+    FROM time_entry
+    WHERE user_id = ANY($1::uuid[]) AND duration_min IS NOT NULL
+    GROUP BY 1, 2
+),
+per_day AS (
+    SELECT user_id, day, sum(completions) AS completions, sum(minutes) AS minutes
+    FROM activity GROUP BY 1, 2
+),
+years AS (
+    SELECT DISTINCT user_id, extract(year FROM day)::int AS year FROM per_day
+)
+INSERT INTO activity_year (user_id, year, completions, minutes)
+SELECT years.user_id,
+       years.year,
+       array_agg(coalesce(per_day.completions, 0)::int ORDER BY slot),
+       array_agg(coalesce(per_day.minutes, 0)::int ORDER BY slot)
+FROM years
+CROSS JOIN generate_series(1, 366) AS slot
+LEFT JOIN per_day
+    ON per_day.user_id = years.user_id
+    AND per_day.day = make_date(years.year, 1, 1) + (slot - 1)
+    AND extract(year FROM per_day.day) = years.year
+GROUP BY years.user_id, years.year
+"""
+
+# Same counts as the counter backfill migrations, for one batch.
+TRACK_COUNTERS_SQL = """
+UPDATE track
+SET node_count = counts.nodes, completion_count = counts.completions
+FROM (
+    SELECT node.track_id, count(DISTINCT node.id) AS nodes,
+           count(node_completion.id) AS completions
+    FROM node
+    JOIN track ON track.id = node.track_id
+    LEFT JOIN node_completion
+        ON node_completion.node_id = node.id
+        AND node_completion.user_id = track.user_id
+    WHERE track.user_id = ANY($1::uuid[])
+    GROUP BY node.track_id
+) AS counts
+WHERE track.id = counts.track_id
+"""
+
+NODE_COUNTERS_SQL = """
+UPDATE node
+SET completion_count = (
+        SELECT count(*) FROM node_completion WHERE node_id = node.id
+    ),
+    last_completed_at = (
+        SELECT max(completed_at) FROM node_completion WHERE node_id = node.id
+    ),
+    tracked_minutes = (
+        SELECT coalesce(sum(duration_min), 0) FROM time_entry
+        WHERE node_id = node.id
+    )
+FROM track
+WHERE node.track_id = track.id AND track.user_id = ANY($1::uuid[])
+"""
+
+TRACK_COLORS = ("#ef4444", "#f59e0b", "#10b981", "#3b82f6", "#8b5cf6", None)
+NODE_TYPES = (NodeType.TASK, NodeType.FOCUS_SESSION, NodeType.MILESTONE)
+FREQUENCIES = tuple(HabitFrequency)
+BASE_XP_CHOICES = np.array([5, 10, 10, 20, 50])
+SESSION_TTL = timedelta(days=30)
+
+
+@dataclass(frozen=True, slots=True)
+class DatasetShape:
+    """Mean volumes per user (per track for nodes)."""
+
+    tracks: float = 5
+    nodes: float = 40
+    completions: float = 500
+    time_entries: float = 300
+    refresh_sessions: float = 20
+    docs: float = 10
+    habit_ratio: float = 0.3
+    locked_ratio: float = 0.1
+    skew: float = 1.0
+    history_days: int = 365
+
+
+def _heavy_tailed(
+    rng: np.random.Generator,
+    mean: float,
+    skew: float,
+    size: int,
+) -> np.ndarray:
+    """Non-negative counts averaging ``mean``; larger ``skew``, longer tail."""
+    if mean <= 0:
+        return np.zeros(size, dtype=np.int64)
+    mu = np.log(mean) - skew**2 / 2
+    return np.rint(rng.lognormal(mu, skew, size)).astype(np.int64)
+
+
+def _random_times(
+    rng: np.random.Generator,
+    now: datetime,
+    history_days: int,
+    size: int,
+) -> list[datetime]:
+    """``size`` ascending timestamps within the last ``history_days``."""
+    seconds = np.sort(rng.uniform(0, history_days * 86_400, size))[::-1]
+    return [now - timedelta(seconds=float(offset)) for offset in seconds]
+
+
+class _Batch:
+    """Rows of one batch of users, keyed by table."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, list[tuple]] = {table: [] for table in COLUMNS}
+        self.user_ids: list[UUID] = []
+        # Completion rows ordered by user and time, for summarize().
+        self.completion_users: list[int] = []
+        self.completion_days: list[int] = []
+        self.completion_xp: list[int] = []
+        self.minutes: list[int] = []
+
+
+def _generate_user(
+    batch: _Batch,
+    index: int,
+    *,
+    shape: DatasetShape,
+    rng: np.random.Generator,
+    now: datetime,
+    password_hash: str,
+) -> None:
+    user_id = uuid4()
+    slot = len(batch.user_ids)
+    batch.user_ids.append(user_id)
+    joined = now - timedelta(days=shape.history_days + float(rng.uniform(0, 30)))
+    batch.rows["user"].append(
+        (
+            user_id,
+            bench_email(index),
+            password_hash,
+            True,
+            False,
+            True,
+            f"Bench User {index}",
+            joined,
+            joined,
+        )
+    )
+
+    sessions = _heavy_tailed(rng, shape.refresh_sessions, shape.skew, 1)[0]
+    for position, created_at in enumerate(_random_times(rng, now, 60, sessions)):
+        # Sessions are rotated, so all but the newest one are revoked.
+        newest = position == sessions - 1
+        revoked_at = None if newest else created_at + timedelta(hours=1)
+        batch.rows["refresh_session"].append(
+            (
+                uuid4(),
+                user_id,
+                secrets.token_hex(32),
+                "benchmarks",
+                "127.0.0.1",
+                created_at,
+                created_at + SESSION_TTL,
+                revoked_at,
+            )
+        )
+
+    tracks: list[UUID] = []
+    nodes: list[tuple[UUID, UUID, int, bool]] = []  # id, track, base xp, locked
+    for position in range(max(1, rng.poisson(shape.tracks))):
+        track_id = uuid4()
+        tracks.append(track_id)
+        batch.rows["track"].append(
+            (
+                track_id,
+                user_id,
+                f"Track {position + 1}",
+                TRACK_COLORS[position % len(TRACK_COLORS)],
+                position,
+                joined,
+            )
+        )
+        for node_position in range(rng.poisson(shape.nodes)):
+            node_id = uuid4()
+            is_habit = rng.random() < shape.habit_ratio
+            node_type = (
+                NodeType.HABIT
+                if is_habit
+                else NODE_TYPES[rng.integers(0, len(NODE_TYPES))]
+            )
+            base_xp = int(rng.choice(BASE_XP_CHOICES))
+            is_locked = bool(rng.random() < shape.locked_ratio)
+            nodes.append((node_id, track_id, base_xp, is_locked))
+            batch.rows["node"].append(
+                (
+                    node_id,
+                    track_id,
+                    node_type.value,
+                    f"Node {node_position + 1}",
+                    base_xp,
+                    is_locked,
+                    node_position,
+                    joined,
+                )
+            )
+            if is_habit:
+                batch.rows["habit_schedule"].append((node_id, *_schedule(rng)))
+
+    unlocked = [node for node in nodes if not node[3]]
+    count = _heavy_tailed(rng, shape.completions, shape.skew, 1)[0]
+    if unlocked and count:
+        picks = rng.integers(0, len(unlocked), count)
+        sources = rng.random(count) < 0.8
+        times = _random_times(rng, now, shape.history_days, count)
+        for pick, manual, completed_at in zip(picks, sources, times):
+            node_id, _, base_xp, _ = unlocked[pick]
+            batch.rows["node_completion"].append(
+                (
+                    uuid4(),
+                    user_id,
+                    node_id,
+                    completed_at,
+                    "MANUAL" if manual else "SESSION",
+                    base_xp,
+                )
+            )
+            batch.completion_users.append(slot)
+            batch.completion_days.append(
+                int(completed_at.timestamp() // 86_400),
+            )
+            batch.completion_xp.append(base_xp)
+
+    minutes = 0
+    count = _heavy_tailed(rng, shape.time_entries, shape.skew, 1)[0]
+    if nodes and count:
+        picks = rng.integers(0, len(nodes), count)
+        durations = rng.integers(5, 121, count)
+        starts = _random_times(rng, now, shape.history_days, count)
+        for pick, duration, started_at in zip(picks, durations, starts):
+            batch.rows["time_entry"].append(
+                (
+                    uuid4(),
+                    user_id,
+                    nodes[pick][0],
+                    started_at,
+                    started_at + timedelta(minutes=int(duration)),
+                )
+            )
+        minutes = int(durations.sum())
+    batch.minutes.append(minutes)
+
+    for position in range(rng.poisson(shape.docs)):
+        track_id = tracks[rng.integers(0, len(tracks))]
+        track_nodes = [node[0] for node in nodes if node[1] == track_id]
+        node_id = (
+            track_nodes[rng.integers(0, len(track_nodes))]
+            if track_nodes and rng.random() < 0.5
+            else None
+        )
+        batch.rows["doc"].append(
+            (
+                uuid4(),
+                user_id,
+                track_id,
+                node_id,
+                f"Notes {position + 1}",
+                "# Notes\n\n" + "Lorem ipsum dolor sit amet. " * 20,
+                joined,
+            )
+        )
+
+
+def _schedule(rng: np.random.Generator) -> tuple[str, str | None]:
+    frequency = FREQUENCIES[rng.integers(0, len(FREQUENCIES))]
+    if frequency == HabitFrequency.WEEKLY:
+        days = sorted(rng.choice(7, rng.integers(1, 6), replace=False).tolist())
+        return frequency.value, json.dumps({"days_of_week": days})
+    if frequency == HabitFrequency.MONTHLY:
+        days = sorted(rng.choice(np.arange(1, 29), 2, replace=False).tolist())
+        return frequency.value, json.dumps({"days_of_month": days})
+    return frequency.value, None
+
+
+def _add_stats_and_badges(
+    batch: _Batch,
+    badges: dict[str, UUID],
+    now: datetime,
+) -> None:
+    completions = np.bincount(
+        np.array(batch.completion_users, dtype=np.int64),
+        minlength=len(batch.user_ids),
+    )
+    stats = summarize(
+        np.array(batch.completion_users, dtype=np.int64),
+        np.array(batch.completion_days, dtype=np.int64),
+        np.array(batch.completion_xp, dtype=np.int64),
+    )
+    summarized = {
+        int(slot): (int(level), int(xp), int(streak), int(day))
+        for slot, level, xp, streak, day in zip(
+            stats.user_ids,
+            stats.level,
+            stats.xp_total,
+            stats.current_streak_days,
+            stats.last_active_day,
+        )
+    }
+    for slot, user_id in enumerate(batch.user_ids):
+        level, xp, streak, day = summarized.get(slot, (1, 0, 0, None))
+        last_active = (
+            datetime.fromtimestamp(day * 86_400, UTC).date()
+            if day is not None
+            else None
+        )
+        batch.rows["user_stats"].append((user_id, level, xp, streak, last_active))
+
+        progress = {
+            BadgeCategory.STREAK: streak,
+            BadgeCategory.COMPLETION: int(completions[slot]),
+            BadgeCategory.TIME: batch.minutes[slot],
+        }
+        for rule in BADGE_RULES:
+            if progress[rule.category] >= rule.threshold:
+                batch.rows["user_badge"].append((user_id, badges[rule.slug], now))
+
+
+async def _ensure_badges() -> dict[str, UUID]:
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(Badge)
+            .values(
+                [
+                    {
+                        "slug": rule.slug,
+                        "name": rule.name,
+                        "description": rule.description,
+                        "icon": rule.icon,
+                        "base_xp": rule.base_xp,
+                    }
+                    for rule in BADGE_RULES
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Badge.slug])
+        )
+        rows = await conn.execute(select(Badge.slug, Badge.id))
+        return {slug: badge_id for slug, badge_id in rows}
+
+
+async def _existing_bench_users() -> int:
+    async with engine.connect() as conn:
+        count = await conn.scalar(
+            select(func.count()).where(User.email.like("bench-%@example.com"))
+        )
+    return int(count or 0)
+
+
+async def _copy_batch(batch: _Batch) -> None:
+    async with engine.begin() as conn:
+        raw = await conn.get_raw_connection()
+        driver: Any = raw.driver_connection
+        for table, columns in COLUMNS.items():
+            if batch.rows[table]:
+                await driver.copy_records_to_table(
+                    table,
+                    records=batch.rows[table],
+                    columns=columns,
+                )
+        await driver.execute(ACTIVITY_YEARS_SQL, batch.user_ids)
+        await driver.execute(TRACK_COUNTERS_SQL, batch.user_ids)
+        await driver.execute(NODE_COUNTERS_SQL, batch.user_ids)
+
+
+async def generate_dataset(
+    users: int,
+    *,
+    shape: DatasetShape,
+    first_index: int | None = None,
+    batch_users: int = 500,
+    seed: int | None = None,
+) -> dict[str, int]:
+    """Load ``users`` synthetic users; returns the rows written per table."""
+    rng = np.random.default_rng(seed)
+    if first_index is None:
+        first_index = await _existing_bench_users()
+    password_hash = PasswordHelper().hash(PASSWORD)
+    badges = await _ensure_badges()
+    totals = dict.fromkeys(COLUMNS, 0)
+
+    started = time.perf_counter()
+    for offset in range(0, users, batch_users):
+        now = datetime.now(UTC)
+        batch = _Batch()
+        for index in range(offset, min(offset + batch_users, users)):
+            _generate_user(
+                batch,
+                first_index + index,
+                shape=shape,
+                rng=rng,
+                now=now,
+                password_hash=password_hash,
+            )
+        _add_stats_and_badges(batch, badges, now)
+        await _copy_batch(batch)
+        for table, rows in batch.rows.items():
+            totals[table] += len(rows)
+        logger.info(
+            "Loaded %d/%d users, %d completions (%.1fs)",
+            min(offset + batch_users, users),
+            users,
+            totals["node_completion"],
+            time.perf_counter() - started,
+        )
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.execute(
+            "ANALYZE " + ", ".join(f'"{table}"' for table in COLUMNS)
+        )
+    await drop_leaderboards()
+    return totals
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    defaults = DatasetShape()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--tracks", type=float, default=defaults.tracks)
+    parser.add_argument(
+        "--nodes",
+        type=float,
+        default=defaults.nodes,
+        help="mean nodes per track",
+    )
+    parser.add_argument("--completions", type=float, default=defaults.completions)
+    parser.add_argument("--time-entries", type=float, default=defaults.time_entries)
+    parser.add_argument(
+        "--refresh-sessions",
+        type=float,
+        default=defaults.refresh_sessions,
+    )
+    parser.add_argument("--docs", type=float, default=defaults.docs)
+    parser.add_argument("--habit-ratio", type=float, default=defaults.habit_ratio)
+    parser.add_argument("--locked-ratio", type=float, default=defaults.locked_ratio)
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=defaults.skew,
+        help="sigma of the log-normal per-user history volumes",
+    )
+    parser.add_argument(
+        "--history-days",
+        type=int,
+        default=defaults.history_days,
+    )
+    parser.add_argument(
+        "--first-index",
+        type=int,
+        help="number of the first bench user (default: after the existing ones)",
+    )
+    parser.add_argument("--batch-users", type=int, default=500)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    shape = DatasetShape(
+        tracks=args.tracks,
+        nodes=args.nodes,
+        completions=args.completions,
+        time_entries=args.time_entries,
+        refresh_sessions=args.refresh_sessions,
+        docs=args.docs,
+        habit_ratio=args.habit_ratio,
+        locked_ratio=args.locked_ratio,
+        skew=args.skew,
+        history_days=args.history_days,
+    )
+    totals = asyncio.run(
+        generate_dataset(
+            args.users,
+            shape=shape,
+            first_index=args.first_index,
+            batch_users=args.batch_users,
+            seed=args.seed,
+        )
+    )
+    for table, rows in totals.items():
+        print(f"{table:<16} {rows:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Import-time budget of the app, measured with ``python -X importtime``.
+
+    python -m benchmarks.importtime [--budget-ms 1500] [--runs 5] [--top 25]
+
+Imports ``src.main`` in fresh interpreters, reports the cumulative cost of
+the slowest modules and the self cost per top-level package of the fastest
+run, and exits non-zero when the total exceeds the budget or a module that
+must stay lazy (``LAZY_MODULES``) was imported at startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+__all__ = ["ImportRecord", "LAZY_MODULES", "measure"]
+
+# Imported on first use; pulling them in at boot is a regression.
+LAZY_MODULES = (
+    "google.auth",
+    "google.oauth2",
+    "requests",
+)
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+@dataclass(frozen=True, slots=True)
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def measure(target: str = "src.main") -> list[ImportRecord]:
+    """Records of one ``import target`` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode:
+        raise RuntimeError(f"import {target} failed:\n{result.stderr[-2000:]}")
+    records = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(
+                ImportRecord(module, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return records
+
+
+def _total_ms(records: Sequence[ImportRecord]) -> float:
+    return sum(record.self_us for record in records) / 1000
+
+
+def _format(records: Sequence[ImportRecord], top: int) -> str:
+    lines = [f"{'cumulative ms':>14}  module"]
+    slowest = sorted(records, key=lambda record: -record.cumulative_us)[:top]
+    lines += [f"{r.cumulative_us / 1000:>14.1f}  {r.module}" for r in slowest]
+
+    packages: dict[str, int] = defaultdict(int)
+    for record in records:
+        packages[record.module.split(".")[0]] += record.self_us
+    lines += ["", f"{'self ms':>14}  package"]
+    ranked = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    lines += [f"{us / 1000:>14.1f}  {package}" for package, us in ranked]
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", default="src.main", help="module to import")
+    parser.add_argument("--budget-ms", type=float, help="fail above this total")
+    parser.add_argument("--runs", type=int, default=5, help="fastest run is kept")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    # The first run also warms the bytecode and OS file caches.
+    runs = [measure(args.target) for _ in range(args.runs)]
+    records = min(runs, key=_total_ms)
+    total = _total_ms(records)
+    print(_format(records, args.top))
+    print(f"\ntotal: {total:.1f} ms (fastest of {args.runs} runs)")
+
+    failures = []
+    imported = {record.module for record in records}
+    eager = [
+        name
+        for name in LAZY_MODULES
+        if any(module == name or module.startswith(f"{name}.") for module in imported)
+    ]
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    if args.budget_ms is not None and total > args.budget_ms:
+        failures.append(f"{total:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    if failures:
+        print("\n".join(f"FAIL: {failure}" for failure in failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+import httpx
+
+from benchmarks.report import Recorder
+
+__all__ = ["PASSWORD", "ApiClient", "UserJourney", "VirtualUser", "bench_email"]
+
+API_PREFIX = "/api/v1"
+PASSWORD = "benchmark-password"
+
+
+def bench_email(index: int) -> str:
+    return f"bench-{index:06d}@example.com"
+
+
+class ApiClient:
+    """HTTP client that records the latency of every call under its route."""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder | None):
+        self.client = client
+        self.recorder = recorder
+        self.token: str | None = None
+
+    async def call(
+        self,
+        method: str,
+        route: str,
+        *,
+        path_params: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        url = API_PREFIX + route.format(**(path_params or {}))
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        started = time.perf_counter()
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        if self.recorder is not None:
+            self.recorder.record(
+                f"{method} {route}",
+                time.perf_counter() - started,
+                response.status_code,
+            )
+        return response
+
+    async def sign_in(self, email: str) -> None:
+        response = await self.call(
+            "POST",
+            "/auth/signin",
+            json={"email": email, "password": PASSWORD},
+        )
+        response.raise_for_status()
+        self.token = response.json()["access_token"]
+
+
+@dataclass(slots=True)
+class VirtualUser:
+    email: str
+    tracks: list[UUID] = field(default_factory=list)
+    nodes: dict[UUID, list[UUID]] = field(default_factory=dict)
+
+
+class UserJourney:
+    """Scripted sessions of one user, repeated until the deadline.
+
+    A session signs in and then runs ``iterations_per_session`` iterations:
+    browse tracks and a track's nodes, complete a node, time a short focus
+    session on it and look at the summaries.
+    """
+
+    def __init__(
+        self,
+        api: ApiClient,
+        user: VirtualUser,
+        *,
+        complete_ratio: float,
+        think_time: float,
+        iterations_per_session: int,
+        rng: random.Random,
+    ):
+        self.api = api
+        self.user = user
+        self.complete_ratio = complete_ratio
+        self.think_time = think_time
+        self.iterations_per_session = iterations_per_session
+        self.rng = rng
+
+    async def run(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            await self.api.sign_in(self.user.email)
+            for _ in range(self.iterations_per_session):
+                if time.monotonic() >= deadline:
+                    return
+                await self.iteration()
+
+    async def iteration(self) -> None:
+        response = await self.api.call("GET", "/tracks")
+        tracks = [UUID(track["id"]) for track in response.json()]
+        await self._think()
+        if not tracks:
+            return
+
+        track_id = self.rng.choice(tracks)
+        response = await self.api.call(
+            "GET",
+            "/tracks/{track_id}/nodes",
+            path_params={"track_id": track_id},
+        )
+        nodes = [UUID(node["id"]) for node in response.json() if not node["is_locked"]]
+        await self._think()
+        if not nodes:
+            return
+
+        node_id = self.rng.choice(nodes)
+        if self.rng.random() < self.complete_ratio:
+            await self.api.call(
+                "POST",
+                "/nodes/{node_id}/complete",
+                path_params={"node_id": node_id},
+                json={},
+            )
+            await self._think()
+
+        await self._time_focus_session(node_id)
+        await self.api.call("GET", "/time-entries/summary")
+        await self.api.call("GET", "/me/stats")
+        await self.api.call("GET", "/me/progress/summary")
+        await self._think()
+
+    async def _time_focus_session(self, node_id: UUID) -> None:
+        response = await self.api.call(
+            "POST",
+            "/time-entries/start",
+            json={"node_id": str(node_id)},
+        )
+        if response.status_code == httpx.codes.CONFLICT:
+            # Left running by an interrupted iteration.
+            response = await self.api.call("GET", "/time-entries/active")
+        entry = None if response.is_error else response.json()
+        if entry is None:
+            return
+        await self._think()
+        await self.api.call(
+            "POST",
+            "/time-entries/{entry_id}/stop",
+            path_params={"entry_id": entry["id"]},
+        )
+
+    async def _think(self) -> None:
+        if self.think_time:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+__all__ = ["Recorder", "compare", "format_report", "load_report"]
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass(slots=True)
+class _Samples:
+    latencies: list[float] = field(default_factory=list)  # seconds
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+
+class Recorder:
+    """Latencies per endpoint, keyed by ``"METHOD /route/{template}"``."""
+
+    def __init__(self) -> None:
+        self._samples: dict[str, _Samples] = defaultdict(_Samples)
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, endpoint: str, seconds: float, status: int) -> None:
+        samples = self._samples[endpoint]
+        samples.latencies.append(seconds)
+        samples.statuses[status] += 1
+        if status >= 400:
+            samples.errors += 1
+
+    def reset(self) -> None:
+        """Drop the samples taken so far, e.g. at the end of the warm-up."""
+        self._samples.clear()
+        self.started = time.perf_counter()
+
+    def stop(self) -> None:
+        self.finished = time.perf_counter()
+
+    def report(self, meta: dict[str, Any]) -> dict[str, Any]:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        endpoints = {
+            endpoint: _summarize(samples, elapsed)
+            for endpoint, samples in sorted(self._samples.items())
+        }
+        everything = _Samples()
+        for samples in self._samples.values():
+            everything.latencies.extend(samples.latencies)
+            everything.errors += samples.errors
+        return {
+            "meta": {**meta, "elapsed_sec": round(elapsed, 3)},
+            "total": _summarize(everything, elapsed),
+            "endpoints": endpoints,
+        }
+
+
+def _summarize(samples: _Samples, elapsed: float) -> dict[str, Any]:
+    latencies = np.asarray(samples.latencies) * 1000
+    summary: dict[str, Any] = {
+        "count": len(latencies),
+        "errors": samples.errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+    }
+    if len(latencies):
+        values = np.percentile(latencies, PERCENTILES)
+        summary.update(
+            {f"p{p}_ms": round(float(v), 2) for p, v in zip(PERCENTILES, values)},
+            mean_ms=round(float(latencies.mean()), 2),
+            max_ms=round(float(latencies.max()), 2),
+        )
+    if samples.statuses:
+        summary["statuses"] = {str(k): v for k, v in sorted(samples.statuses.items())}
+    return summary
+
+
+def format_report(report: dict[str, Any]) -> str:
+    header = f"{'endpoint':<44} {'count':>7} {'err':>5} {'rps':>8}"
+    header += "".join(f" {f'p{p}':>8}" for p in PERCENTILES)
+    lines = [header, "-" * len(header)]
+    rows = [*report["endpoints"].items(), ("TOTAL", report["total"])]
+    for endpoint, stats in rows:
+        line = f"{endpoint:<44} {stats['count']:>7} {stats['errors']:>5}"
+        line += f" {stats['rps']:>8.1f}"
+        line += "".join(f" {stats.get(f'p{p}_ms', 0):>8.1f}" for p in PERCENTILES)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def load_report(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any]) -> str:
+    """Relative change of throughput and p95/p99 per endpoint."""
+
+    def delta(old: float | None, new: float | None) -> str:
+        if not old or new is None:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    lines = [f"{'endpoint':<44} {'rps':>9} {'p95':>9} {'p99':>9}"]
+    rows = [*current["endpoints"].items(), ("TOTAL", current["total"])]
+    for endpoint, stats in rows:
+        old = (
+            baseline["total"]
+            if endpoint == "TOTAL"
+            else baseline["endpoints"].get(endpoint)
+        )
+        if old is None:
+            lines.append(f"{endpoint:<44} {'new':>9}")
+            continue
+        lines.append(
+            f"{endpoint:<44} {delta(old['rps'], stats['rps']):>9}"
+            f" {delta(old.get('p95_ms'), stats.get('p95_ms')):>9}"
+            f" {delta(old.get('p99_ms'), stats.get('p99_ms')):>9}"
+        )
+    return "\n".join(lines)
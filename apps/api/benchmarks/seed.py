@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from uuid import UUID
+
+import httpx
+
+from benchmarks.journeys import PASSWORD, ApiClient, VirtualUser, bench_email
+
+__all__ = ["seed_users"]
+
+HABIT_RATIO = 0.3
+
+
+async def seed_users(
+    client: httpx.AsyncClient,
+    *,
+    users: int,
+    tracks_per_user: int,
+    nodes_per_track: int,
+    completions_per_user: int,
+    concurrency: int,
+    rng: random.Random,
+) -> list[VirtualUser]:
+    """Create the benchmark users, their tracks and nodes through the API.
+
+    Idempotent: existing users, tracks and nodes are reused, so seeding a
+    database twice does not grow it. For volumes the API is too slow for,
+    load the database directly and give the users the benchmark password.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def seed_one(index: int) -> VirtualUser:
+        async with semaphore:
+            return await _seed_user(
+                ApiClient(client, recorder=None),
+                VirtualUser(bench_email(index)),
+                tracks_per_user=tracks_per_user,
+                nodes_per_track=nodes_per_track,
+                completions=completions_per_user,
+                rng=random.Random(rng.random()),
+            )
+
+    return await asyncio.gather(*(seed_one(index) for index in range(users)))
+
+
+async def _seed_user(
+    api: ApiClient,
+    user: VirtualUser,
+    *,
+    tracks_per_user: int,
+    nodes_per_track: int,
+    completions: int,
+    rng: random.Random,
+) -> VirtualUser:
+    response = await api.call(
+        "POST",
+        "/auth/signup",
+        json={"email": user.email, "password": PASSWORD, "is_verified": True},
+    )
+    if response.status_code not in (httpx.codes.CREATED, httpx.codes.BAD_REQUEST):
+        response.raise_for_status()
+    await api.sign_in(user.email)
+
+    tracks = (await api.call("GET", "/tracks")).json()
+    user.tracks = [UUID(track["id"]) for track in tracks]
+    for position in range(len(user.tracks), tracks_per_user):
+        response = await api.call(
+            "POST",
+            "/tracks",
+            json={"name": f"Track {position + 1}"},
+        )
+        response.raise_for_status()
+        user.tracks.append(UUID(response.json()["id"]))
+
+    new_nodes: list[UUID] = []
+    for track_id in user.tracks:
+        response = await api.call(
+            "GET",
+            "/tracks/{track_id}/nodes",
+            path_params={"track_id": track_id},
+        )
+        nodes = [UUID(node["id"]) for node in response.json()]
+        for position in range(len(nodes), nodes_per_track):
+            response = await api.call(
+                "POST",
+                "/tracks/{track_id}/nodes",
+                path_params={"track_id": track_id},
+                json=_node_payload(position, rng),
+            )
+            response.raise_for_status()
+            nodes.append(UUID(response.json()["id"]))
+            new_nodes.append(nodes[-1])
+        user.nodes[track_id] = nodes
+
+    # History only for fresh nodes, so re-seeding keeps the volume stable.
+    if new_nodes:
+        for _ in range(completions):
+            await api.call(
+                "POST",
+                "/nodes/{node_id}/complete",
+                path_params={"node_id": rng.choice(new_nodes)},
+                json={},
+            )
+    return user
+
+
+def _node_payload(position: int, rng: random.Random) -> dict:
+    if rng.random() < HABIT_RATIO:
+        return {
+            "title": f"Habit {position + 1}",
+            "type": "HABIT",
+            "habit_schedule": {"frequency": "DAILY"},
+        }
+    return {
+        "title": f"Task {position + 1}",
+        "type": rng.choice(["TASK", "FOCUS_SESSION"]),
+        "base_xp": rng.choice([5, 10, 20]),
+    }
@@ -0,0 +1,177 @@
+"""Boot time and memory of gunicorn workers, with and without preload.
+
+    python -m benchmarks.workers [--workers 4] [--mode cold --mode preload]
+
+Starts gunicorn with ``gunicorn/gunicorn_conf.py`` once per mode, waits until
+every worker finished its startup and reads the memory of the master and the
+workers from ``/proc`` (Linux only). PSS splits shared pages between the
+processes sharing them, so it shows what preloading saves; RSS counts them
+in every process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+__all__ = ["measure_mode"]
+
+READY_LINE = b"Application startup complete"
+CONF = Path(__file__).resolve().parent.parent / "gunicorn" / "gunicorn_conf.py"
+LOG_CONFIG = Path(__file__).resolve().parent.parent / "logging.ini"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> list[int]:
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+        except OSError:
+            continue
+        # The command may contain spaces; fields after it are fixed.
+        if int(stat.rsplit(")", 1)[1].split()[1]) == pid:
+            children.append(int(entry))
+    return children
+
+
+def _memory_kb(pid: int) -> dict[str, int]:
+    """RSS, PSS and USS (private pages) of a process in KiB."""
+    fields: dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value, *_ = line.split()
+        fields[name.rstrip(":")] = int(value)
+    return {
+        "rss_kb": fields["Rss"],
+        "pss_kb": fields["Pss"],
+        "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def measure_mode(
+    *,
+    preload: bool,
+    workers: int,
+    timeout: float,
+    overrides: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    env = {
+        **os.environ,
+        **(overrides or {}),
+        "PRELOAD_APP": str(preload).lower(),
+        "WEB_CONCURRENCY": str(workers),
+        "BIND": f"127.0.0.1:{_free_port()}",
+        "LOG_CONFIG": str(LOG_CONFIG),
+        "LOG_LEVEL": "INFO",
+    }
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", str(CONF), "src.main:app"],
+        env=env,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        ready, first_ready = 0, None
+        deadline = time.monotonic() + timeout
+        assert process.stderr is not None
+        while ready < workers:
+            line = process.stderr.readline()
+            if not line:
+                raise RuntimeError(f"gunicorn exited with {process.wait()}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{ready}/{workers} workers ready in {timeout}s")
+            if READY_LINE in line:
+                ready += 1
+                first_ready = first_ready or time.perf_counter() - started
+        boot = time.perf_counter() - started
+        time.sleep(0.5)  # let the workers settle after startup
+
+        master = _memory_kb(process.pid)
+        forked = [_memory_kb(pid) for pid in _children(process.pid)]
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    def mean(key: str) -> int:
+        return sum(worker[key] for worker in forked) // len(forked)
+
+    return {
+        "mode": "preload" if preload else "cold",
+        "workers": len(forked),
+        "first_worker_ready_sec": round(first_ready or 0, 3),
+        "all_workers_ready_sec": round(boot, 3),
+        "master": master,
+        "worker_mean": {key: mean(key) for key in ("rss_kb", "pss_kb", "uss_kb")},
+        "total_pss_kb": master["pss_kb"] + sum(w["pss_kb"] for w in forked),
+    }
+
+
+def _format(results: Sequence[dict[str, Any]]) -> str:
+    header = (
+        f"{'mode':<8} {'workers':>7} {'first s':>8} {'all s':>7} "
+        f"{'worker rss':>11} {'worker pss':>11} {'worker uss':>11} {'total pss':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        worker = r["worker_mean"]
+        lines.append(
+            f"{r['mode']:<8} {r['workers']:>7} {r['first_worker_ready_sec']:>8.2f} "
+            f"{r['all_workers_ready_sec']:>7.2f} "
+            f"{worker['rss_kb'] / 1024:>9.1f}MB {worker['pss_kb'] / 1024:>9.1f}MB "
+            f"{worker['uss_kb'] / 1024:>9.1f}MB {r['total_pss_kb'] / 1024:>8.1f}MB"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--mode",
+        action="append",
+        choices=("cold", "preload"),
+        help="repeatable; default: both",
+    )
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="gunicorn_conf setting, e.g. UVLOOP=false or MAX_REQUESTS=1000",
+    )
+    parser.add_argument("--json", type=Path, help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    results = [
+        measure_mode(
+            preload=mode == "preload",
+            workers=args.workers,
+            timeout=args.timeout,
+            overrides=dict(item.split("=", 1) for item in args.set),
+        )
+        for mode in args.mode or ("cold", "preload")
+    ]
+    print(_format(results))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
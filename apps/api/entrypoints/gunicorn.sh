@@ -10,7 +10,6 @@ export APP_MODULE=${APP_MODULE:-"$MODULE_NAME:$VARIABLE_NAME"}
 
 DEFAULT_GUNICORN_CONF=/src/gunicorn/gunicorn_conf.py
 export GUNICORN_CONF=${GUNICORN_CONF:-$DEFAULT_GUNICORN_CONF}
-export WORKER_CLASS=${WORKER_CLASS:-"uvicorn.workers.UvicornWorker"}
 
-# Start Gunicorn
-gunicorn --forwarded-allow-ips "*" -k "$WORKER_CLASS" -c "$GUNICORN_CONF" "$APP_MODULE"
+# The worker class comes from the config file unless WORKER_CLASS overrides it.
+gunicorn --forwarded-allow-ips "*" ${WORKER_CLASS:+-k "$WORKER_CLASS"} -c "$GUNICORN_CONF" "$APP_MODULE"
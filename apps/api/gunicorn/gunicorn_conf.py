@@ -1,4 +1,6 @@
 import multiprocessing
+import os
+import sys
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -6,8 +8,18 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 try:
     from prometheus_client import multiprocess
 
+    def on_starting(_):
+        # Samples of workers from a previous run would be summed into ours.
+        directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        if directory and os.path.isdir(directory):
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+
     def child_exit(_, worker):
-        multiprocess.mark_process_dead(worker.pid)
+        # Recycled workers exit too; without the directory there is nothing
+        # to clean up and mark_process_dead would fail.
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            multiprocess.mark_process_dead(worker.pid)
 
 except ImportError:
     pass
@@ -32,6 +44,16 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_config: str = "/src/logging_production.ini"
 
+    # Import the app once in the master and fork workers from it.
+    preload_app: bool = False
+    # Restart a worker after this many requests (0 disables); the jitter
+    # (default 10%) keeps workers from restarting at the same time.
+    max_requests: int = 0
+    max_requests_jitter: int | None = None
+    # Require uvloop and httptools (src.workers.UvloopWorker). Loading the
+    # worker class imports the src package, models included, in the master.
+    uvloop: bool = True
+
     @property
     def computed_bind(self) -> str:
         return self.bind if self.bind else f"{self.host}:{self.port}"
@@ -51,15 +73,37 @@ class Settings(BaseSettings):
 
             return web_concurrency
 
+    @property
+    def computed_max_requests_jitter(self) -> int:
+        if self.max_requests_jitter is not None:
+            return self.max_requests_jitter
+        return self.max_requests // 10
+
+
+def post_fork(_, worker):
+    # With preload_app the worker inherits the master's engines; give it
+    # fresh pools so no connection is shared between processes.
+    database = sys.modules.get("src.database")
+    if database is not None:
+        database.dispose_after_fork()
+
 
 settings = Settings()
 
 # Gunicorn config variables
 loglevel = settings.log_level
 workers = settings.computed_web_concurrency
+# The app reads it too, e.g. to keep per-process caches off with several workers.
+os.environ["WEB_CONCURRENCY"] = str(workers)
 bind = settings.computed_bind
 worker_tmp_dir = "/dev/shm"
 graceful_timeout = settings.graceful_timeout
 timeout = settings.timeout
 keepalive = settings.keepalive
 logconfig = settings.log_config
+preload_app = settings.preload_app
+max_requests = settings.max_requests
+max_requests_jitter = settings.computed_max_requests_jitter
+worker_class = (
+    "src.workers.UvloopWorker" if settings.uvloop else "uvicorn.workers.UvicornWorker"
+)
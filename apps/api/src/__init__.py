@@ -1,18 +1,24 @@
+from src.activity import models as _activity_models  # noqa: F401
+from src.attachments import models as _attachments_models  # noqa: F401
 from src.auth import models as _auth_models  # noqa: F401
 from src.badges import models as _badges_models  # noqa: F401
 from src.completions import models as _completions_models  # noqa: F401
 from src.docs import models as _docs_models  # noqa: F401
 from src.gamification import models as _gamification_models  # noqa: F401
+from src.jobs import models as _jobs_models  # noqa: F401
 from src.nodes import models as _nodes_models  # noqa: F401
 from src.time_tracking import models as _time_tracking_models  # noqa: F401
 from src.tracks import models as _tracks_models  # noqa: F401
 
 __all__ = [
+    "_activity_models",
+    "_attachments_models",
     "_auth_models",
     "_badges_models",
     "_completions_models",
     "_docs_models",
     "_gamification_models",
+    "_jobs_models",
     "_nodes_models",
     "_time_tracking_models",
     "_tracks_models",
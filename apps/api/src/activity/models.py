@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, Integer, SmallInteger, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+__all__ = ["DAYS_PER_YEAR_SLOT", "ActivityYear"]
+
+# Every year gets 366 slots indexed by day of year; the last one stays
+# empty outside leap years.
+DAYS_PER_YEAR_SLOT = 366
+
+
+class ActivityYear(Base):
+    """Daily completion counts and tracked minutes of one user for one year.
+
+    Maintained incrementally on completion and timer stop so the heatmap is
+    a single row read. Activity stays recorded if its node is deleted later.
+    """
+
+    __tablename__ = "activity_year"
+
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    year: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    completions: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer, dimensions=1),
+        nullable=False,
+    )
+    minutes: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer, dimensions=1),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, Query
+
+from src.activity.schemas import Heatmap
+from src.activity.services import ActivityService, get_activity_service
+from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+
+router = APIRouter(prefix="/me", tags=["activity"])
+
+
+@router.get("/heatmap", response_model=Heatmap, dependencies=[Depends(prefer_replica)])
+async def get_heatmap(
+    current_user: CurrentUser,
+    service: ActivityService = Depends(get_activity_service),
+    year: int | None = Query(default=None, ge=1970, le=9999),
+) -> Heatmap:
+    return await service.get_heatmap(
+        current_user.id,
+        year or datetime.now(UTC).year,
+    )
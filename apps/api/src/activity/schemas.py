@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from datetime import date
+
+from pydantic import BaseModel
+
+__all__ = ["Heatmap"]
+
+
+class Heatmap(BaseModel):
+    year: int
+    start: date
+    completions: list[int]
+    minutes: list[int]
+    total_completions: int
+    total_minutes: int
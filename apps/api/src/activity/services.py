@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import calendar
+from datetime import date
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Insert, func, select
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.activity.models import DAYS_PER_YEAR_SLOT, ActivityYear
+from src.activity.schemas import Heatmap
+from src.database import get_async_session
+
+__all__ = [
+    "ActivityService",
+    "activity_upsert",
+    "get_activity_service",
+    "record_activity",
+]
+
+
+def _add_to_slot(
+    column: ColumnElement[list[int]],
+    slot: int,
+    amount: int,
+) -> ColumnElement[list[int]]:
+    """``column`` with ``amount`` added to its 1-based ``slot``."""
+    return (
+        column[1 : slot - 1]
+        .concat(array([column[slot] + amount]))
+        .concat(column[slot + 1 : DAYS_PER_YEAR_SLOT])
+    )
+
+
+def activity_upsert(
+    user_id: UUID,
+    day: date,
+    *,
+    completions: int = 0,
+    minutes: int = 0,
+) -> Insert:
+    """The statement behind ``record_activity``; a single upsert."""
+    slot = day.timetuple().tm_yday
+    new_completions = [0] * DAYS_PER_YEAR_SLOT
+    new_completions[slot - 1] = completions
+    new_minutes = [0] * DAYS_PER_YEAR_SLOT
+    new_minutes[slot - 1] = minutes
+    return (
+        insert(ActivityYear)
+        .values(
+            user_id=user_id,
+            year=day.year,
+            completions=new_completions,
+            minutes=new_minutes,
+        )
+        .on_conflict_do_update(
+            index_elements=[ActivityYear.user_id, ActivityYear.year],
+            set_={
+                "completions": _add_to_slot(
+                    ActivityYear.completions, slot, completions
+                ),
+                "minutes": _add_to_slot(ActivityYear.minutes, slot, minutes),
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def record_activity(
+    session: AsyncSession,
+    user_id: UUID,
+    day: date,
+    *,
+    completions: int = 0,
+    minutes: int = 0,
+) -> None:
+    """Add activity to ``day``; runs inside the caller's transaction."""
+    if not completions and not minutes:
+        return
+    await session.execute(
+        activity_upsert(user_id, day, completions=completions, minutes=minutes)
+    )
+
+
+class ActivityService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_heatmap(self, user_id: UUID, year: int) -> Heatmap:
+        stmt = select(ActivityYear.completions, ActivityYear.minutes).where(
+            ActivityYear.user_id == user_id,
+            ActivityYear.year == year,
+        )
+        row = (await self.session.execute(stmt)).first()
+        days = 366 if calendar.isleap(year) else 365
+        completions = list(row.completions[:days]) if row else [0] * days
+        minutes = list(row.minutes[:days]) if row else [0] * days
+        return Heatmap(
+            year=year,
+            start=date(year, 1, 1),
+            completions=completions,
+            minutes=minutes,
+            total_completions=sum(completions),
+            total_minutes=sum(minutes),
+        )
+
+
+def get_activity_service(
+    session: AsyncSession = Depends(get_async_session),
+) -> ActivityService:
+    return ActivityService(session)
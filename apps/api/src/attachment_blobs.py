@@ -0,0 +1,151 @@
+"""Collection of attachment blobs no attachment refers to anymore.
+
+Apart from ``src.attachments``, so the services whose deletes cascade to
+attachments (docs, tracks) and the job worker can call it without
+importing the attachments routers.
+
+Writers of a user's attachments and blobs take ``lock_user_blobs`` first.
+A purge therefore never decides on a snapshot that misses an attachment
+being created against a blob it is about to delete.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.attachments.models import (
+    AttachmentBlob,
+    AttachmentStatus,
+    AttachmentUpload,
+    DocAttachment,
+)
+from src.attachments.storage import StorageDriver, get_storage
+from src.config import settings
+from src.database import after_commit
+from src.jobs.models import JobKind
+from src.jobs.queue import enqueue
+
+__all__ = [
+    "lock_user_blobs",
+    "purge_orphaned_blobs",
+    "storage_key",
+    "sweep_stale_uploads",
+]
+
+PENDING_UPLOAD_TTL = timedelta(seconds=settings.STORAGE_PENDING_UPLOAD_TTL_SEC)
+
+
+def storage_key(user_id: UUID, sha256: str) -> str:
+    return f"{user_id}/{sha256[:2]}/{sha256}"
+
+
+async def lock_user_blobs(session: AsyncSession, user_id: UUID) -> None:
+    """Serialize the user's attachment writes until the transaction ends.
+
+    Later statements of the transaction run on snapshots taken after the
+    lock, so they see what the previous holder committed.
+    """
+    key = func.hashtextextended(f"attachment_blob:{user_id}", 0)
+    await session.execute(select(func.pg_advisory_xact_lock(key)))
+
+
+async def purge_orphaned_blobs(
+    session: AsyncSession,
+    user_id: UUID,
+    storage: StorageDriver | None = None,
+) -> None:
+    """Drop the user's blobs no attachment refers to anymore.
+
+    Called after every delete that removes attachments: of an attachment,
+    a doc, or a track with its docs.
+    """
+    await lock_user_blobs(session, user_id)
+    referenced = (
+        select(DocAttachment.id)
+        .where(
+            DocAttachment.user_id == AttachmentBlob.user_id,
+            DocAttachment.sha256 == AttachmentBlob.sha256,
+        )
+        .exists()
+    )
+    stmt = (
+        delete(AttachmentBlob)
+        .where(AttachmentBlob.user_id == user_id, ~referenced)
+        .returning(AttachmentBlob.storage_key)
+    )
+    keys = list(await session.scalars(stmt))
+    storage = storage or get_storage()
+    # Objects go only once no committed row can point at them anymore.
+    for key in keys:
+        after_commit(session, storage.delete, key)
+
+
+async def sweep_stale_uploads(
+    session: AsyncSession,
+    user_ids: Sequence[UUID],
+    storage: StorageDriver | None = None,
+) -> None:
+    """Drop pending attachments and upload keys older than the upload TTL.
+
+    Their upload URLs expired long ago, so nothing completes them anymore.
+    An uploaded object goes with its key unless a blob claimed it since.
+    Users with uploads still too young are swept again later.
+    """
+    storage = storage or get_storage()
+    cutoff = func.now() - PENDING_UPLOAD_TTL
+    # Sorted, so two sweeps never wait on each other's locks.
+    for user_id in sorted(user_ids):
+        await lock_user_blobs(session, user_id)
+        await session.execute(
+            delete(DocAttachment).where(
+                DocAttachment.user_id == user_id,
+                DocAttachment.status == AttachmentStatus.PENDING,
+                DocAttachment.created_at < cutoff,
+            )
+        )
+        pending = (
+            select(DocAttachment.id)
+            .where(
+                DocAttachment.user_id == AttachmentUpload.user_id,
+                DocAttachment.sha256 == AttachmentUpload.sha256,
+                DocAttachment.status == AttachmentStatus.PENDING,
+            )
+            .exists()
+        )
+        stmt = (
+            delete(AttachmentUpload)
+            .where(
+                AttachmentUpload.user_id == user_id,
+                AttachmentUpload.created_at < cutoff,
+                ~pending,
+            )
+            .returning(AttachmentUpload.sha256)
+        )
+        swept = list(await session.scalars(stmt))
+        if swept:
+            claimed = await session.scalars(
+                select(AttachmentBlob.sha256).where(
+                    AttachmentBlob.user_id == user_id,
+                    AttachmentBlob.sha256.in_(swept),
+                )
+            )
+            for sha256 in set(swept) - set(claimed):
+                after_commit(session, storage.delete, storage_key(user_id, sha256))
+
+        remaining = await session.scalar(
+            select(AttachmentUpload.sha256)
+            .where(AttachmentUpload.user_id == user_id)
+            .limit(1)
+        )
+        if remaining is not None:
+            await enqueue(
+                session,
+                JobKind.SWEEP_STALE_UPLOADS,
+                user_id,
+                delay=PENDING_UPLOAD_TTL,
+            )
@@ -0,0 +1,7 @@
+from . import models as _models  # noqa: F401
+from .routers import router as attachments_router
+
+__all__ = [
+    "_models",
+    "attachments_router",
+]
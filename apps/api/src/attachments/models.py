@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import TYPE_CHECKING
+from uuid import UUID, uuid4
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database import Base
+
+if TYPE_CHECKING:
+    from src.docs.models import Doc
+
+__all__ = [
+    "AttachmentBlob",
+    "AttachmentStatus",
+    "AttachmentUpload",
+    "DocAttachment",
+]
+
+
+class AttachmentStatus(str, Enum):
+    PENDING = "PENDING"
+    READY = "READY"
+
+
+class AttachmentBlob(Base):
+    """A stored object, deduplicated per user by content hash."""
+
+    __tablename__ = "attachment_blob"
+
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    sha256: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    storage_key: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class AttachmentUpload(Base):
+    """A storage key handed out for an upload that no blob claims yet.
+
+    Kept until the upload completes or is swept, so objects uploaded for
+    attachments that never became ready can be deleted.
+    """
+
+    __tablename__ = "attachment_upload"
+
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    sha256: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
+class DocAttachment(Base):
+    __tablename__ = "doc_attachment"
+
+    id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True), primary_key=True, default=uuid4
+    )
+    doc_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("doc.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    sha256: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    filename: Mapped[str] = mapped_column(Text, nullable=False)
+    content_type: Mapped[str] = mapped_column(Text, nullable=False)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    status: Mapped[AttachmentStatus] = mapped_column(
+        SQLEnum(AttachmentStatus, name="attachment_status"),
+        nullable=False,
+        server_default=AttachmentStatus.PENDING.value,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        onupdate=func.now(),
+        server_default=func.now(),
+        nullable=True,
+    )
+
+    doc: Mapped["Doc"] = relationship()
+
+    __table_args__ = (
+        Index("idx_doc_attachment_doc", "doc_id"),
+        Index("idx_doc_attachment_blob", "user_id", "sha256"),
+    )
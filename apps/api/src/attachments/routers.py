@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from src.attachments.schemas import (
+    AttachmentCreate,
+    AttachmentPublic,
+    AttachmentUploadResponse,
+    PresignedRequestPublic,
+)
+from src.attachments.services import AttachmentService, get_attachment_service
+from src.attachments.storage import (
+    FilesystemStorage,
+    StorageIntegrityError,
+    content_disposition,
+    get_storage,
+)
+from src.attachments.utils import parse_byte_range
+from src.auth.dependencies import CurrentUser
+from src.exceptions import BadRequest, NotFound
+
+router = APIRouter(tags=["attachments"])
+
+
+def _range_response(
+    chunks_for,
+    *,
+    size: int,
+    content_type: str,
+    filename: str,
+    range_header: str | None,
+) -> StreamingResponse:
+    byte_range = parse_byte_range(range_header, size)
+    start, end = byte_range or (0, size - 1)
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "Content-Disposition": content_disposition(filename),
+    }
+    status_code = status.HTTP_200_OK
+    if byte_range is not None:
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(
+        chunks_for(start, end),
+        status_code=status_code,
+        media_type=content_type,
+        headers=headers,
+    )
+
+
+def _filesystem_storage() -> FilesystemStorage:
+    storage = get_storage()
+    if not isinstance(storage, FilesystemStorage):
+        raise NotFound(detail="Not found")
+    return storage
+
+
+@router.put(
+    "/attachments/blobs/{token}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+    include_in_schema=False,
+)
+async def upload_blob(token: str, request: Request) -> Response:
+    storage = _filesystem_storage()
+    claims = storage.verify_token(token, "put")
+    if claims is None:
+        raise NotFound(detail="Upload URL is invalid or expired")
+    try:
+        await storage.write(
+            claims["key"],
+            request.stream(),
+            size_bytes=claims["size"],
+            sha256=claims["sha256"],
+        )
+    except StorageIntegrityError as exc:
+        raise BadRequest(detail=str(exc)) from exc
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/attachments/blobs/{token}", include_in_schema=False)
+async def download_blob(
+    token: str,
+    range_header: str | None = Header(default=None, alias="range"),
+) -> StreamingResponse:
+    storage = _filesystem_storage()
+    claims = storage.verify_token(token, "get")
+    if claims is None:
+        raise NotFound(detail="Download URL is invalid or expired")
+    size = await storage.stat(claims["key"])
+    if size is None:
+        raise NotFound(detail="Attachment not found")
+    return _range_response(
+        lambda start, end: storage.open_range(claims["key"], start, end),
+        size=size,
+        content_type=claims["type"],
+        filename=claims["filename"],
+        range_header=range_header,
+    )
+
+
+@router.get("/docs/{doc_id}/attachments", response_model=list[AttachmentPublic])
+async def list_attachments(
+    doc_id: UUID,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+) -> list[AttachmentPublic]:
+    attachments = await service.list_attachments(current_user.id, doc_id)
+    return [AttachmentPublic.model_validate(item) for item in attachments]
+
+
+@router.post(
+    "/docs/{doc_id}/attachments",
+    response_model=AttachmentUploadResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_attachment(
+    doc_id: UUID,
+    payload: AttachmentCreate,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+) -> AttachmentUploadResponse:
+    attachment, upload = await service.create_attachment(
+        current_user.id, doc_id, payload
+    )
+    return AttachmentUploadResponse(
+        attachment=AttachmentPublic.model_validate(attachment),
+        upload=PresignedRequestPublic.model_validate(upload) if upload else None,
+    )
+
+
+@router.post("/attachments/{attachment_id}/complete", response_model=AttachmentPublic)
+async def complete_attachment(
+    attachment_id: UUID,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+) -> AttachmentPublic:
+    attachment = await service.complete_upload(current_user.id, attachment_id)
+    return AttachmentPublic.model_validate(attachment)
+
+
+@router.get(
+    "/attachments/{attachment_id}/download",
+    response_model=PresignedRequestPublic,
+)
+async def get_download_url(
+    attachment_id: UUID,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+) -> PresignedRequestPublic:
+    download = await service.presign_download(current_user.id, attachment_id)
+    return PresignedRequestPublic.model_validate(download)
+
+
+@router.get("/attachments/{attachment_id}/content")
+async def stream_attachment(
+    attachment_id: UUID,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+    range_header: str | None = Header(default=None, alias="range"),
+) -> StreamingResponse:
+    """Stream the attachment through the API for clients that cannot follow
+    presigned URLs. Prefer ``/download``."""
+    attachment = await service.get_ready_attachment(current_user.id, attachment_id)
+    return _range_response(
+        lambda start, end: service.open_range(attachment, start, end),
+        size=attachment.size_bytes,
+        content_type=attachment.content_type,
+        filename=attachment.filename,
+        range_header=range_header,
+    )
+
+
+@router.delete(
+    "/attachments/{attachment_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
+)
+async def delete_attachment(
+    attachment_id: UUID,
+    current_user: CurrentUser,
+    service: AttachmentService = Depends(get_attachment_service),
+) -> Response:
+    await service.delete_attachment(current_user.id, attachment_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.attachments.models import AttachmentStatus
+
+__all__ = [
+    "AttachmentCreate",
+    "AttachmentPublic",
+    "AttachmentUploadResponse",
+    "PresignedRequestPublic",
+]
+
+
+class AttachmentCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field(default="application/octet-stream", max_length=255)
+    size_bytes: int = Field(..., gt=0)
+    sha256: str = Field(..., pattern=r"^[0-9a-f]{64}$")
+
+
+class AttachmentPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    doc_id: UUID
+    filename: str
+    content_type: str
+    size_bytes: int
+    sha256: str
+    status: AttachmentStatus
+    created_at: datetime
+    updated_at: datetime | None = None
+
+
+class PresignedRequestPublic(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    method: str
+    url: str
+    expires_at: datetime
+    headers: dict[str, str] = Field(default_factory=dict)
+
+
+class AttachmentUploadResponse(BaseModel):
+    attachment: AttachmentPublic
+    upload: PresignedRequestPublic | None = None
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Select, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.attachment_blobs import (
+    PENDING_UPLOAD_TTL,
+    lock_user_blobs,
+    purge_orphaned_blobs,
+    storage_key,
+)
+from src.attachments.models import (
+    AttachmentBlob,
+    AttachmentStatus,
+    AttachmentUpload,
+    DocAttachment,
+)
+from src.attachments.schemas import AttachmentCreate
+from src.attachments.storage import (
+    PresignedRequest,
+    StorageDriver,
+    get_storage,
+)
+from src.config import settings
+from src.database import get_async_session
+from src.docs.models import Doc
+from src.exceptions import BadRequest, NotFound
+from src.jobs.models import JobKind
+from src.jobs.queue import enqueue
+
+__all__ = [
+    "AttachmentService",
+    "get_attachment_service",
+]
+
+
+class AttachmentService:
+    def __init__(self, session: AsyncSession, storage: StorageDriver):
+        self.session = session
+        self.storage = storage
+
+    async def list_attachments(
+        self,
+        user_id: UUID,
+        doc_id: UUID,
+    ) -> list[DocAttachment]:
+        await self._ensure_doc_owned(user_id, doc_id)
+        stmt: Select[tuple[DocAttachment]] = (
+            select(DocAttachment)
+            .where(DocAttachment.doc_id == doc_id)
+            .order_by(DocAttachment.created_at)
+        )
+        attachments = await self.session.scalars(stmt)
+        return list(attachments)
+
+    async def create_attachment(
+        self,
+        user_id: UUID,
+        doc_id: UUID,
+        payload: AttachmentCreate,
+    ) -> tuple[DocAttachment, PresignedRequest | None]:
+        """Register an attachment and hand out an upload URL if needed.
+
+        When the user already stored a blob with the same hash the attachment
+        is ready immediately and no upload happens.
+        """
+        await self._ensure_doc_owned(user_id, doc_id)
+        if payload.size_bytes > settings.STORAGE_MAX_UPLOAD_BYTES:
+            raise BadRequest(detail="Attachment is too large")
+
+        # A concurrent purge either committed the blob's deletion before the
+        # lookup or sees this attachment and keeps the blob.
+        await lock_user_blobs(self.session, user_id)
+        blob = await self._get_blob(user_id, payload.sha256)
+        if blob is not None and blob.size_bytes != payload.size_bytes:
+            raise BadRequest(detail="Attachment size does not match its hash")
+
+        attachment = DocAttachment(
+            doc_id=doc_id,
+            user_id=user_id,
+            sha256=payload.sha256,
+            filename=payload.filename,
+            content_type=payload.content_type,
+            size_bytes=payload.size_bytes,
+            status=AttachmentStatus.READY if blob else AttachmentStatus.PENDING,
+        )
+        self.session.add(attachment)
+        await self.session.flush()
+
+        if blob is not None:
+            return attachment, None
+        # Recorded so the object is deleted if the upload never completes.
+        record = (
+            insert(AttachmentUpload)
+            .values(user_id=user_id, sha256=payload.sha256)
+            .on_conflict_do_update(
+                index_elements=["user_id", "sha256"],
+                set_={"created_at": func.now()},
+            )
+        )
+        await self.session.execute(record)
+        await enqueue(
+            self.session,
+            JobKind.SWEEP_STALE_UPLOADS,
+            user_id,
+            delay=PENDING_UPLOAD_TTL,
+        )
+        upload = self.storage.presign_upload(
+            storage_key(user_id, payload.sha256),
+            content_type=payload.content_type,
+            size_bytes=payload.size_bytes,
+            sha256=payload.sha256,
+        )
+        return attachment, upload
+
+    async def complete_upload(
+        self,
+        user_id: UUID,
+        attachment_id: UUID,
+    ) -> DocAttachment:
+        attachment = await self.get_attachment(user_id, attachment_id)
+        if attachment.status is AttachmentStatus.READY:
+            return attachment
+
+        await lock_user_blobs(self.session, user_id)
+        key = storage_key(user_id, attachment.sha256)
+        stored_size = await self.storage.stat(key)
+        if stored_size is None:
+            raise BadRequest(detail="Upload has not been received")
+        if stored_size != attachment.size_bytes:
+            raise BadRequest(detail="Uploaded size does not match attachment")
+
+        stmt = (
+            insert(AttachmentBlob)
+            .values(
+                user_id=user_id,
+                sha256=attachment.sha256,
+                size_bytes=stored_size,
+                storage_key=key,
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "sha256"])
+        )
+        await self.session.execute(stmt)
+        await self.session.execute(
+            delete(AttachmentUpload).where(
+                AttachmentUpload.user_id == user_id,
+                AttachmentUpload.sha256 == attachment.sha256,
+            )
+        )
+        attachment.status = AttachmentStatus.READY
+        await self.session.flush()
+        return attachment
+
+    async def get_attachment(
+        self,
+        user_id: UUID,
+        attachment_id: UUID,
+    ) -> DocAttachment:
+        stmt: Select[tuple[DocAttachment]] = select(DocAttachment).where(
+            DocAttachment.id == attachment_id,
+            DocAttachment.user_id == user_id,
+        )
+        attachment = await self.session.scalar(stmt)
+        if attachment is None:
+            raise NotFound(detail="Attachment not found")
+        return attachment
+
+    async def get_ready_attachment(
+        self,
+        user_id: UUID,
+        attachment_id: UUID,
+    ) -> DocAttachment:
+        attachment = await self.get_attachment(user_id, attachment_id)
+        if attachment.status is not AttachmentStatus.READY:
+            raise BadRequest(detail="Attachment upload is not complete")
+        return attachment
+
+    async def presign_download(
+        self,
+        user_id: UUID,
+        attachment_id: UUID,
+    ) -> PresignedRequest:
+        attachment = await self.get_ready_attachment(user_id, attachment_id)
+        return self.storage.presign_download(
+            storage_key(user_id, attachment.sha256),
+            filename=attachment.filename,
+            content_type=attachment.content_type,
+        )
+
+    def open_range(
+        self,
+        attachment: DocAttachment,
+        start: int,
+        end: int,
+    ) -> AsyncIterator[bytes]:
+        key = storage_key(attachment.user_id, attachment.sha256)
+        return self.storage.open_range(key, start, end)
+
+    async def delete_attachment(self, user_id: UUID, attachment_id: UUID) -> None:
+        attachment = await self.get_attachment(user_id, attachment_id)
+        await self.session.delete(attachment)
+        await self.session.flush()
+        await self.purge_orphaned_blobs(user_id)
+
+    async def purge_orphaned_blobs(self, user_id: UUID) -> None:
+        await purge_orphaned_blobs(self.session, user_id, self.storage)
+
+    async def _get_blob(self, user_id: UUID, sha256: str) -> AttachmentBlob | None:
+        stmt = (
+            select(AttachmentBlob)
+            .where(
+                AttachmentBlob.user_id == user_id,
+                AttachmentBlob.sha256 == sha256,
+            )
+            .with_for_update(key_share=True)
+        )
+        return await self.session.scalar(stmt)
+
+    async def _ensure_doc_owned(self, user_id: UUID, doc_id: UUID) -> None:
+        stmt = select(Doc.id).where(Doc.id == doc_id, Doc.user_id == user_id)
+        exists = await self.session.scalar(stmt)
+        if exists is None:
+            raise NotFound(detail="Doc not found")
+
+
+def get_attachment_service(
+    session: AsyncSession = Depends(get_async_session),
+) -> AttachmentService:
+    return AttachmentService(session, get_storage())
@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, urlsplit
+from uuid import uuid4
+
+import httpx
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+
+from src.config import settings
+from src.utils import build_app_url
+
+__all__ = [
+    "FilesystemStorage",
+    "PresignedRequest",
+    "S3Storage",
+    "StorageDriver",
+    "StorageIntegrityError",
+    "content_disposition",
+    "get_storage",
+]
+
+_CHUNK_SIZE = 64 * 1024
+_BLOB_ROUTE = "/api/v1/attachments/blobs"
+
+
+class StorageIntegrityError(Exception):
+    """Raised when uploaded bytes do not match the declared size or hash."""
+
+
+@dataclass(frozen=True)
+class PresignedRequest:
+    method: str
+    url: str
+    expires_at: datetime
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class StorageDriver(ABC):
+    """Object storage used for attachment blobs.
+
+    Clients talk to the storage directly through presigned requests; the API
+    only issues URLs and verifies that the object landed.
+    """
+
+    def __init__(self, url_ttl: timedelta):
+        self.url_ttl = url_ttl
+
+    def _expires_at(self) -> datetime:
+        return datetime.now(UTC) + self.url_ttl
+
+    @abstractmethod
+    def presign_upload(
+        self,
+        key: str,
+        *,
+        content_type: str,
+        size_bytes: int,
+        sha256: str,
+    ) -> PresignedRequest: ...
+
+    @abstractmethod
+    def presign_download(
+        self,
+        key: str,
+        *,
+        filename: str,
+        content_type: str,
+    ) -> PresignedRequest: ...
+
+    @abstractmethod
+    async def stat(self, key: str) -> int | None:
+        """Return the stored object size, or ``None`` when it does not exist."""
+
+    @abstractmethod
+    def open_range(
+        self,
+        key: str,
+        start: int,
+        end: int,
+    ) -> AsyncIterator[bytes]:
+        """Yield bytes ``start..end`` (inclusive) of the stored object."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+
+class FilesystemStorage(StorageDriver):
+    """Stores blobs under a local directory.
+
+    Presigned URLs point back at the API (``/attachments/blobs/{token}``) and
+    carry a signed, time-limited token, so the client flow is identical to the
+    S3 driver. Meant for tests and single-node installs.
+    """
+
+    def __init__(self, root: str, secret: str, url_ttl: timedelta):
+        super().__init__(url_ttl)
+        self.root = Path(root)
+        self._serializer = URLSafeTimedSerializer(secret, salt="attachment-blob")
+
+    def presign_upload(
+        self,
+        key: str,
+        *,
+        content_type: str,
+        size_bytes: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        token = self._serializer.dumps(
+            {"op": "put", "key": key, "size": size_bytes, "sha256": sha256}
+        )
+        return PresignedRequest(
+            method="PUT",
+            url=self._blob_url(token),
+            expires_at=self._expires_at(),
+            headers={"content-type": content_type},
+        )
+
+    def presign_download(
+        self,
+        key: str,
+        *,
+        filename: str,
+        content_type: str,
+    ) -> PresignedRequest:
+        token = self._serializer.dumps(
+            {"op": "get", "key": key, "filename": filename, "type": content_type}
+        )
+        return PresignedRequest(
+            method="GET",
+            url=self._blob_url(token),
+            expires_at=self._expires_at(),
+        )
+
+    def verify_token(self, token: str, op: str) -> dict[str, Any] | None:
+        try:
+            claims = self._serializer.loads(
+                token,
+                max_age=int(self.url_ttl.total_seconds()),
+            )
+        except BadSignature:
+            return None
+        if not isinstance(claims, dict) or claims.get("op") != op:
+            return None
+        return claims
+
+    async def write(
+        self,
+        key: str,
+        chunks: AsyncIterator[bytes],
+        *,
+        size_bytes: int,
+        sha256: str,
+    ) -> None:
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.part")
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        written = 0
+        handle = await asyncio.to_thread(open, tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                written += len(chunk)
+                if written > size_bytes:
+                    raise StorageIntegrityError("Upload exceeds declared size")
+                digest.update(chunk)
+                await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(handle.close)
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise
+        await asyncio.to_thread(handle.close)
+
+        if written != size_bytes or digest.hexdigest() != sha256:
+            await asyncio.to_thread(tmp_path.unlink, missing_ok=True)
+            raise StorageIntegrityError("Upload does not match declared content")
+        await asyncio.to_thread(os.replace, tmp_path, path)
+
+    async def stat(self, key: str) -> int | None:
+        try:
+            result = await asyncio.to_thread(os.stat, self._path(key))
+        except FileNotFoundError:
+            return None
+        return result.st_size
+
+    async def open_range(
+        self,
+        key: str,
+        start: int,
+        end: int,
+    ) -> AsyncIterator[bytes]:
+        handle = await asyncio.to_thread(open, self._path(key), "rb")
+        try:
+            await asyncio.to_thread(handle.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await asyncio.to_thread(
+                    handle.read, min(_CHUNK_SIZE, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._path(key).unlink, missing_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def _blob_url(self, token: str) -> str:
+        path = f"{_BLOB_ROUTE}/{token}"
+        if settings.APP_BASE_URL is None:
+            return path
+        return build_app_url(path)
+
+
+class S3Storage(StorageDriver):
+    """S3-compatible storage (MinIO in docker-compose) using SigV4 query auth.
+
+    Uploads are signed over ``content-length`` and ``x-amz-checksum-sha256``
+    so the object store itself rejects bytes that do not match the metadata
+    row. Server-side calls reuse short-lived presigned URLs against the
+    internal endpoint, which keeps this driver free of an SDK dependency.
+    """
+
+    def __init__(
+        self,
+        *,
+        endpoint_url: str,
+        public_endpoint_url: str,
+        bucket: str,
+        region: str,
+        access_key: str,
+        secret_key: str,
+        url_ttl: timedelta,
+    ):
+        super().__init__(url_ttl)
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.public_endpoint_url = public_endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+
+    def presign_upload(
+        self,
+        key: str,
+        *,
+        content_type: str,
+        size_bytes: int,
+        sha256: str,
+    ) -> PresignedRequest:
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode("ascii")
+        headers = {
+            "content-length": str(size_bytes),
+            "content-type": content_type,
+            "x-amz-checksum-sha256": checksum,
+        }
+        url = self._presign(
+            "PUT",
+            key,
+            endpoint_url=self.public_endpoint_url,
+            signed_headers=headers,
+        )
+        return PresignedRequest(
+            method="PUT",
+            url=url,
+            expires_at=self._expires_at(),
+            headers=headers,
+        )
+
+    def presign_download(
+        self,
+        key: str,
+        *,
+        filename: str,
+        content_type: str,
+    ) -> PresignedRequest:
+        url = self._presign(
+            "GET",
+            key,
+            endpoint_url=self.public_endpoint_url,
+            query={
+                "response-content-disposition": content_disposition(filename),
+                "response-content-type": content_type,
+            },
+        )
+        return PresignedRequest(method="GET", url=url, expires_at=self._expires_at())
+
+    async def stat(self, key: str) -> int | None:
+        url = self._presign("HEAD", key, endpoint_url=self.endpoint_url)
+        async with httpx.AsyncClient() as client:
+            response = await client.head(url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return int(response.headers["content-length"])
+
+    async def open_range(
+        self,
+        key: str,
+        start: int,
+        end: int,
+    ) -> AsyncIterator[bytes]:
+        url = self._presign("GET", key, endpoint_url=self.endpoint_url)
+        headers = {"range": f"bytes={start}-{end}"}
+        async with httpx.AsyncClient(timeout=None) as client:
+            async with client.stream("GET", url, headers=headers) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                    yield chunk
+
+    async def delete(self, key: str) -> None:
+        url = self._presign("DELETE", key, endpoint_url=self.endpoint_url)
+        async with httpx.AsyncClient() as client:
+            response = await client.delete(url)
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    def _presign(
+        self,
+        method: str,
+        key: str,
+        *,
+        endpoint_url: str,
+        signed_headers: dict[str, str] | None = None,
+        query: dict[str, str] | None = None,
+    ) -> str:
+        now = datetime.now(UTC)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{now:%Y%m%d}/{self.region}/s3/aws4_request"
+        host = urlsplit(endpoint_url).netloc
+        canonical_uri = f"/{quote(self.bucket)}/{quote(key, safe='/-_.~')}"
+
+        headers = {"host": host, **(signed_headers or {})}
+        header_names = ";".join(sorted(headers))
+        params = {
+            "X-Amz-Algorithm": "AWS4-HMAC-SHA256",
+            "X-Amz-Credential": f"{self.access_key}/{scope}",
+            "X-Amz-Date": amz_date,
+            "X-Amz-Expires": str(int(self.url_ttl.total_seconds())),
+            "X-Amz-SignedHeaders": header_names,
+            **(query or {}),
+        }
+        canonical_query = "&".join(
+            f"{_uri_encode(name)}={_uri_encode(value)}"
+            for name, value in sorted(params.items())
+        )
+        canonical_headers = "".join(
+            f"{name}:{headers[name].strip()}\n" for name in sorted(headers)
+        )
+        canonical_request = "\n".join(
+            [
+                method,
+                canonical_uri,
+                canonical_query,
+                canonical_headers,
+                header_names,
+                "UNSIGNED-PAYLOAD",
+            ]
+        )
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            ]
+        )
+        signing_key = f"AWS4{self.secret_key}".encode()
+        for part in (f"{now:%Y%m%d}", self.region, "s3", "aws4_request"):
+            signing_key = hmac.new(signing_key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(
+            signing_key, string_to_sign.encode(), hashlib.sha256
+        ).hexdigest()
+        return (
+            f"{endpoint_url}{canonical_uri}?{canonical_query}"
+            f"&X-Amz-Signature={signature}"
+        )
+
+
+def _uri_encode(value: str) -> str:
+    return quote(value, safe="-_.~")
+
+
+def content_disposition(filename: str) -> str:
+    fallback = filename.encode("ascii", "ignore").decode().replace('"', "") or "file"
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+_STORAGE: StorageDriver | None = None
+
+
+def get_storage() -> StorageDriver:
+    global _STORAGE
+    if _STORAGE is None:
+        url_ttl = timedelta(seconds=settings.STORAGE_URL_TTL_SEC)
+        if settings.STORAGE_BACKEND == "s3":
+            endpoint_url = str(settings.S3_ENDPOINT_URL)
+            _STORAGE = S3Storage(
+                endpoint_url=endpoint_url,
+                public_endpoint_url=str(
+                    settings.S3_PUBLIC_ENDPOINT_URL or endpoint_url
+                ),
+                bucket=settings.S3_BUCKET,
+                region=settings.S3_REGION,
+                access_key=settings.S3_ACCESS_KEY,
+                secret_key=settings.S3_SECRET_KEY,
+                url_ttl=url_ttl,
+            )
+        else:
+            _STORAGE = FilesystemStorage(
+                settings.STORAGE_FS_ROOT,
+                settings.STORAGE_SIGNING_SECRET,
+                url_ttl,
+            )
+    return _STORAGE
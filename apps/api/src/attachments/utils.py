@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+
+__all__ = ["parse_byte_range"]
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse a single-range ``Range: bytes=...`` header.
+
+    Returns an inclusive ``(start, end)`` pair, or ``None`` when the whole
+    object should be served. Multi-range requests are answered with the full
+    body, which RFC 9110 allows.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError
+            start = max(size - suffix, 0)
+            end = size - 1
+    except ValueError:
+        return None
+
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
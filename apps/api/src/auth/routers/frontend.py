@@ -10,9 +10,6 @@ from fastapi.security import OAuth2PasswordRequestForm
 from fastapi_users import exceptions as fastapi_users_exceptions
 from fastapi_users.authentication import Strategy
 from fastapi_users.manager import BaseUserManager
-from google.auth import exceptions as google_exceptions
-from google.auth.transport import requests as google_requests
-from google.oauth2 import id_token
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -33,6 +30,7 @@ from src.auth.schemas import (
     UserPublic,
 )
 from src.auth.security.refresh import RefreshTokenService
+from src.auth.services.oauth import verify_google_id_token
 from src.auth.services.users import (
     UserManager,
     auth_backend,
@@ -119,7 +117,6 @@ async def update_profile(
 
     session.add(user)
     await session.commit()
-    await session.refresh(user)
     return _serialize_user(user)
 
 
@@ -211,12 +208,11 @@ async def signin_with_google(
         )
 
     try:
-        id_info = id_token.verify_oauth2_token(
+        id_info = verify_google_id_token(
             payload.credential,
-            google_requests.Request(),
             settings.OAUTH_GOOGLE_CLIENT_ID,
         )
-    except (ValueError, google_exceptions.GoogleAuthError) as exc:
+    except ValueError as exc:
         logger.exception("Failed to verify Google credential")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -297,7 +293,6 @@ async def signin_with_google(
     if should_commit:
         session.add(user)
         await session.commit()
-        await session.refresh(user)
         logger.debug("Updated profile details from Google for user=%s", user.id)
 
     if not user_pre_exists:
@@ -386,7 +381,6 @@ async def signup(
         user.is_verified = payload.is_verified
     session.add(user)
     await session.commit()
-    await session.refresh(user)
 
     return await _build_auth_response(
         user=user,
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
-from httpx_oauth.clients.google import GoogleOAuth2
+from typing import TYPE_CHECKING, Any
 
 from src.config import settings
 
+if TYPE_CHECKING:
+    from google.auth.transport.requests import Request as GoogleRequest
+    from httpx_oauth.clients.google import GoogleOAuth2
+
+# Google sign-in is rare, so its client libraries (google-auth pulls in
+# requests) are imported on first use instead of in every worker at boot.
 _GOOGLE_CLIENT: GoogleOAuth2 | None = None
+_GOOGLE_REQUEST: GoogleRequest | None = None
 
 
 def get_google_client() -> GoogleOAuth2 | None:
@@ -13,8 +20,26 @@ def get_google_client() -> GoogleOAuth2 | None:
         return None
 
     if _GOOGLE_CLIENT is None:
+        from httpx_oauth.clients.google import GoogleOAuth2
+
         _GOOGLE_CLIENT = GoogleOAuth2(
             client_id=settings.OAUTH_GOOGLE_CLIENT_ID,
             client_secret=settings.OAUTH_GOOGLE_CLIENT_SECRET,
         )
     return _GOOGLE_CLIENT
+
+
+def verify_google_id_token(credential: str, audience: str) -> dict[str, Any]:
+    """Claims of a Google ID token; raises ``ValueError`` if it is invalid."""
+    global _GOOGLE_REQUEST
+    from google.auth import exceptions as google_exceptions
+    from google.auth.transport import requests as google_requests
+    from google.oauth2 import id_token
+
+    if _GOOGLE_REQUEST is None:
+        # Reused so the HTTP session and its connections survive across calls.
+        _GOOGLE_REQUEST = google_requests.Request()
+    try:
+        return id_token.verify_oauth2_token(credential, _GOOGLE_REQUEST, audience)
+    except google_exceptions.GoogleAuthError as exc:
+        raise ValueError(str(exc)) from exc
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import Select, select
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
 from src.badges.models import Badge, UserBadge
+from src.badges.schemas import BadgePublic, UserBadgePublic
+from src.completions.models import NodeCompletion
 from src.database import get_async_session
+from src.gamification.models import UserStats
+from src.time_tracking.models import TimeEntry
+from src.user_events import EventType, publish
 
 __all__ = [
     "BadgeService",
@@ -104,80 +112,74 @@ class BadgeService:
         return list(badges)
 
     async def list_user_badges(self, user_id: UUID) -> list[UserBadge]:
-        await self._ensure_seeded()
+        # Awards only exist for seeded badges, so this stays a pure read.
         stmt: Select[tuple[UserBadge]] = (
             select(UserBadge)
             .join(Badge)
+            .options(contains_eager(UserBadge.badge))
             .where(UserBadge.user_id == user_id)
             .order_by(UserBadge.awarded_at.desc())
         )
         badges = await self.session.scalars(stmt)
         return list(badges)
 
-    async def evaluate_badges(
-        self,
-        user_id: UUID,
-        *,
-        streak_days: int | None = None,
-        completion_count: int | None = None,
-        time_minutes: int | None = None,
-    ) -> list[UserBadge]:
+    async def evaluate_users(self, user_ids: Sequence[UUID]) -> int:
+        """Award every badge the users qualify for; returns how many were new.
+
+        Runs from the job queue: one grouped query per metric for all users
+        and a single insert for the awards, which are published as events.
+        """
         await self._ensure_seeded()
-        awarded: list[UserBadge] = []
-        for rule in BADGE_RULES:
-            if rule.category is BadgeCategory.STREAK and streak_days is not None:
-                if streak_days >= rule.threshold:
-                    badge = await self._award_if_needed(user_id, rule)
-                    if badge:
-                        awarded.append(badge)
-            elif (
-                rule.category is BadgeCategory.COMPLETION
-                and completion_count is not None
-            ):
-                if completion_count >= rule.threshold:
-                    badge = await self._award_if_needed(user_id, rule)
-                    if badge:
-                        awarded.append(badge)
-            elif rule.category is BadgeCategory.TIME and time_minutes is not None:
-                if time_minutes >= rule.threshold:
-                    badge = await self._award_if_needed(user_id, rule)
-                    if badge:
-                        awarded.append(badge)
-        return awarded
-
-    async def _award_if_needed(
-        self,
-        user_id: UUID,
-        rule: BadgeRule,
-    ) -> UserBadge | None:
-        badge = await self._get_badge_by_slug(rule)
-        stmt = select(UserBadge).where(
-            UserBadge.user_id == user_id,
-            UserBadge.badge_id == badge.id,
+        streaks = await self.session.execute(
+            select(UserStats.user_id, UserStats.current_streak_days).where(
+                UserStats.user_id.in_(user_ids)
+            )
+        )
+        completions = await self.session.execute(
+            select(NodeCompletion.user_id, func.count())
+            .where(NodeCompletion.user_id.in_(user_ids))
+            .group_by(NodeCompletion.user_id)
         )
-        exists = await self.session.scalar(stmt)
-        if exists:
-            return None
-        award = UserBadge(user_id=user_id, badge_id=badge.id)
-        self.session.add(award)
-        await self.session.flush()
-        await self.session.refresh(award)
-        return award
-
-    async def _get_badge_by_slug(self, rule: BadgeRule) -> Badge:
-        stmt = select(Badge).where(Badge.slug == rule.slug)
-        badge = await self.session.scalar(stmt)
-        if badge is None:
-            badge = Badge(
-                slug=rule.slug,
-                name=rule.name,
-                description=rule.description,
-                icon=rule.icon,
-                base_xp=rule.base_xp,
+        minutes = await self.session.execute(
+            select(TimeEntry.user_id, func.sum(TimeEntry.duration_min))
+            .where(
+                TimeEntry.user_id.in_(user_ids),
+                TimeEntry.duration_min.is_not(None),
             )
-            self.session.add(badge)
-            await self.session.flush()
-        return badge
+            .group_by(TimeEntry.user_id)
+        )
+        metrics: dict[BadgeCategory, dict[UUID, int]] = {
+            BadgeCategory.STREAK: dict(streaks.tuples().all()),
+            BadgeCategory.COMPLETION: dict(completions.tuples().all()),
+            BadgeCategory.TIME: dict(minutes.tuples().all()),
+        }
+        badges = {
+            badge.slug: badge for badge in await self.session.scalars(select(Badge))
+        }
+
+        awards = [
+            {"user_id": user_id, "badge_id": badges[rule.slug].id}
+            for user_id in user_ids
+            for rule in BADGE_RULES
+            if (metrics[rule.category].get(user_id) or 0) >= rule.threshold
+        ]
+        if not awards:
+            return 0
+        stmt = (
+            insert(UserBadge)
+            .values(awards)
+            .on_conflict_do_nothing()
+            .returning(UserBadge.user_id, UserBadge.badge_id, UserBadge.awarded_at)
+        )
+        awarded = (await self.session.execute(stmt)).all()
+        by_id = {badge.id: badge for badge in badges.values()}
+        for user_id, badge_id, awarded_at in awarded:
+            award = UserBadgePublic(
+                badge=BadgePublic.model_validate(by_id[badge_id]),
+                awarded_at=awarded_at,
+            )
+            await publish(self.session, user_id, EventType.BADGE, award)
+        return len(awarded)
 
     async def _ensure_seeded(self) -> None:
         if self._seeded:
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+__all__ = [
+    "Cache",
+    "MemoryCache",
+    "NullCache",
+    "RedisCache",
+    "get_cache",
+    "get_redis",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class Cache(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+
+class MemoryCache(Cache):
+    """Per-process LRU cache with expiry.
+
+    Invalidation only reaches the current worker, so entries must also be
+    bounded by a TTL. Only used by a single worker; see ``get_cache``.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class NullCache(Cache):
+    """Caches nothing; every read is a miss."""
+
+    async def get(self, key: str) -> bytes | None:
+        return None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        pass
+
+    async def delete(self, *keys: str) -> None:
+        pass
+
+
+class RedisCache(Cache):
+    """Shared by all workers. An unavailable Redis is a cache miss, not an
+    error: reads fall through to the database and writes are dropped."""
+
+    def __init__(self, client: Redis):
+        self.client = client
+
+    async def get(self, key: str) -> bytes | None:
+        try:
+            return await self.client.get(key)
+        except RedisError:
+            logger.warning("Cache read of %s failed", key, exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        try:
+            await self.client.set(key, value, ex=ttl)
+        except RedisError:
+            logger.warning("Cache write of %s failed", key, exc_info=True)
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*keys)
+        except RedisError:
+            logger.warning("Cache delete of %s failed", keys, exc_info=True)
+
+
+_REDIS: Redis | None = None
+_CACHE: Cache | None = None
+
+
+def get_redis() -> Redis | None:
+    global _REDIS
+    if settings.REDIS_URL is None:
+        return None
+    if _REDIS is None:
+        _REDIS = Redis.from_url(str(settings.REDIS_URL))
+    return _REDIS
+
+
+def get_cache() -> Cache:
+    """Redis when configured. Otherwise a per-process cache for a single
+    worker; several workers would each keep their own copy that the others'
+    invalidations never reach, so they cache nothing."""
+    global _CACHE
+    if _CACHE is None:
+        client = get_redis()
+        if client is not None:
+            _CACHE = RedisCache(client)
+        elif settings.WEB_CONCURRENCY > 1:
+            logger.warning(
+                "REDIS_URL is not set; caching is off with %d workers",
+                settings.WEB_CONCURRENCY,
+            )
+            _CACHE = NullCache()
+        else:
+            _CACHE = MemoryCache()
+    return _CACHE
@@ -55,6 +55,6 @@ class NodeCompletion(Base):
     node: Mapped["Node"] = relationship()
 
     __table_args__ = (
-        Index("idx_completion_user", "user_id"),
+        Index("idx_completion_user_completed_at", "user_id", "completed_at"),
         Index("idx_completion_node", "node_id"),
     )
@@ -2,14 +2,23 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from src.auth.dependencies import CurrentUser
+from src.completions.models import NodeCompletion
 from src.completions.schemas import CompletionCreate, NodeCompletionPublic
 from src.completions.services import CompletionService, get_completion_service
+from src.database import prefer_replica
+from src.fieldsets import Embed, Selection, fieldset
+from src.nodes.schemas import NodePublic
 
 router = APIRouter(tags=["completions"])
 
+completion_fields = fieldset(
+    NodeCompletionPublic,
+    embeds={"node": Embed("node", NodePublic, many=False)},
+)
+
 
 @router.post(
     "/nodes/{node_id}/complete",
@@ -26,16 +35,22 @@ async def complete_node(
     return NodeCompletionPublic.model_validate(completion)
 
 
-@router.get("/completions", response_model=list[NodeCompletionPublic])
+@router.get(
+    "/completions",
+    response_model=list[NodeCompletionPublic],
+    dependencies=[Depends(prefer_replica)],
+)
 async def list_completions(
     current_user: CurrentUser,
     service: CompletionService = Depends(get_completion_service),
     node_id: UUID | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
-) -> list[NodeCompletionPublic]:
+    selection: Selection = Depends(completion_fields),
+) -> list[NodeCompletionPublic] | Response:
     completions = await service.list_completions(
         current_user.id,
         node_id=node_id,
         limit=limit,
+        options=selection.options(NodeCompletion),
     )
-    return [NodeCompletionPublic.model_validate(item) for item in completions]
+    return selection.render(completions)
@@ -1,24 +1,29 @@
 from __future__ import annotations
 
 from datetime import UTC, datetime
+from typing import Sequence
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
-from src.badges.services import BadgeService
+from src.activity.services import activity_upsert
 from src.completions.models import NodeCompletion
 from src.completions.schemas import CompletionCreate
-from src.database import get_async_session
+from src.counters import node_counters_update, track_counters_update
+from src.database import after_commit, get_async_session
 from src.exceptions import BadRequest, NotFound
-from src.gamification.utils import (
-    apply_xp,
-    get_or_create_user_stats,
-    update_streak,
-)
+from src.gamification.services import user_stats_public
+from src.gamification.utils import record_completion_stats
+from src.habits.cache import invalidate_habit_stats
+from src.jobs.models import JobKind
+from src.jobs.queue import job_insert
+from src.leaderboard.services import record_xp
 from src.nodes.models import Node
 from src.tracks.models import Track
+from src.user_events import EventType, publish
 
 __all__ = [
     "CompletionService",
@@ -27,9 +32,8 @@ __all__ = [
 
 
 class CompletionService:
-    def __init__(self, session: AsyncSession, badge_service: BadgeService):
+    def __init__(self, session: AsyncSession):
         self.session = session
-        self.badge_service = badge_service
 
     async def complete_node(
         self,
@@ -44,6 +48,7 @@ class CompletionService:
         completed_at = payload.completed_at or datetime.now(UTC)
         if completed_at.tzinfo is None:
             completed_at = completed_at.replace(tzinfo=UTC)
+        activity_date = completed_at.astimezone(UTC).date()
 
         completion = NodeCompletion(
             user_id=user_id,
@@ -53,24 +58,28 @@ class CompletionService:
             earned_xp=node.base_xp,
         )
 
-        async with self.session.begin():
-            self.session.add(completion)
-            stats = await get_or_create_user_stats(
-                self.session,
-                user_id,
-                for_update=True,
-            )
-            apply_xp(stats, completion.earned_xp)
-            update_streak(stats, completed_at.date())
-            await self.session.flush()
-            completion_count = await self._completion_count(user_id)
-            await self.badge_service.evaluate_badges(
-                user_id,
-                streak_days=stats.current_streak_days,
-                completion_count=completion_count,
-            )
+        self.session.add(completion)
+        await self.session.flush()
+        # The counters, the activity day, the badge job and user_stats are
+        # rows the user's other writes contend for. One statement at the end
+        # of the transaction writes them all, so their locks are held only
+        # from there to the commit. Badges are evaluated by the job worker.
+        stats = await record_completion_stats(
+            self.session,
+            user_id,
+            completion.earned_xp,
+            activity_date,
+            with_writes=[
+                track_counters_update(node.track_id, completions=1),
+                node_counters_update(node.id, completed_at=completed_at),
+                activity_upsert(user_id, activity_date, completions=1),
+                job_insert(self.session, JobKind.EVALUATE_BADGES, user_id),
+            ],
+        )
+        await publish(self.session, user_id, EventType.STATS, user_stats_public(stats))
 
-        await self.session.refresh(completion)
+        after_commit(self.session, invalidate_habit_stats, user_id)
+        after_commit(self.session, record_xp, self.session, user_id, stats.xp_total)
         return completion
 
     async def list_completions(
@@ -79,9 +88,12 @@ class CompletionService:
         *,
         node_id: UUID | None = None,
         limit: int = 50,
+        options: Sequence[ORMOption] = (),
     ) -> list[NodeCompletion]:
-        stmt: Select[tuple[NodeCompletion]] = select(NodeCompletion).where(
-            NodeCompletion.user_id == user_id
+        stmt: Select[tuple[NodeCompletion]] = (
+            select(NodeCompletion)
+            .where(NodeCompletion.user_id == user_id)
+            .options(*options)
         )
         if node_id:
             stmt = stmt.where(NodeCompletion.node_id == node_id)
@@ -100,16 +112,8 @@ class CompletionService:
             raise NotFound(detail="Node not found")
         return node
 
-    async def _completion_count(self, user_id: UUID) -> int:
-        stmt = select(func.count(NodeCompletion.id)).where(
-            NodeCompletion.user_id == user_id
-        )
-        count = await self.session.scalar(stmt)
-        return int(count or 0)
-
 
 def get_completion_service(
     session: AsyncSession = Depends(get_async_session),
 ) -> CompletionService:
-    badge_service = BadgeService(session)
-    return CompletionService(session, badge_service)
+    return CompletionService(session)
@@ -1,10 +1,13 @@
 from typing import Any, Literal
 
-from pydantic import AnyHttpUrl, PostgresDsn, model_validator
+from pydantic import AnyHttpUrl, PostgresDsn, RedisDsn, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from src.constants import Environment
 
+# Anyone knowing it can forge attachment URLs; only for local development.
+DEV_STORAGE_SIGNING_SECRET = "dev-secret"
+
 
 class CustomBaseSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -18,6 +21,39 @@ class Config(CustomBaseSettings):
     DATABASE_POOL_SIZE: int = 16
     DATABASE_POOL_TTL: int = 60 * 20  # 20 minutes
     DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    # Transaction pooling (PgBouncer): no server-side prepared statement reuse.
+    DATABASE_PGBOUNCER: bool = False
+    DATABASE_REPLICA_ASYNC_URL: PostgresDsn | None = None
+    # How long a client reads from the primary after a write; covers replica lag.
+    DATABASE_REPLICA_STICKY_SEC: int = 5
+    DATABASE_SLOW_QUERY_MS: float = 200
+    # Statements allowed per request; exceeding it fails the request in TESTING.
+    DATABASE_QUERY_BUDGET: int | None = None
+    # LISTEN needs a session: point this past a transaction-pooling PgBouncer.
+    DATABASE_LISTEN_ASYNC_URL: PostgresDsn | None = None
+    # Wait for the extra connections of a concurrent snapshot read; past it the
+    # reads run one after another on a single connection.
+    DATABASE_SNAPSHOT_JOIN_TIMEOUT_SEC: float = 1
+
+    REDIS_URL: RedisDsn | None = None
+    # Bounds staleness when an invalidation is lost, e.g. while Redis is down.
+    HABIT_STATS_CACHE_TTL_SEC: int = 60 * 5  # 5 minutes
+    # Worker processes serving the app; exported by gunicorn/gunicorn_conf.py.
+    WEB_CONCURRENCY: int = 1
+
+    # Every API process runs a job worker; turn off to run them separately.
+    JOBS_IN_PROCESS: bool = True
+    JOBS_BATCH_SIZE: int = 100
+    JOBS_POLL_INTERVAL_SEC: float = 1
+    JOBS_MAX_ATTEMPTS: int = 5
+    # A job claimed longer ago belongs to a dead worker and is claimed again.
+    JOBS_LOCK_TIMEOUT_SEC: int = 60 * 5  # 5 minutes
+
+    # Messages a live event stream buffers before dropping the oldest.
+    EVENTS_BUFFER_SIZE: int = 32
+    EVENTS_HEARTBEAT_SEC: float = 15
 
     ENVIRONMENT: Environment = Environment.PRODUCTION
 
@@ -47,6 +83,21 @@ class Config(CustomBaseSettings):
     SMTP_PASS: str | None = None
     EMAIL_FROM: str | None = None
 
+    STORAGE_BACKEND: Literal["filesystem", "s3"] = "filesystem"
+    STORAGE_FS_ROOT: str = "var/attachments"
+    # Signs filesystem download/upload URLs; must be set outside LOCAL/TESTING.
+    STORAGE_SIGNING_SECRET: str = DEV_STORAGE_SIGNING_SECRET
+    STORAGE_URL_TTL_SEC: int = 60 * 15  # 15 minutes
+    STORAGE_MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024  # 1 GiB
+    # Pending attachments and their uploaded objects are swept after this.
+    STORAGE_PENDING_UPLOAD_TTL_SEC: int = 60 * 60 * 24  # 1 day
+    S3_ENDPOINT_URL: AnyHttpUrl | None = None
+    S3_PUBLIC_ENDPOINT_URL: AnyHttpUrl | None = None
+    S3_BUCKET: str | None = None
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY: str | None = None
+    S3_SECRET_KEY: str | None = None
+
     @model_validator(mode="after")
     def validate_sentry_non_local(self) -> "Config":
         if self.ENVIRONMENT.is_deployed and not self.SENTRY_DSN:
@@ -54,6 +105,29 @@ class Config(CustomBaseSettings):
 
         return self
 
+    @model_validator(mode="after")
+    def validate_s3_storage(self) -> "Config":
+        if self.STORAGE_BACKEND == "s3" and not (
+            self.S3_ENDPOINT_URL
+            and self.S3_BUCKET
+            and self.S3_ACCESS_KEY
+            and self.S3_SECRET_KEY
+        ):
+            raise ValueError("S3 storage requires endpoint, bucket and credentials")
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_storage_signing_secret(self) -> "Config":
+        if (
+            self.STORAGE_BACKEND == "filesystem"
+            and self.STORAGE_SIGNING_SECRET == DEV_STORAGE_SIGNING_SECRET
+            and self.ENVIRONMENT not in (Environment.LOCAL, Environment.TESTING)
+        ):
+            raise ValueError("STORAGE_SIGNING_SECRET is not set")
+
+        return self
+
 
 settings = Config()
 
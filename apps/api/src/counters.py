@@ -0,0 +1,96 @@
+"""Denormalized counters on ``track`` and ``node``.
+
+Writers shift them with in-place UPDATEs inside their transaction, so they
+commit or roll back with the rows they count; ``python -m src.tracks.recount``
+rebuilds them. The ``*_update`` builders return the statement, for writers
+folding it into a larger one. Reads are plain column loads instead of
+aggregates over ``node_completion`` and ``time_entry``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Update, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.nodes.models import Node
+from src.tracks.models import Track
+
+__all__ = [
+    "adjust_node_counters",
+    "adjust_track_counters",
+    "node_counters_update",
+    "track_counters_update",
+]
+
+
+def track_counters_update(
+    track_id: UUID,
+    *,
+    nodes: int = 0,
+    completions: int | ColumnElement[int] = 0,
+) -> Update:
+    return (
+        update(Track)
+        .where(Track.id == track_id)
+        .values(
+            node_count=Track.node_count + nodes,
+            completion_count=Track.completion_count + completions,
+            # Counters are not an edit of the track.
+            updated_at=Track.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_track_counters(
+    session: AsyncSession,
+    track_id: UUID,
+    *,
+    nodes: int = 0,
+    completions: int | ColumnElement[int] = 0,
+) -> None:
+    await session.execute(
+        track_counters_update(track_id, nodes=nodes, completions=completions)
+    )
+
+
+def node_counters_update(
+    node_id: UUID,
+    *,
+    completed_at: datetime | None = None,
+    minutes: int = 0,
+) -> Update:
+    """Record a completion at ``completed_at`` and/or tracked ``minutes``."""
+    values: dict[str, Any] = {
+        "tracked_minutes": Node.tracked_minutes + minutes,
+        "updated_at": Node.updated_at,
+    }
+    if completed_at is not None:
+        values["completion_count"] = Node.completion_count + 1
+        # GREATEST skips NULL, so the first completion sets it.
+        values["last_completed_at"] = func.greatest(
+            Node.last_completed_at, completed_at
+        )
+    return (
+        update(Node)
+        .where(Node.id == node_id)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def adjust_node_counters(
+    session: AsyncSession,
+    node_id: UUID,
+    *,
+    completed_at: datetime | None = None,
+    minutes: int = 0,
+) -> None:
+    await session.execute(
+        node_counters_update(node_id, completed_at=completed_at, minutes=minutes)
+    )
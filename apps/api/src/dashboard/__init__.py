@@ -0,0 +1,5 @@
+from .routers import router as dashboard_router
+
+__all__ = [
+    "dashboard_router",
+]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from src.auth.dependencies import CurrentUser
+from src.dashboard.schemas import Dashboard
+from src.dashboard.services import DashboardService, get_dashboard_service
+from src.database import prefer_replica
+
+router = APIRouter(prefix="/me", tags=["dashboard"])
+
+
+@router.get(
+    "/dashboard",
+    response_model=Dashboard,
+    dependencies=[Depends(prefer_replica)],
+)
+async def get_dashboard(
+    current_user: CurrentUser,
+    entries_limit: int = Query(default=20, ge=1, le=200),
+    service: DashboardService = Depends(get_dashboard_service),
+) -> Dashboard:
+    """Tracks, stats, progress, recent time entries and badges in one call."""
+    return await service.get_dashboard(current_user.id, entries_limit=entries_limit)
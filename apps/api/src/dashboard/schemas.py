@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+from src.badges.schemas import UserBadgePublic
+from src.gamification.schemas import ProgressSummary, UserStatsPublic
+from src.time_tracking.schemas import TimeEntryPublic
+from src.tracks.schemas import TrackListItem
+
+__all__ = ["Dashboard"]
+
+
+class Dashboard(BaseModel):
+    tracks: list[TrackListItem]
+    stats: UserStatsPublic
+    progress: ProgressSummary
+    time_entries: list[TimeEntryPublic]
+    badges: list[UserBadgePublic]
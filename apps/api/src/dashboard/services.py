@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+from uuid import UUID
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.badges.schemas import UserBadgePublic
+from src.badges.services import BadgeService
+from src.config import settings
+from src.dashboard.schemas import Dashboard
+from src.database import get_async_session, snapshot_sessions
+from src.gamification.schemas import ProgressSummary, UserStatsPublic
+from src.gamification.services import GamificationService
+from src.time_tracking.schemas import TimeEntryPublic
+from src.time_tracking.services import TimeTrackingService
+from src.tracks.schemas import TrackListItem
+from src.tracks.services import TrackService
+
+__all__ = [
+    "DashboardService",
+    "get_dashboard_service",
+]
+
+# Connections one dashboard request holds at once.
+CONCURRENCY = 3
+
+# Dashboards reading at once in this process. Fan-outs alone never take the
+# whole pool, so one still waiting for connections is served by other
+# requests returning theirs.
+_fanouts = asyncio.Semaphore(
+    max(
+        1,
+        (settings.DATABASE_POOL_SIZE + settings.DATABASE_POOL_MAX_OVERFLOW)
+        // (CONCURRENCY + 1),
+    )
+)
+
+
+class DashboardService:
+    """Everything the app shows on open, read concurrently from one snapshot."""
+
+    def __init__(self, request: Request, session: AsyncSession):
+        self.request = request
+        self.session = session
+
+    async def get_dashboard(self, user_id: UUID, *, entries_limit: int) -> Dashboard:
+        # The request's session only looked up the user; hand its connection
+        # back instead of holding it next to the snapshot's.
+        await self.session.close()
+        async with _fanouts, snapshot_sessions(self.request, CONCURRENCY) as sessions:
+            if len(sessions) == CONCURRENCY:
+                tracks_session, stats_session, activity_session = sessions
+                tracks, (stats, progress), (entries, badges) = await asyncio.gather(
+                    self._tracks(tracks_session, user_id),
+                    self._stats(stats_session, user_id),
+                    self._activity(activity_session, user_id, entries_limit),
+                )
+            else:
+                (session,) = sessions
+                tracks = await self._tracks(session, user_id)
+                stats, progress = await self._stats(session, user_id)
+                entries, badges = await self._activity(session, user_id, entries_limit)
+        return Dashboard(
+            tracks=tracks,
+            stats=stats,
+            progress=progress,
+            time_entries=entries,
+            badges=badges,
+        )
+
+    @staticmethod
+    async def _tracks(session: AsyncSession, user_id: UUID) -> list[TrackListItem]:
+        aggregates = await TrackService(session).list_tracks(user_id)
+        return [aggregate.to_list_item() for aggregate in aggregates]
+
+    @staticmethod
+    async def _stats(
+        session: AsyncSession,
+        user_id: UUID,
+    ) -> tuple[UserStatsPublic, ProgressSummary]:
+        service = GamificationService(session)
+        return (
+            await service.get_user_stats(user_id),
+            await service.get_progress_summary(user_id),
+        )
+
+    @staticmethod
+    async def _activity(
+        session: AsyncSession,
+        user_id: UUID,
+        entries_limit: int,
+    ) -> tuple[list[TimeEntryPublic], list[UserBadgePublic]]:
+        entries = await TimeTrackingService(session).list_entries(
+            user_id, limit=entries_limit
+        )
+        badges = await BadgeService(session).list_user_badges(user_id)
+        return (
+            [TimeEntryPublic.model_validate(entry) for entry in entries],
+            [UserBadgePublic.model_validate(badge) for badge in badges],
+        )
+
+
+def get_dashboard_service(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+) -> DashboardService:
+    return DashboardService(request, session)
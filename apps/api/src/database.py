@@ -1,41 +1,105 @@
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import Any
+from uuid import uuid4
 
+from fastapi import Request
 from sqlalchemy import (
     CursorResult,
     Insert,
     MetaData,
     Select,
     Update,
+    func,
+    select,
+    text,
 )
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.config import settings
 from src.constants import DB_NAMING_CONVENTION
+from src.pool_metrics import InstrumentedAsyncQueuePool, instrument_engine
+from src.query_stats import track_queries
 
 DATABASE_URL = str(settings.DATABASE_ASYNC_URL)
-
-engine = create_async_engine(
-    DATABASE_URL,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    pool_recycle=settings.DATABASE_POOL_TTL,
-    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+DATABASE_REPLICA_URL = (
+    str(settings.DATABASE_REPLICA_ASYNC_URL)
+    if settings.DATABASE_REPLICA_ASYNC_URL
+    else None
 )
+READ_AFTER_WRITE_COOKIE = "db_primary"
+_AFTER_COMMIT = "after_commit"
+
+logger = logging.getLogger(__name__)
+
+
+def _connect_args() -> dict[str, Any]:
+    if not settings.DATABASE_PGBOUNCER:
+        return {}
+    # A pooled server connection may be shared by other clients, so neither
+    # cache prepared statements nor reuse their names across transactions.
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_TTL,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+    instrument_engine(engine.sync_engine)
+    track_queries(engine.sync_engine)
+    return engine
+
+
+engine = _create_engine(DATABASE_URL)
+replica_engine = _create_engine(DATABASE_REPLICA_URL) if DATABASE_REPLICA_URL else None
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
 async_session_factory = async_sessionmaker(
     bind=engine,
     expire_on_commit=False,
 )
+replica_session_factory = (
+    async_sessionmaker(bind=replica_engine, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+
+def dispose_after_fork() -> None:
+    """Replace the pools inherited from a parent process without closing
+    the parent's connections; called in forked gunicorn workers."""
+    for forked in (engine, replica_engine):
+        if forked is not None:
+            forked.sync_engine.dispose(close=False)
 
 
 class Base(DeclarativeBase):
     metadata = metadata
+    # Server defaults, onupdate expressions and computed columns come back
+    # through RETURNING of the INSERT/UPDATE itself, so written objects need
+    # no refresh before they are serialized.
+    __mapper_args__ = {"eager_defaults": True}
 
 
 async def fetch_one(
@@ -100,6 +164,153 @@ async def get_db_connection() -> AsyncConnection:
         await connection.close()
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session_factory() as session:
-        yield session
+def prefer_replica(request: Request) -> None:
+    """Route dependency marking a read-only route as safe for the replica.
+
+    Must run before the session is created, so declare it in the route's
+    ``dependencies``.
+    """
+    request.state.prefer_replica = True
+
+
+def _session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    if (
+        replica_session_factory is not None
+        and getattr(request.state, "prefer_replica", False)
+        # Recent writers read from the primary until the replica caught up.
+        and READ_AFTER_WRITE_COOKIE not in request.cookies
+    ):
+        return replica_session_factory
+    return async_session_factory
+
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """The request's unit of work.
+
+    The transaction begins with the first statement. Services only ``flush``;
+    the request commits once after the endpoint returned, or rolls back when
+    it raised. Callbacks registered with ``after_commit`` run after a
+    successful commit.
+    """
+    async with _session_factory(request)() as session:
+        try:
+            yield session
+        except Exception:
+            session.info.pop(_AFTER_COMMIT, None)
+            await session.rollback()
+            raise
+        await session.commit()
+        await _run_after_commit(session)
+
+
+def after_commit(
+    session: AsyncSession,
+    callback: Callable[..., Awaitable[Any]],
+    *args: Any,
+) -> None:
+    """Run ``callback(*args)`` once the session's unit of work committed.
+
+    For side effects outside the database (caches, Redis, object storage)
+    that must neither happen for a rolled back request nor be visible
+    before the rows they describe.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append((callback, args))
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    for callback, args in session.info.pop(_AFTER_COMMIT, ()):
+        try:
+            await callback(*args)
+        except Exception:
+            # The data is committed; a failed side effect must not turn the
+            # response into an error.
+            logger.exception("after_commit callback %r failed", callback)
+
+
+_SNAPSHOT_OPTIONS = {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+
+
+@asynccontextmanager
+async def snapshot_sessions(
+    request: Request,
+    count: int,
+) -> AsyncIterator[list[AsyncSession]]:
+    """Up to ``count`` read-only sessions on separate connections, one snapshot.
+
+    The first session exports its snapshot and the others import it, so
+    their queries run concurrently yet all see the same committed state.
+    When the pool cannot spare the other connections within
+    ``DATABASE_SNAPSHOT_JOIN_TIMEOUT_SEC``, only the first session is
+    yielded and callers run their queries on it one after another.
+    Honors ``prefer_replica`` like ``get_async_session``.
+    """
+    factory = _session_factory(request)
+    async with AsyncExitStack() as stack:
+        leader = await stack.enter_async_context(factory())
+        await leader.connection(execution_options=_SNAPSHOT_OPTIONS)
+        snapshot_id = await leader.scalar(select(func.pg_export_snapshot()))
+        followers = [
+            await stack.enter_async_context(factory()) for _ in range(count - 1)
+        ]
+
+        async def join(session: AsyncSession) -> None:
+            await session.connection(execution_options=_SNAPSHOT_OPTIONS)
+            # Takes no bind parameters; the id comes from the server.
+            await session.execute(text(f"SET TRANSACTION SNAPSHOT '{snapshot_id}'"))
+
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(join(session) for session in followers)),
+                settings.DATABASE_SNAPSHOT_JOIN_TIMEOUT_SEC,
+            )
+        except TimeoutError:
+            # Waiting on connections while holding one can starve the pool.
+            for session in followers:
+                await session.close()
+            followers = []
+        yield [leader, *followers]
+
+
+@asynccontextmanager
+async def snapshot_connection(request: Request) -> AsyncIterator[AsyncConnection]:
+    """A read-only connection whose queries all see one snapshot.
+
+    For reads spanning many statements, e.g. streamed from a response body
+    after the request's session is closed. Honors ``prefer_replica``.
+    """
+    async with _session_factory(request)() as session:
+        yield await session.connection(execution_options=_SNAPSHOT_OPTIONS)
+
+
+class ReadAfterWriteMiddleware:
+    """Pins a client to the primary for a while after a successful write.
+
+    Sets a short-lived cookie on responses to unsafe methods; while it is
+    present ``get_async_session`` ignores ``prefer_replica``, so a client
+    reads its own writes even when the replica lags.
+    """
+
+    SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        cookie = (
+            f"{READ_AFTER_WRITE_COOKIE}=1; "
+            f"Max-Age={settings.DATABASE_REPLICA_STICKY_SEC}; Path=/; HttpOnly; "
+            f"SameSite={settings.AUTH_COOKIE_SAMESITE}"
+        )
+        if settings.AUTH_COOKIE_SECURE:
+            cookie += "; Secure"
+        self.cookie = cookie
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                MutableHeaders(scope=message).append("set-cookie", self.cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.database import Base
 
 if TYPE_CHECKING:
+    from src.attachments.models import DocAttachment
     from src.auth.models import User
     from src.nodes.models import Node
     from src.tracks.models import Track
@@ -54,6 +55,10 @@ class Doc(Base):
     user: Mapped["User"] = relationship(lazy="joined")
     track: Mapped[Optional["Track"]] = relationship(back_populates="docs")
     node: Mapped[Optional["Node"]] = relationship()
+    attachments: Mapped[list["DocAttachment"]] = relationship(
+        viewonly=True,
+        order_by="DocAttachment.created_at",
+    )
 
     __table_args__ = (
         Index("idx_doc_user", "user_id"),
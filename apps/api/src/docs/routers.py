@@ -4,26 +4,37 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, Response, status
 
+from src.attachments.schemas import AttachmentPublic
 from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+from src.docs.models import Doc
 from src.docs.schemas import DocCreate, DocPublic, DocUpdate
 from src.docs.services import DocService, get_doc_service
+from src.fieldsets import Embed, Selection, fieldset
 
 router = APIRouter(prefix="/docs", tags=["docs"])
 
+doc_fields = fieldset(
+    DocPublic,
+    embeds={"attachments": Embed("attachments", AttachmentPublic)},
+)
+
 
-@router.get("", response_model=list[DocPublic])
+@router.get("", response_model=list[DocPublic], dependencies=[Depends(prefer_replica)])
 async def list_docs(
     current_user: CurrentUser,
     service: DocService = Depends(get_doc_service),
     track_id: UUID | None = Query(default=None),
     node_id: UUID | None = Query(default=None),
-) -> list[DocPublic]:
+    selection: Selection = Depends(doc_fields),
+) -> list[DocPublic] | Response:
     docs = await service.list_docs(
         current_user.id,
         track_id=track_id,
         node_id=node_id,
+        options=selection.options(Doc),
     )
-    return [DocPublic.model_validate(doc) for doc in docs]
+    return selection.render(docs)
 
 
 @router.post("", response_model=DocPublic, status_code=status.HTTP_201_CREATED)
@@ -36,7 +47,11 @@ async def create_doc(
     return DocPublic.model_validate(doc)
 
 
-@router.get("/{doc_id}", response_model=DocPublic)
+@router.get(
+    "/{doc_id}",
+    response_model=DocPublic,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_doc(
     doc_id: UUID,
     current_user: CurrentUser,
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+from typing import Sequence
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
+from src.attachment_blobs import purge_orphaned_blobs
 from src.database import get_async_session
 from src.docs.models import Doc
 from src.docs.schemas import DocCreate, DocUpdate
@@ -29,8 +32,11 @@ class DocService:
         *,
         track_id: UUID | None = None,
         node_id: UUID | None = None,
+        options: Sequence[ORMOption] = (),
     ) -> list[Doc]:
-        stmt: Select[tuple[Doc]] = select(Doc).where(Doc.user_id == user_id)
+        stmt: Select[tuple[Doc]] = (
+            select(Doc).where(Doc.user_id == user_id).options(*options)
+        )
         if track_id:
             stmt = stmt.where(Doc.track_id == track_id)
         if node_id:
@@ -48,8 +54,8 @@ class DocService:
             track_id=payload.track_id,
             node_id=payload.node_id,
         )
-        async with self.session.begin():
-            self.session.add(doc)
+        self.session.add(doc)
+        await self.session.flush()
         return doc
 
     async def get_doc(self, user_id: UUID, doc_id: UUID) -> Doc:
@@ -86,14 +92,15 @@ class DocService:
             doc.track_id = new_track_id
             doc.node_id = new_node_id
 
-        async with self.session.begin():
-            self.session.add(doc)
+        await self.session.flush()
         return doc
 
     async def delete_doc(self, user_id: UUID, doc_id: UUID) -> None:
         doc = await self.get_doc(user_id, doc_id)
-        async with self.session.begin():
-            await self.session.delete(doc)
+        await self.session.delete(doc)
+        await self.session.flush()
+        # Its attachments went by cascade; drop the blobs only they used.
+        await purge_orphaned_blobs(self.session, user_id)
 
     async def _validate_links(
         self,
@@ -0,0 +1,5 @@
+from .routers import router as events_router
+
+__all__ = [
+    "events_router",
+]
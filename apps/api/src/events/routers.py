@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from src.auth.dependencies import CurrentUser
+from src.config import settings
+from src.database import async_session_factory
+from src.gamification.services import GamificationService
+from src.time_tracking.schemas import TimeEntryPublic
+from src.time_tracking.services import TimeTrackingService
+from src.user_events import EventType, broker, format_event
+
+router = APIRouter(prefix="/me", tags=["events"])
+
+# Clients reconnect after this many milliseconds when the stream drops.
+RETRY_MS = 3000
+
+
+async def _event_stream(user_id: UUID) -> AsyncIterator[str]:
+    async with broker.subscribe(user_id) as subscription:
+        yield f"retry: {RETRY_MS}\n\n"
+        # Current state first, read after subscribing so no change is lost.
+        async with async_session_factory() as session:
+            stats = await GamificationService(session).get_user_stats(user_id)
+            entry = await TimeTrackingService(session).get_active_entry(user_id)
+        yield format_event(EventType.STATS, stats)
+        yield format_event(
+            EventType.TIMER,
+            TimeEntryPublic.model_validate(entry) if entry else None,
+        )
+        while True:
+            message = await subscription.next(settings.EVENTS_HEARTBEAT_SEC)
+            # Comments keep proxies from closing an idle stream.
+            yield message if message is not None else ": heartbeat\n\n"
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_events(current_user: CurrentUser) -> StreamingResponse:
+    """Server-sent events with the user's stats, running timer and badges.
+
+    Starts with a ``stats`` and a ``timer`` event carrying the current state;
+    ``resync`` means events may have been missed and state should be refetched.
+    """
+    return StreamingResponse(
+        _event_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -7,8 +7,12 @@ class DetailedHTTPException(HTTPException):
     STATUS_CODE = status.HTTP_500_INTERNAL_SERVER_ERROR
     DETAIL = "Server error"
 
-    def __init__(self, **kwargs: dict[str, Any]) -> None:
-        super().__init__(status_code=self.STATUS_CODE, detail=self.DETAIL, **kwargs)
+    def __init__(self, detail: Any = None, **kwargs: dict[str, Any]) -> None:
+        super().__init__(
+            status_code=self.STATUS_CODE,
+            detail=self.DETAIL if detail is None else detail,
+            **kwargs,
+        )
 
 
 class PermissionDenied(DetailedHTTPException):
@@ -0,0 +1,5 @@
+from .routers import router as export_router
+
+__all__ = [
+    "export_router",
+]
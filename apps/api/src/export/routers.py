@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica, snapshot_connection
+from src.export.schemas import ExportFormat
+from src.export.services import export_sections, stream_ndjson, stream_zip
+
+router = APIRouter(prefix="/me", tags=["export"])
+
+
+async def _export_stream(
+    request: Request,
+    user_id: UUID,
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    # The request's session is closed before the body streams, so the
+    # export reads through a connection of its own.
+    async with snapshot_connection(request) as connection:
+        write = stream_ndjson if export_format is ExportFormat.NDJSON else stream_zip
+        async for chunk in write(connection, export_sections(user_id)):
+            if chunk:
+                yield chunk
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(prefer_replica)],
+)
+async def export_account(
+    request: Request,
+    current_user: CurrentUser,
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias="format"),
+) -> StreamingResponse:
+    """Everything the account owns, streamed as NDJSON or a zip of CSVs.
+
+    Tracks, nodes, habit schedules, completions, time entries, docs, badges
+    and stats, read from one consistent snapshot.
+    """
+    filename = f"export-{datetime.now(UTC):%Y%m%d}.{export_format.value}"
+    return StreamingResponse(
+        _export_stream(request, current_user.id, export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        },
+    )
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from enum import Enum
+
+__all__ = ["ExportFormat"]
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    ZIP = "zip"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.NDJSON:
+            return "application/x-ndjson"
+        return "application/zip"
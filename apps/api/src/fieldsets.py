@@ -0,0 +1,183 @@
+"""Sparse fieldsets and embedded relations for list endpoints.
+
+    GET /api/v1/tracks/{id}/nodes?fields=id,title,position&include=docs
+
+``fields`` narrows both the columns selected and the payload, ``include``
+embeds related rows loaded with one extra query per relation. Names are
+checked against the response schema; unknown ones are rejected.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Query, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from src.exceptions import BadRequest
+
+__all__ = [
+    "Embed",
+    "Selection",
+    "fieldset",
+]
+
+# Returned whatever ``fields`` says, so clients can always key the items.
+ALWAYS = frozenset({"id"})
+
+
+@dataclass(frozen=True, slots=True)
+class Embed:
+    """A relation that ``include`` can embed, serialized with ``schema``."""
+
+    relationship: str
+    schema: type[BaseModel]
+    many: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class Selection:
+    schema: type[BaseModel]
+    # None: every field of the schema.
+    fields: frozenset[str] | None = None
+    include: tuple[str, ...] = ()
+    embeds: Mapping[str, Embed] = field(default_factory=dict)
+    # Fields computed from other attributes, e.g. ``stats`` from counters.
+    sources: Mapping[str, tuple[str, ...]] = field(default_factory=dict)
+
+    @property
+    def is_full(self) -> bool:
+        return self.fields is None and not self.include
+
+    def wants(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def options(self, model: type[Any]) -> list[ORMOption]:
+        """Loader options selecting only what the response serializes.
+
+        Everything else raises instead of lazy loading, so a field missed
+        here fails loudly rather than querying once per row.
+        """
+        mapper = inspect(model)
+        options: list[ORMOption] = []
+        for name in self.include:
+            options.append(selectinload(getattr(model, self.embeds[name].relationship)))
+        if self.fields is None:
+            return options
+
+        columns = {
+            source
+            for name in self.fields
+            for source in self.sources.get(name, (name,))
+            if source in mapper.column_attrs
+        }
+        for name in self.include:
+            relationship = mapper.relationships[self.embeds[name].relationship]
+            # Selectin loading keys on these, e.g. the foreign key of a
+            # many-to-one.
+            columns.update(
+                mapper.get_property_by_column(column).key
+                for column in relationship.local_columns
+            )
+        options.append(
+            load_only(*(getattr(model, name) for name in columns), raiseload=True)
+        )
+        for name in self.fields:
+            if name in mapper.relationships:
+                options.append(joinedload(getattr(model, name)))
+        options.append(raiseload("*"))
+        return options
+
+    def render(self, items: Iterable[Any]) -> Any:
+        """The response for ``items``: ORM rows or objects shaped like them."""
+        if self.is_full:
+            return [self.schema.model_validate(item) for item in items]
+        adapter = _partial_adapter(
+            self.schema,
+            self.fields,
+            tuple((name, self.embeds[name]) for name in self.include),
+        )
+        payload = adapter.dump_json(adapter.validate_python(list(items)))
+        # Bypasses the route's response_model, which requires every field.
+        return Response(payload, media_type="application/json")
+
+
+@lru_cache(maxsize=256)
+def _partial_adapter(
+    schema: type[BaseModel],
+    fields: frozenset[str] | None,
+    embeds: tuple[tuple[str, Embed], ...],
+) -> TypeAdapter[list[Any]]:
+    definitions: dict[str, Any] = {
+        name: (info.annotation, info)
+        for name, info in schema.model_fields.items()
+        if fields is None or name in fields
+    }
+    for name, embed in embeds:
+        definitions[name] = (
+            list[embed.schema] if embed.many else embed.schema | None,
+            ...,
+        )
+    model = create_model(
+        f"Partial{schema.__name__}",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+    return TypeAdapter(list[model])
+
+
+def _split(value: str | None) -> list[str]:
+    if not value:
+        return []
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def fieldset(
+    schema: type[BaseModel],
+    *,
+    embeds: Mapping[str, Embed] | None = None,
+    sources: Mapping[str, tuple[str, ...]] | None = None,
+) -> Callable[..., Selection]:
+    """A dependency parsing ``fields`` and ``include`` for ``schema``.
+
+    ``sources`` names the model attributes a field is read from when they
+    differ from the field itself.
+    """
+    embeds = dict(embeds or {})
+    sources = dict(sources or {})
+    known = ", ".join(schema.model_fields)
+    includable = ", ".join(embeds) or "none"
+
+    def dependency(
+        fields: str | None = Query(
+            default=None,
+            description=f"Comma-separated fields to return, of: {known}",
+        ),
+        include: str | None = Query(
+            default=None,
+            description=f"Comma-separated relations to embed, of: {includable}",
+        ),
+    ) -> Selection:
+        requested = _split(fields)
+        unknown = [name for name in requested if name not in schema.model_fields]
+        if unknown:
+            raise BadRequest(detail=f"Unknown fields: {', '.join(unknown)}")
+        included = list(dict.fromkeys(_split(include)))
+        unknown = [name for name in included if name not in embeds]
+        if unknown:
+            raise BadRequest(detail=f"Unknown relations: {', '.join(unknown)}")
+        return Selection(
+            schema=schema,
+            fields=frozenset(requested) | ALWAYS if requested else None,
+            include=tuple(included),
+            embeds=embeds,
+            sources=sources,
+        )
+
+    return dependency
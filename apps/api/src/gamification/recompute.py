@@ -0,0 +1,305 @@
+"""Rebuild ``user_stats`` from ``node_completion``.
+
+    python -m src.gamification.recompute [--reprice] [--chunk-size N] [--dry-run]
+
+Completions are streamed ordered by user and time through a server-side
+cursor. XP, level and streak are computed per chunk with vectorized NumPy
+passes and written back with one ``UPDATE ... FROM (VALUES ...)`` per chunk.
+Streaks follow ``record_completion_stats`` on UTC days.
+
+Stats of a user who completes a node while their chunk is in flight can be
+overwritten, so run this outside peak hours.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import (
+    Date,
+    Integer,
+    Row,
+    cast,
+    column,
+    exists,
+    func,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.completions.models import NodeCompletion
+from src.database import engine
+from src.gamification.models import UserStats
+from src.leaderboard.services import drop_leaderboards
+from src.nodes.models import Node
+
+__all__ = ["UserStatsBatch", "levels_from_xp", "recompute_user_stats", "summarize"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5_000  # users per UPDATE; 5 binds each, under asyncpg's 32767
+ROWS_PER_FETCH = 100_000
+_SECONDS_PER_DAY = 86_400
+
+
+@dataclass(slots=True)
+class UserStatsBatch:
+    user_ids: np.ndarray
+    xp_total: np.ndarray
+    level: np.ndarray
+    current_streak_days: np.ndarray
+    last_active_day: np.ndarray  # days since the epoch
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def chunks(self, size: int) -> Iterator[UserStatsBatch]:
+        for offset in range(0, len(self), size):
+            window = slice(offset, offset + size)
+            yield UserStatsBatch(
+                user_ids=self.user_ids[window],
+                xp_total=self.xp_total[window],
+                level=self.level[window],
+                current_streak_days=self.current_streak_days[window],
+                last_active_day=self.last_active_day[window],
+            )
+
+
+def levels_from_xp(xp_total: np.ndarray) -> np.ndarray:
+    """Vectorized ``calculate_level_from_xp``."""
+    xp = np.maximum(xp_total.astype(np.int64), 0)
+    steps = (xp // 50).astype(np.float64)
+    level = ((1 + np.sqrt(1 + 4 * steps)) // 2).astype(np.int64)
+    # Correct float rounding next to perfect squares.
+    level += 50 * (level + 1) * level <= xp
+    level -= 50 * level * (level - 1) > xp
+    return np.maximum(level, 1)
+
+
+def summarize(
+    user_ids: np.ndarray,
+    days: np.ndarray,
+    earned_xp: np.ndarray,
+) -> UserStatsBatch:
+    """Per-user stats from completion rows sorted by user and time.
+
+    A user's streak is the number of distinct days in the run of consecutive
+    days that ends on their last active day.
+    """
+    if not len(user_ids):
+        empty = np.empty(0, dtype=np.int64)
+        return UserStatsBatch(user_ids, empty, empty, empty, empty)
+
+    new_user = np.ones(len(user_ids), dtype=bool)
+    new_user[1:] = user_ids[1:] != user_ids[:-1]
+    starts = np.flatnonzero(new_user)
+    ends = np.append(starts[1:], len(user_ids)) - 1
+
+    gap = np.diff(days, prepend=days[0])
+    new_day = new_user | (gap != 0)
+    breaks = new_user | (gap > 1)
+    distinct_days = np.cumsum(new_day)
+    index = np.arange(len(days))
+    last_break = np.maximum.accumulate(np.where(breaks, index, 0))
+
+    xp_total = np.add.reduceat(np.maximum(earned_xp, 0), starts)
+    streak = distinct_days[ends] - distinct_days[last_break[ends]] + 1
+    return UserStatsBatch(
+        user_ids=user_ids[starts],
+        xp_total=xp_total,
+        level=levels_from_xp(xp_total),
+        current_streak_days=streak,
+        last_active_day=days[ends],
+    )
+
+
+async def _stream_batches(
+    connection: AsyncConnection,
+    *,
+    reprice: bool,
+    rows_per_fetch: int,
+) -> AsyncIterator[UserStatsBatch]:
+    """Yield stats per fetched partition of completion rows.
+
+    Rows of the last user in a partition may continue in the next one, so
+    they are carried over instead of being summarized early.
+    """
+    day = cast(
+        func.floor(
+            func.extract("epoch", NodeCompletion.completed_at) / _SECONDS_PER_DAY
+        ),
+        Integer,
+    )
+    stmt = select(
+        NodeCompletion.user_id,
+        day,
+        Node.base_xp if reprice else NodeCompletion.earned_xp,
+    ).order_by(NodeCompletion.user_id, NodeCompletion.completed_at)
+    if reprice:
+        stmt = stmt.join(Node, Node.id == NodeCompletion.node_id)
+    result = await connection.stream(stmt.execution_options(yield_per=rows_per_fetch))
+
+    carry: Sequence[Row] = []
+    async for partition in result.partitions():
+        rows = [*carry, *partition]
+        last_user = rows[-1][0]
+        split = len(rows)
+        while split and rows[split - 1][0] == last_user:
+            split -= 1
+        carry = rows[split:]
+        if split:
+            yield _summarize_rows(rows[:split])
+    if carry:
+        yield _summarize_rows(carry)
+
+
+def _summarize_rows(rows: Sequence[Row]) -> UserStatsBatch:
+    user_ids, days, earned_xp = zip(*rows)
+    return summarize(
+        np.array(user_ids, dtype=object),
+        np.array(days, dtype=np.int64),
+        np.array(earned_xp, dtype=np.int64),
+    )
+
+
+async def _write_batch(connection: AsyncConnection, batch: UserStatsBatch) -> None:
+    last_active = batch.last_active_day.astype("datetime64[D]").astype(object).tolist()
+    recomputed = values(
+        column("user_id", PGUUID(as_uuid=True)),
+        column("xp_total", Integer),
+        column("level", Integer),
+        column("current_streak_days", Integer),
+        column("last_active_date", Date),
+        name="recomputed",
+    ).data(
+        list(
+            zip(
+                batch.user_ids.tolist(),
+                batch.xp_total.tolist(),
+                batch.level.tolist(),
+                batch.current_streak_days.tolist(),
+                last_active,
+            )
+        )
+    )
+    await connection.execute(
+        update(UserStats)
+        .where(UserStats.user_id == recomputed.c.user_id)
+        .values(
+            xp_total=recomputed.c.xp_total,
+            level=recomputed.c.level,
+            current_streak_days=recomputed.c.current_streak_days,
+            last_active_date=recomputed.c.last_active_date,
+        )
+    )
+
+
+async def _reprice(connection: AsyncConnection) -> int:
+    """Set every completion's ``earned_xp`` to its node's current ``base_xp``."""
+    result = await connection.execute(
+        update(NodeCompletion)
+        .where(
+            Node.id == NodeCompletion.node_id,
+            NodeCompletion.earned_xp != Node.base_xp,
+        )
+        .values(earned_xp=Node.base_xp)
+    )
+    return result.rowcount
+
+
+async def recompute_user_stats(
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reprice: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """Recompute XP, level and streak of every user; returns users written."""
+    started = time.perf_counter()
+    async with engine.connect() as writer:
+        if reprice and not dry_run:
+            repriced = await _reprice(writer)
+            logger.info("Repriced %d completions", repriced)
+        # Every user with completions needs a row for the UPDATE to hit.
+        await writer.execute(
+            insert(UserStats)
+            .from_select(["user_id"], select(NodeCompletion.user_id).distinct())
+            .on_conflict_do_nothing(index_elements=[UserStats.user_id])
+        )
+        await writer.execute(
+            update(UserStats)
+            .where(~exists().where(NodeCompletion.user_id == UserStats.user_id))
+            .values(xp_total=0, level=1, current_streak_days=0, last_active_date=None)
+        )
+        if dry_run:
+            await writer.rollback()
+        else:
+            await writer.commit()
+
+        users = 0
+        async with engine.connect() as reader:
+            batches = _stream_batches(
+                reader,
+                reprice=reprice,
+                rows_per_fetch=ROWS_PER_FETCH,
+            )
+            async for batch in batches:
+                for chunk in batch.chunks(chunk_size):
+                    if not dry_run:
+                        await _write_batch(writer, chunk)
+                        await writer.commit()
+                users += len(batch)
+                logger.info("Recomputed %d users", users)
+
+    if not dry_run:
+        await drop_leaderboards()
+    logger.info(
+        "Recomputed %d users in %.1fs%s",
+        users,
+        time.perf_counter() - started,
+        " (dry run)" if dry_run else "",
+    )
+    return users
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="users written per UPDATE statement",
+    )
+    parser.add_argument(
+        "--reprice",
+        action="store_true",
+        help="reset earned_xp of every completion to the node's current base_xp",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="compute everything but roll back all writes",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(
+        recompute_user_stats(
+            chunk_size=args.chunk_size,
+            reprice=args.reprice,
+            dry_run=args.dry_run,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 
 from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
 from src.gamification.schemas import ProgressSummary, UserStatsPublic
 from src.gamification.services import (
     GamificationService,
@@ -12,7 +13,11 @@ from src.gamification.services import (
 router = APIRouter(prefix="/me", tags=["gamification"])
 
 
-@router.get("/stats", response_model=UserStatsPublic)
+@router.get(
+    "/stats",
+    response_model=UserStatsPublic,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_stats(
     current_user: CurrentUser,
     service: GamificationService = Depends(get_gamification_service),
@@ -20,7 +25,11 @@ async def get_stats(
     return await service.get_user_stats(current_user.id)
 
 
-@router.get("/progress/summary", response_model=ProgressSummary)
+@router.get(
+    "/progress/summary",
+    response_model=ProgressSummary,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_progress_summary(
     current_user: CurrentUser,
     service: GamificationService = Depends(get_gamification_service),
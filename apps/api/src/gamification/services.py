@@ -1,99 +1,113 @@
 from __future__ import annotations
 
-from datetime import UTC, date, datetime
+from datetime import UTC, datetime, time, timedelta
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, select
+from sqlalchemy import ScalarSelect, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.completions.models import NodeCompletion
 from src.database import get_async_session
+from src.gamification.models import UserStats
 from src.gamification.schemas import ProgressSummary, UserStatsPublic
-from src.gamification.utils import (
-    get_or_create_user_stats,
-    xp_to_next_level,
-)
+from src.gamification.utils import xp_to_next_level
 from src.time_tracking.models import TimeEntry
 
 __all__ = [
     "GamificationService",
     "get_gamification_service",
+    "user_stats_public",
 ]
 
 
+def user_stats_public(stats: UserStats) -> UserStatsPublic:
+    xp_floor = 0 if stats.level <= 1 else 50 * stats.level * (stats.level - 1)
+    xp_progress = stats.xp_total - xp_floor
+    xp_to_next = xp_to_next_level(stats.level)
+    return UserStatsPublic(
+        level=stats.level,
+        xp_total=stats.xp_total,
+        xp_to_next=xp_to_next,
+        xp_progress=max(xp_progress, 0),
+        xp_remaining=max(xp_to_next - xp_progress, 0),
+        current_streak_days=stats.current_streak_days,
+        last_active_date=stats.last_active_date,
+    )
+
+
 class GamificationService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def get_user_stats(self, user_id: UUID) -> UserStatsPublic:
-        stats = await get_or_create_user_stats(self.session, user_id)
-        xp_floor = self._xp_floor(stats.level)
-        xp_progress = stats.xp_total - xp_floor
-        xp_to_next = xp_to_next_level(stats.level)
-        xp_remaining = max(xp_to_next - xp_progress, 0)
-        return UserStatsPublic(
-            level=stats.level,
-            xp_total=stats.xp_total,
-            xp_to_next=xp_to_next,
-            xp_progress=max(xp_progress, 0),
-            xp_remaining=xp_remaining,
-            current_streak_days=stats.current_streak_days,
-            last_active_date=stats.last_active_date,
-        )
+        return user_stats_public(await self._get_stats(user_id))
 
     async def get_progress_summary(self, user_id: UUID) -> ProgressSummary:
-        stats = await get_or_create_user_stats(self.session, user_id)
-        xp_to_next = xp_to_next_level(stats.level)
-        total_time_minutes = await self._total_minutes(user_id)
-        total_completions = await self._completion_count(user_id)
-        today_completions = await self._completion_count(
-            user_id,
-            on_date=datetime.now(UTC).date(),
-        )
+        stats = await self._get_stats(user_id)
+        today = datetime.combine(datetime.now(UTC).date(), time.min, tzinfo=UTC)
+        # One round trip for all three aggregates.
+        totals = (
+            await self.session.execute(
+                select(
+                    self._total_minutes(user_id).label("minutes"),
+                    self._completion_count(user_id).label("completions"),
+                    self._completion_count(user_id, since=today).label("today"),
+                )
+            )
+        ).one()
         return ProgressSummary(
             level=stats.level,
             xp_total=stats.xp_total,
-            xp_to_next=xp_to_next,
+            xp_to_next=xp_to_next_level(stats.level),
             current_streak_days=stats.current_streak_days,
-            total_time_minutes=total_time_minutes,
-            total_completions=total_completions,
-            today_completions=today_completions,
+            total_time_minutes=int(totals.minutes),
+            total_completions=int(totals.completions),
+            today_completions=int(totals.today),
+        )
+
+    async def _get_stats(self, user_id: UUID) -> UserStats:
+        # Defaults are not persisted, so this read path works on a replica.
+        stats = await self.session.scalar(
+            select(UserStats).where(UserStats.user_id == user_id)
         )
+        if stats is None:
+            stats = UserStats(
+                user_id=user_id,
+                level=1,
+                xp_total=0,
+                current_streak_days=0,
+            )
+        return stats
 
-    async def _total_minutes(self, user_id: UUID) -> int:
-        stmt = select(func.coalesce(func.sum(TimeEntry.duration_min), 0)).where(
-            TimeEntry.user_id == user_id,
-            TimeEntry.duration_min.is_not(None),
+    @staticmethod
+    def _total_minutes(user_id: UUID) -> ScalarSelect[int]:
+        return (
+            select(func.coalesce(func.sum(TimeEntry.duration_min), 0))
+            .where(
+                TimeEntry.user_id == user_id,
+                TimeEntry.duration_min.is_not(None),
+            )
+            .scalar_subquery()
         )
-        total = await self.session.scalar(stmt)
-        return int(total or 0)
 
-    async def _completion_count(
-        self,
+    @staticmethod
+    def _completion_count(
         user_id: UUID,
-        on_date: date | None = None,
-    ) -> int:
+        since: datetime | None = None,
+    ) -> ScalarSelect[int]:
         stmt = select(func.count(NodeCompletion.id)).where(
             NodeCompletion.user_id == user_id
         )
-        if on_date:
-            start_dt = datetime.combine(on_date, datetime.min.time(), tzinfo=UTC)
-            end_dt = datetime.combine(on_date, datetime.max.time(), tzinfo=UTC)
+        if since:
             stmt = stmt.where(
-                NodeCompletion.completed_at >= start_dt,
-                NodeCompletion.completed_at <= end_dt,
+                NodeCompletion.completed_at >= since,
+                NodeCompletion.completed_at < since + timedelta(days=1),
             )
-        count = await self.session.scalar(stmt)
-        return int(count or 0)
-
-    def _xp_floor(self, level: int) -> int:
-        if level <= 1:
-            return 0
-        return 50 * level * (level - 1)
+        return stmt.scalar_subquery()
 
 
 def get_gamification_service(
     session: AsyncSession = Depends(get_async_session),
 ) -> GamificationService:
-        return GamificationService(session)
+    return GamificationService(session)
@@ -1,43 +1,26 @@
 from __future__ import annotations
 
+import math
+from collections.abc import Sequence
 from datetime import date
 from uuid import UUID
 
-from sqlalchemy import Select, select
+from sqlalchemy import Integer, Numeric, case, cast, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import ColumnElement
 
 from src.gamification.models import UserStats
 
 __all__ = [
-    "apply_xp",
     "calculate_level_from_xp",
-    "get_or_create_user_stats",
-    "update_streak",
+    "level_from_xp_sql",
+    "record_completion_stats",
     "xp_to_next_level",
 ]
 
 
-async def get_or_create_user_stats(
-    session: AsyncSession,
-    user_id: UUID,
-    *,
-    for_update: bool = False,
-) -> UserStats:
-    stmt: Select[tuple[UserStats]] = select(UserStats).where(
-        UserStats.user_id == user_id
-    )
-    if for_update:
-        stmt = stmt.with_for_update()
-
-    stats = await session.scalar(stmt)
-    if stats is None:
-        stats = UserStats(user_id=user_id)
-        session.add(stats)
-        await session.flush()
-
-    return stats
-
-
 def xp_to_next_level(level: int) -> int:
     return max(level, 1) * 100
 
@@ -49,27 +32,75 @@ def _xp_to_reach_level(level: int) -> int:
 
 
 def calculate_level_from_xp(xp_total: int) -> int:
-    level = 1
-    while xp_total >= _xp_to_reach_level(level + 1):
-        level += 1
-    return level
-
-
-def apply_xp(stats: UserStats, earned_xp: int) -> None:
-    stats.xp_total = max(0, stats.xp_total + max(earned_xp, 0))
-    stats.level = calculate_level_from_xp(stats.xp_total)
-
-
-def update_streak(stats: UserStats, activity_date: date) -> None:
-    last_date = stats.last_active_date
-    if last_date is None:
-        stats.current_streak_days = 1
-    else:
-        delta = (activity_date - last_date).days
-        if delta == 1:
-            stats.current_streak_days += 1
-        elif delta > 1:
-            stats.current_streak_days = 1
-        # delta == 0 keeps streak unchanged
-
-    stats.last_active_date = activity_date
+    # Inverse of ``_xp_to_reach_level``: the largest L with L * (L - 1) <= xp // 50.
+    steps = max(xp_total, 0) // 50
+    return (1 + math.isqrt(1 + 4 * steps)) // 2
+
+
+def level_from_xp_sql(xp_total: ColumnElement[int]) -> ColumnElement[int]:
+    """``calculate_level_from_xp`` as a SQL expression."""
+    steps = func.greatest(xp_total, 0) // 50
+    root = cast(func.floor(func.sqrt(cast(1 + 4 * steps, Numeric))), Integer)
+    return (1 + root) // 2
+
+
+async def record_completion_stats(
+    session: AsyncSession,
+    user_id: UUID,
+    earned_xp: int,
+    activity_date: date,
+    *,
+    with_writes: Sequence[UpdateBase] = (),
+) -> UserStats:
+    """Apply one completion to ``user_stats`` in a single upsert.
+
+    Evaluated by Postgres against the current row:
+
+    - ``earned_xp`` is clamped at 0 and added to ``xp_total``; ``level``
+      follows from the new total as in ``calculate_level_from_xp``.
+    - The streak counts consecutive activity days: it grows by one on the
+      day after ``last_active_date``, restarts at 1 after a gap or on the
+      first activity, and is kept for the same or an earlier day.
+    - ``last_active_date`` never moves back.
+
+    The row lock is only taken by this statement, so callers should issue
+    it last before committing. ``with_writes`` run in the same statement as
+    data-modifying CTEs, so the other rows a completion locks are locked no
+    earlier than this one.
+    """
+    earned_xp = max(earned_xp, 0)
+    current = UserStats.__table__.c
+    xp_total = current.xp_total + earned_xp
+    days_since = activity_date - current.last_active_date
+    stmt = (
+        insert(UserStats)
+        .values(
+            user_id=user_id,
+            xp_total=earned_xp,
+            level=calculate_level_from_xp(earned_xp),
+            current_streak_days=1,
+            last_active_date=activity_date,
+        )
+        .on_conflict_do_update(
+            index_elements=[UserStats.user_id],
+            set_={
+                "xp_total": xp_total,
+                "level": level_from_xp_sql(xp_total),
+                "current_streak_days": case(
+                    (current.last_active_date.is_(None), 1),
+                    (days_since == 1, current.current_streak_days + 1),
+                    (days_since > 1, 1),
+                    else_=current.current_streak_days,
+                ),
+                "last_active_date": func.greatest(
+                    current.last_active_date,
+                    activity_date,
+                ),
+            },
+        )
+        .returning(UserStats)
+        .execution_options(populate_existing=True)
+    )
+    for index, write in enumerate(with_writes):
+        stmt = stmt.add_cte(write.cte(f"write_{index}"))
+    return await session.scalar(stmt)
@@ -0,0 +1,5 @@
+from .routers import router as habits_router
+
+__all__ = [
+    "habits_router",
+]
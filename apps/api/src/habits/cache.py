@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from src.cache import get_cache
+from src.config import settings
+
+__all__ = ["habit_stats_key", "invalidate_habit_stats"]
+
+
+def _version_key(user_id: UUID) -> str:
+    return f"habit-stats-version:{user_id}"
+
+
+async def _new_version(user_id: UUID) -> bytes:
+    version = uuid4().hex.encode()
+    await get_cache().set(
+        _version_key(user_id),
+        version,
+        ttl=settings.HABIT_STATS_CACHE_TTL_SEC,
+    )
+    return version
+
+
+async def habit_stats_key(user_id: UUID) -> str:
+    """The key of the user's current cached statistics.
+
+    It changes with every invalidation, so a read that started before one
+    writes its result where nothing reads any more.
+    """
+    version = await get_cache().get(_version_key(user_id))
+    if version is None:
+        version = await _new_version(user_id)
+    return f"habit-stats:{user_id}:{version.decode()}"
+
+
+async def invalidate_habit_stats(user_id: UUID) -> None:
+    """Drop cached habit statistics after completions or schedule changes."""
+    await _new_version(user_id)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import date
+from typing import Any
+
+import numpy as np
+
+from src.nodes.models import HabitFrequency
+
+__all__ = [
+    "OccurrenceCalendar",
+    "count_on_days",
+    "to_day_array",
+]
+
+# 1970-01-01 (day 0 of datetime64[D]) was a Thursday, i.e. weekday() == 3.
+_EPOCH_WEEKDAY = 3
+
+
+def to_day_array(days: Iterable[date]) -> np.ndarray:
+    """Sorted ``datetime64[D]`` array from Python dates."""
+    return np.sort(np.fromiter(days, dtype="datetime64[D]"))
+
+
+def count_on_days(days: np.ndarray, events: np.ndarray) -> np.ndarray:
+    """Number of ``events`` (sorted day array) falling on each of ``days``."""
+    left = np.searchsorted(events, days, side="left")
+    right = np.searchsorted(events, days, side="right")
+    return right - left
+
+
+class OccurrenceCalendar:
+    """Expands habit schedules over an inclusive date range.
+
+    Calendar fields are computed once per range as NumPy arrays and every
+    schedule is then reduced to a boolean mask over them, so expanding all of
+    a user's habits costs a handful of vector operations per habit.
+
+    ``days_of_week`` follows ``date.weekday()`` (0 = Monday). A
+    ``days_of_month`` entry past the end of a short month falls on that
+    month's last day, so "the 31st" still happens in February.
+    """
+
+    def __init__(self, start: date, end: date):
+        if end < start:
+            raise ValueError("end must not be before start")
+        self.start = start
+        self.end = end
+        self.days = np.arange(
+            np.datetime64(start, "D"),
+            np.datetime64(end, "D") + 1,
+        )
+        months = self.days.astype("datetime64[M]")
+        month_start = months.astype("datetime64[D]")
+        next_month_start = (months + 1).astype("datetime64[D]")
+        self.weekday = (self.days.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+        self.day_of_month = (self.days - month_start).astype(np.int64) + 1
+        self.days_in_month = (next_month_start - month_start).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def due_mask(
+        self,
+        frequency: HabitFrequency,
+        meta: Mapping[str, Any] | None,
+        *,
+        active_from: date | None = None,
+    ) -> np.ndarray:
+        meta = meta or {}
+        if frequency == HabitFrequency.WEEKLY:
+            mask = np.isin(self.weekday, meta.get("days_of_week") or [])
+        elif frequency == HabitFrequency.MONTHLY:
+            targets = np.asarray(meta.get("days_of_month") or [], dtype=np.int64)
+            mask = np.isin(self.day_of_month, targets)
+            if targets.size:
+                month_end = self.day_of_month == self.days_in_month
+                mask |= month_end & (targets.max() > self.days_in_month)
+        else:
+            mask = np.ones(len(self.days), dtype=bool)
+
+        if active_from is not None:
+            mask &= self.days >= np.datetime64(active_from, "D")
+        return mask
+
+    def due_days(
+        self,
+        frequency: HabitFrequency,
+        meta: Mapping[str, Any] | None,
+        *,
+        active_from: date | None = None,
+    ) -> np.ndarray:
+        return self.days[self.due_mask(frequency, meta, active_from=active_from)]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from fastapi import APIRouter, Depends, Query
+
+from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+from src.habits.schemas import AgendaItem, HabitStatsResponse
+from src.habits.services import (
+    MAX_STATS_WINDOW_DAYS,
+    HabitService,
+    get_habit_service,
+)
+
+router = APIRouter(prefix="/me", tags=["habits"])
+
+
+@router.get(
+    "/agenda",
+    response_model=list[AgendaItem],
+    dependencies=[Depends(prefer_replica)],
+)
+async def get_agenda(
+    current_user: CurrentUser,
+    service: HabitService = Depends(get_habit_service),
+    from_: date | None = Query(default=None, alias="from"),
+    to: date | None = Query(default=None),
+) -> list[AgendaItem]:
+    start = from_ or datetime.now(UTC).date()
+    end = to or start
+    return await service.get_agenda(current_user.id, start, end)
+
+
+# Not on the replica: the response is cached, and a lagging replica would
+# cache statistics missing the completions that invalidated the last copy.
+@router.get("/habits/stats", response_model=HabitStatsResponse)
+async def get_habit_stats(
+    current_user: CurrentUser,
+    service: HabitService = Depends(get_habit_service),
+    window_days: int = Query(default=30, ge=1, le=MAX_STATS_WINDOW_DAYS),
+) -> HabitStatsResponse:
+    return await service.get_stats(current_user.id, window_days=window_days)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import date
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.nodes.models import HabitFrequency
+
+__all__ = ["AgendaItem", "HabitStats", "HabitStatsResponse"]
+
+
+class AgendaItem(BaseModel):
+    day: date
+    node_id: UUID
+    track_id: UUID
+    title: str
+    frequency: HabitFrequency
+    base_xp: int
+    is_locked: bool
+    completed: bool
+    completion_count: int
+
+
+class HabitStats(BaseModel):
+    node_id: UUID
+    track_id: UUID
+    title: str
+    frequency: HabitFrequency
+    current_streak: int
+    longest_streak: int
+    expected_count: int
+    completed_count: int
+    adherence: float | None
+    last_completed_on: date | None
+
+
+class HabitStatsResponse(BaseModel):
+    as_of: date
+    window_days: int
+    items: list[HabitStats]
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+from uuid import UUID
+
+import numpy as np
+from fastapi import Depends
+from sqlalchemy import Date, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.cache import get_cache
+from src.completions.models import NodeCompletion
+from src.config import settings
+from src.database import get_async_session
+from src.exceptions import BadRequest
+from src.habits.cache import habit_stats_key
+from src.habits.occurrences import OccurrenceCalendar, count_on_days, to_day_array
+from src.habits.schemas import AgendaItem, HabitStats, HabitStatsResponse
+from src.habits.stats import occurrence_stats
+from src.nodes.models import HabitSchedule, Node, NodeType
+from src.tracks.models import Track
+
+__all__ = [
+    "MAX_AGENDA_DAYS",
+    "MAX_STATS_WINDOW_DAYS",
+    "HabitService",
+    "completion_day",
+    "get_habit_service",
+]
+
+MAX_AGENDA_DAYS = 366
+MAX_STATS_WINDOW_DAYS = 366
+
+
+def completion_day():
+    """UTC calendar day of a completion, the day streaks count."""
+    return func.date(func.timezone("UTC", NodeCompletion.completed_at), type_=Date)
+
+
+class HabitService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_agenda(
+        self,
+        user_id: UUID,
+        start: date,
+        end: date,
+    ) -> list[AgendaItem]:
+        if end < start:
+            raise BadRequest(detail="'to' must not be before 'from'")
+        if (end - start).days >= MAX_AGENDA_DAYS:
+            raise BadRequest(detail=f"Range is limited to {MAX_AGENDA_DAYS} days")
+
+        calendar = OccurrenceCalendar(start, end)
+        items: list[AgendaItem] = []
+        for habit in await self._habits_with_completions(user_id, start, end):
+            due_days = calendar.due_days(
+                habit.frequency,
+                habit.meta,
+                active_from=habit.created_at.astimezone(UTC).date(),
+            )
+            counts = count_on_days(due_days, to_day_array(habit.completed_days or ()))
+            for day, count in zip(due_days.tolist(), counts.tolist()):
+                items.append(
+                    AgendaItem(
+                        day=day,
+                        node_id=habit.id,
+                        track_id=habit.track_id,
+                        title=habit.title,
+                        frequency=habit.frequency,
+                        base_xp=habit.base_xp,
+                        is_locked=habit.is_locked,
+                        completed=count > 0,
+                        completion_count=count,
+                    )
+                )
+        items.sort(key=lambda item: item.day)
+        return items
+
+    async def get_stats(
+        self,
+        user_id: UUID,
+        *,
+        window_days: int = 30,
+    ) -> HabitStatsResponse:
+        """Per-habit streaks and adherence over the last ``window_days``.
+
+        The whole response is cached per user; the cached copy is only used
+        for the same day and window and is replaced on new completions.
+        """
+        today = datetime.now(UTC).date()
+        cache = get_cache()
+        key = await habit_stats_key(user_id)
+        cached = await cache.get(key)
+        if cached is not None:
+            response = HabitStatsResponse.model_validate_json(cached)
+            if response.as_of == today and response.window_days == window_days:
+                return response
+
+        habits = await self._habits_with_completions(user_id, None, today)
+        window_start = today - timedelta(days=window_days - 1)
+        first_day = min(
+            (habit.created_at.astimezone(UTC).date() for habit in habits),
+            default=today,
+        )
+        calendar = OccurrenceCalendar(min(first_day, today), today)
+        items: list[HabitStats] = []
+        for habit in habits:
+            completed_days = np.unique(to_day_array(habit.completed_days or ()))
+            due_days = calendar.due_days(
+                habit.frequency,
+                habit.meta,
+                active_from=habit.created_at.astimezone(UTC).date(),
+            )
+            stats = occurrence_stats(
+                due_days,
+                completed_days,
+                today=today,
+                window_start=window_start,
+            )
+            items.append(
+                HabitStats(
+                    node_id=habit.id,
+                    track_id=habit.track_id,
+                    title=habit.title,
+                    frequency=habit.frequency,
+                    current_streak=stats.current_streak,
+                    longest_streak=stats.longest_streak,
+                    expected_count=stats.expected_count,
+                    completed_count=stats.completed_count,
+                    adherence=(
+                        stats.completed_count / stats.expected_count
+                        if stats.expected_count
+                        else None
+                    ),
+                    last_completed_on=(
+                        completed_days[-1].item() if completed_days.size else None
+                    ),
+                )
+            )
+
+        response = HabitStatsResponse(
+            as_of=today,
+            window_days=window_days,
+            items=items,
+        )
+        await cache.set(
+            key,
+            response.model_dump_json().encode(),
+            ttl=settings.HABIT_STATS_CACHE_TTL_SEC,
+        )
+        return response
+
+    async def _habits_with_completions(
+        self,
+        user_id: UUID,
+        start: date | None,
+        end: date,
+    ):
+        """All habits of the user with their completion days in range.
+
+        One round trip: completions are pre-aggregated per node and joined
+        onto the habit rows. ``start=None`` reads the whole history.
+        """
+        range_end = datetime.combine(end + timedelta(days=1), time.min, tzinfo=UTC)
+        completions = select(
+            NodeCompletion.node_id,
+            func.array_agg(completion_day()).label("completed_days"),
+        ).where(
+            NodeCompletion.user_id == user_id,
+            NodeCompletion.completed_at < range_end,
+        )
+        if start is not None:
+            range_start = datetime.combine(start, time.min, tzinfo=UTC)
+            completions = completions.where(NodeCompletion.completed_at >= range_start)
+        completions = completions.group_by(NodeCompletion.node_id).subquery()
+        stmt = (
+            select(
+                Node.id,
+                Node.track_id,
+                Node.title,
+                Node.base_xp,
+                Node.is_locked,
+                Node.created_at,
+                HabitSchedule.frequency,
+                HabitSchedule.meta,
+                completions.c.completed_days,
+            )
+            .join(Track, Track.id == Node.track_id)
+            .join(HabitSchedule, HabitSchedule.node_id == Node.id)
+            .outerjoin(completions, completions.c.node_id == Node.id)
+            .where(Track.user_id == user_id, Node.type == NodeType.HABIT)
+            .order_by(Track.position, Node.position, Node.created_at)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+
+def get_habit_service(
+    session: AsyncSession = Depends(get_async_session),
+) -> HabitService:
+    return HabitService(session)
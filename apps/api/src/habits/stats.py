@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+
+__all__ = ["OccurrenceStats", "occurrence_stats"]
+
+
+@dataclass(frozen=True, slots=True)
+class OccurrenceStats:
+    current_streak: int
+    longest_streak: int
+    expected_count: int
+    completed_count: int
+
+
+def _runs(hits: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start/end (exclusive) indices of every run of ``True`` in ``hits``."""
+    edges = np.diff(np.concatenate(([0], hits.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def occurrence_stats(
+    due_days: np.ndarray,
+    completed_days: np.ndarray,
+    *,
+    today: date,
+    window_start: date,
+) -> OccurrenceStats:
+    """Streaks and adherence of one habit.
+
+    ``due_days`` are the habit's expected occurrences up to ``today`` and
+    ``completed_days`` the sorted days it was completed on. Streaks count
+    consecutive completed occurrences, so a weekly habit done every Monday
+    for a month has a streak of four. An occurrence due today that is not
+    done yet neither breaks the current streak nor counts against
+    adherence; completions on days the habit was not due are ignored.
+    """
+    if not due_days.size:
+        return OccurrenceStats(0, 0, 0, 0)
+
+    idx = np.searchsorted(completed_days, due_days)
+    idx = np.minimum(idx, max(completed_days.size - 1, 0))
+    hits = (
+        completed_days[idx] == due_days
+        if completed_days.size
+        else np.zeros(due_days.size, dtype=bool)
+    )
+    if due_days[-1] == np.datetime64(today, "D") and not hits[-1]:
+        due_days = due_days[:-1]
+        hits = hits[:-1]
+
+    starts, ends = _runs(hits)
+    lengths = ends - starts
+    longest = int(lengths.max()) if lengths.size else 0
+    current = int(lengths[-1]) if lengths.size and ends[-1] == hits.size else 0
+
+    in_window = due_days >= np.datetime64(window_start, "D")
+    return OccurrenceStats(
+        current_streak=current,
+        longest_streak=longest,
+        expected_count=int(in_window.sum()),
+        completed_count=int(hits[in_window].sum()),
+    )
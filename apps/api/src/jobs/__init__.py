@@ -0,0 +1,5 @@
+from . import models as _models  # noqa: F401
+
+__all__ = [
+    "_models",
+]
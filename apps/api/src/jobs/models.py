@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Identity,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import Base
+
+__all__ = ["Job", "JobKind"]
+
+
+class JobKind(str, Enum):
+    EVALUATE_BADGES = "badges.evaluate"
+    SWEEP_STALE_UPLOADS = "attachments.sweep_uploads"
+    # Not per user: enqueued without one.
+    REBUILD_GLOBAL_LEADERBOARD = "leaderboard.rebuild.global"
+    REBUILD_WEEKLY_LEADERBOARD = "leaderboard.rebuild.weekly"
+
+
+class Job(Base):
+    """Deferred work, claimed by workers with ``SKIP LOCKED``.
+
+    Most kinds are per user; the others have no ``user_id``. Finished jobs
+    are deleted; a claimed job keeps ``locked_at`` until then.
+    """
+
+    __tablename__ = "job"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    user_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("user.id", ondelete="CASCADE"),
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        # One fresh job per kind and user: enqueueing a duplicate is a no-op.
+        # Retried jobs leave the index, so releasing them never conflicts.
+        # Jobs without a user are deduplicated per kind.
+        Index(
+            "idx_job_pending",
+            "kind",
+            "user_id",
+            unique=True,
+            postgresql_where=(locked_at.is_(None)) & (attempts == 0),
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("idx_job_run_after", "run_after"),
+    )
@@ -0,0 +1,209 @@
+"""Postgres-backed job queue.
+
+Services ``enqueue`` inside the request's unit of work, so a job exists
+exactly when the write that caused it committed. Workers ``claim`` batches
+with ``FOR UPDATE SKIP LOCKED``; concurrent workers never wait on each other
+or pick the same job.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import Insert, and_, delete, func, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import after_commit, async_session_factory
+from src.jobs.models import Job, JobKind
+
+__all__ = [
+    "ClaimedJob",
+    "claim",
+    "drop_abandoned",
+    "enqueue",
+    "enqueue_detached",
+    "finish",
+    "job_insert",
+    "release",
+    "wait_for_jobs",
+]
+
+# Set after a commit that enqueued work, so a worker in the same process
+# starts right away instead of at its next poll.
+_enqueued = asyncio.Event()
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    id: int
+    kind: JobKind
+    user_id: UUID | None
+    attempts: int
+
+
+async def _wake_workers() -> None:
+    _enqueued.set()
+
+
+def job_insert(
+    session: AsyncSession,
+    kind: JobKind,
+    user_id: UUID | None,
+    delay: timedelta | None = None,
+) -> Insert:
+    """The statement behind ``enqueue``, for callers folding it into a larger
+    one. Workers are woken after ``session`` commits, as by ``enqueue``."""
+    after_commit(session, _wake_workers)
+    values: dict[str, object] = {"kind": kind, "user_id": user_id}
+    if delay is not None:
+        values["run_after"] = func.now() + delay
+    return (
+        insert(Job)
+        .values(**values)
+        .on_conflict_do_nothing(
+            index_elements=[Job.kind, Job.user_id],
+            # A literal predicate, so Postgres can match the partial index.
+            index_where=text("locked_at IS NULL AND attempts = 0"),
+        )
+    )
+
+
+async def enqueue(
+    session: AsyncSession,
+    kind: JobKind,
+    user_id: UUID | None,
+    delay: timedelta | None = None,
+) -> None:
+    """Schedule ``kind`` for a user unless the same job is already waiting.
+
+    A ``delay`` keeps the job from running before it passed.
+    """
+    await session.execute(job_insert(session, kind, user_id, delay))
+
+
+async def enqueue_detached(kind: JobKind, user_id: UUID | None = None) -> None:
+    """``enqueue`` in a transaction of its own on the primary.
+
+    For callers without a writable unit of work, e.g. reads served by the
+    replica.
+    """
+    async with async_session_factory() as session:
+        await session.execute(job_insert(session, kind, user_id))
+        await session.commit()
+    await _wake_workers()
+
+
+async def wait_for_jobs(timeout: float) -> None:
+    """Return when work was enqueued in this process or after ``timeout``."""
+    try:
+        await asyncio.wait_for(_enqueued.wait(), timeout)
+    except TimeoutError:
+        pass
+    _enqueued.clear()
+
+
+async def claim(
+    session: AsyncSession,
+    *,
+    limit: int,
+    max_attempts: int,
+    lock_timeout: timedelta,
+) -> list[ClaimedJob]:
+    """Lock up to ``limit`` due jobs for this worker.
+
+    Jobs locked longer than ``lock_timeout`` belong to a worker that died
+    and are claimed again.
+    """
+    due = (
+        select(Job.id)
+        .where(
+            Job.attempts < max_attempts,
+            or_(
+                and_(Job.locked_at.is_(None), Job.run_after <= func.now()),
+                Job.locked_at < func.now() - lock_timeout,
+            ),
+        )
+        .order_by(Job.run_after)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(Job)
+        .where(Job.id.in_(due.scalar_subquery()))
+        .values(locked_at=func.now(), attempts=Job.attempts + 1)
+        .returning(Job.id, Job.kind, Job.user_id, Job.attempts)
+    )
+    rows = await session.execute(stmt)
+    return [
+        ClaimedJob(row.id, JobKind(row.kind), row.user_id, row.attempts) for row in rows
+    ]
+
+
+async def drop_abandoned(
+    session: AsyncSession,
+    *,
+    max_attempts: int,
+    lock_timeout: timedelta,
+) -> list[ClaimedJob]:
+    """Delete jobs whose worker died during their last attempt.
+
+    ``claim`` no longer picks them up, so nothing else would release them.
+    Dropped like jobs ``release`` finds out of attempts, and returned.
+    """
+    abandoned = (
+        select(Job.id)
+        .where(
+            Job.attempts >= max_attempts,
+            Job.locked_at < func.now() - lock_timeout,
+        )
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        delete(Job)
+        .where(Job.id.in_(abandoned.scalar_subquery()))
+        .returning(Job.id, Job.kind, Job.user_id, Job.attempts)
+    )
+    rows = await session.execute(stmt)
+    return [
+        ClaimedJob(row.id, JobKind(row.kind), row.user_id, row.attempts) for row in rows
+    ]
+
+
+async def finish(session: AsyncSession, job_ids: Sequence[int]) -> None:
+    await session.execute(delete(Job).where(Job.id.in_(job_ids)))
+
+
+async def release(
+    session: AsyncSession,
+    jobs: Sequence[ClaimedJob],
+    *,
+    error: str,
+    max_attempts: int,
+) -> list[ClaimedJob]:
+    """Schedule failed jobs for a retry with exponential backoff.
+
+    Jobs out of attempts are deleted and returned; the work is idempotent,
+    so the user's next write enqueues it again.
+    """
+    exhausted = [job for job in jobs if job.attempts >= max_attempts]
+    retried = [job.id for job in jobs if job.attempts < max_attempts]
+    if exhausted:
+        await finish(session, [job.id for job in exhausted])
+    if retried:
+        # 2, 4, 8, ... seconds
+        backoff = func.make_interval(0, 0, 0, 0, 0, 0, func.power(2, Job.attempts))
+        await session.execute(
+            update(Job)
+            .where(Job.id.in_(retried))
+            .values(
+                locked_at=None,
+                run_after=func.now() + backoff,
+                last_error=error,
+            )
+        )
+    return exhausted
@@ -0,0 +1,180 @@
+"""Runs queued jobs.
+
+    python -m src.jobs.worker [--batch-size N] [--once]
+
+Each API process also runs a worker unless ``JOBS_IN_PROCESS`` is off, so
+a dedicated process is only needed when the API runs without one. Jobs are
+claimed in batches, duplicates for the same user are coalesced, and every
+kind runs once per batch for all of its users.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.attachment_blobs import sweep_stale_uploads
+from src.badges.services import BadgeService
+from src.config import settings
+from src.database import async_session_factory
+from src.jobs.models import JobKind
+from src.jobs.queue import (
+    ClaimedJob,
+    claim,
+    drop_abandoned,
+    finish,
+    release,
+    wait_for_jobs,
+)
+from src.leaderboard.schemas import LeaderboardBoard
+from src.leaderboard.services import rebuild_leaderboard
+
+__all__ = ["HANDLERS", "JobWorker"]
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[AsyncSession, Sequence[UUID]], Awaitable[object]]
+
+
+async def _evaluate_badges(session: AsyncSession, user_ids: Sequence[UUID]) -> int:
+    return await BadgeService(session).evaluate_users(user_ids)
+
+
+async def _rebuild_global_leaderboard(session: AsyncSession, _: Sequence[UUID]) -> None:
+    await rebuild_leaderboard(session, LeaderboardBoard.GLOBAL)
+
+
+async def _rebuild_weekly_leaderboard(session: AsyncSession, _: Sequence[UUID]) -> None:
+    await rebuild_leaderboard(session, LeaderboardBoard.WEEKLY)
+
+
+HANDLERS: dict[JobKind, Handler] = {
+    JobKind.EVALUATE_BADGES: _evaluate_badges,
+    JobKind.SWEEP_STALE_UPLOADS: sweep_stale_uploads,
+    JobKind.REBUILD_GLOBAL_LEADERBOARD: _rebuild_global_leaderboard,
+    JobKind.REBUILD_WEEKLY_LEADERBOARD: _rebuild_weekly_leaderboard,
+}
+
+
+class JobWorker:
+    def __init__(
+        self,
+        *,
+        batch_size: int = settings.JOBS_BATCH_SIZE,
+        poll_interval: float = settings.JOBS_POLL_INTERVAL_SEC,
+        max_attempts: int = settings.JOBS_MAX_ATTEMPTS,
+        lock_timeout: timedelta = timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SEC),
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lock_timeout = lock_timeout
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                processed = await self.run_batch()
+            except Exception:
+                # Database unavailable or the like; try again after a poll.
+                logger.exception("Claiming jobs failed")
+                processed = 0
+            if processed < self.batch_size:
+                await wait_for_jobs(self.poll_interval)
+
+    async def run_batch(self) -> int:
+        """Claim and run one batch; returns the number of jobs claimed."""
+        async with async_session_factory() as session:
+            dropped = await drop_abandoned(
+                session,
+                max_attempts=self.max_attempts,
+                lock_timeout=self.lock_timeout,
+            )
+            jobs = await claim(
+                session,
+                limit=self.batch_size,
+                max_attempts=self.max_attempts,
+                lock_timeout=self.lock_timeout,
+            )
+            # Commit the claim right away: the row locks end here, the claim
+            # itself lasts until the jobs are finished or released.
+            await session.commit()
+
+        for job in dropped:
+            logger.error(
+                "Dropped job %s for user %s: worker died on attempt %d",
+                job.kind.value,
+                job.user_id,
+                job.attempts,
+            )
+        by_kind: dict[JobKind, list[ClaimedJob]] = defaultdict(list)
+        for job in jobs:
+            by_kind[job.kind].append(job)
+        for kind, kind_jobs in by_kind.items():
+            await self._run(kind, kind_jobs)
+        return len(jobs)
+
+    async def _run(self, kind: JobKind, jobs: Sequence[ClaimedJob]) -> None:
+        user_ids = list(dict.fromkeys(job.user_id for job in jobs))
+        try:
+            async with async_session_factory() as session:
+                await HANDLERS[kind](session, user_ids)
+                await finish(session, [job.id for job in jobs])
+                await session.commit()
+        except Exception as exc:
+            if len(user_ids) > 1:
+                # Retry the users one by one so one failing user does not
+                # hold back the rest of the batch.
+                for user_id in user_ids:
+                    await self._run(
+                        kind, [job for job in jobs if job.user_id == user_id]
+                    )
+                return
+            logger.exception("Job %s failed for user %s", kind.value, user_ids[0])
+            async with async_session_factory() as session:
+                dropped = await release(
+                    session,
+                    jobs,
+                    error=repr(exc),
+                    max_attempts=self.max_attempts,
+                )
+                await session.commit()
+            if dropped:
+                logger.error(
+                    "Dropped job %s for user %s after %d attempts",
+                    kind.value,
+                    user_ids[0],
+                    self.max_attempts,
+                )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    worker = JobWorker(batch_size=args.batch_size)
+    if args.once:
+        while await worker.run_batch():
+            pass
+    else:
+        await worker.run_forever()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=settings.JOBS_BATCH_SIZE)
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="exit once no job is due instead of polling",
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
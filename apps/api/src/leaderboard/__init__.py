@@ -0,0 +1,5 @@
+from .routers import router as leaderboard_router
+
+__all__ = [
+    "leaderboard_router",
+]
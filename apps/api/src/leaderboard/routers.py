@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, Query
+
+from src.auth.dependencies import CurrentUser, get_current_user
+from src.database import prefer_replica
+from src.leaderboard.schemas import (
+    LeaderboardBoard,
+    LeaderboardPage,
+    LeaderboardPosition,
+)
+from src.leaderboard.services import LeaderboardService, get_leaderboard_service
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+
+
+@router.get(
+    "/{board}",
+    response_model=LeaderboardPage,
+    dependencies=[Depends(prefer_replica), Depends(get_current_user)],
+)
+async def get_leaderboard(
+    board: LeaderboardBoard,
+    service: LeaderboardService = Depends(get_leaderboard_service),
+    limit: int = Query(default=10, ge=1, le=100),
+) -> LeaderboardPage:
+    return await service.get_top(board, limit)
+
+
+@router.get(
+    "/{board}/me",
+    response_model=LeaderboardPosition,
+    dependencies=[Depends(prefer_replica)],
+)
+async def get_my_position(
+    board: LeaderboardBoard,
+    current_user: CurrentUser,
+    service: LeaderboardService = Depends(get_leaderboard_service),
+    radius: int = Query(default=5, ge=0, le=25),
+) -> LeaderboardPosition:
+    return await service.get_position(current_user.id, board, radius)
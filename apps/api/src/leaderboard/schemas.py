@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from enum import Enum
+from uuid import UUID
+
+from pydantic import BaseModel
+
+__all__ = [
+    "LeaderboardBoard",
+    "LeaderboardEntry",
+    "LeaderboardPage",
+    "LeaderboardPosition",
+]
+
+
+class LeaderboardBoard(str, Enum):
+    GLOBAL = "global"
+    WEEKLY = "weekly"
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: UUID
+    full_name: str | None = None
+    profile_picture: str | None = None
+    xp: int
+
+
+class LeaderboardPage(BaseModel):
+    board: LeaderboardBoard
+    period: str | None = None
+    entries: list[LeaderboardEntry]
+
+
+class LeaderboardPosition(BaseModel):
+    board: LeaderboardBoard
+    period: str | None = None
+    rank: int | None = None
+    xp: int = 0
+    total: int
+    neighbours: list[LeaderboardEntry]
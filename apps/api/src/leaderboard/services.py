@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime, time, timedelta
+from uuid import UUID
+
+from fastapi import Depends
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.auth.models import User
+from src.cache import get_redis
+from src.completions.models import NodeCompletion
+from src.database import get_async_session
+from src.gamification.models import UserStats
+from src.jobs.models import JobKind
+from src.jobs.queue import enqueue_detached
+from src.leaderboard.schemas import (
+    LeaderboardBoard,
+    LeaderboardEntry,
+    LeaderboardPage,
+    LeaderboardPosition,
+)
+from src.leaderboard.store import RankedMember, RedisLeaderboard
+
+__all__ = [
+    "LeaderboardService",
+    "Week",
+    "drop_leaderboards",
+    "get_leaderboard_service",
+    "rebuild_leaderboard",
+    "record_xp",
+]
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 10_000
+WEEKLY_BOARD_TTL = timedelta(days=15)
+
+_REBUILD_JOBS = {
+    LeaderboardBoard.GLOBAL: JobKind.REBUILD_GLOBAL_LEADERBOARD,
+    LeaderboardBoard.WEEKLY: JobKind.REBUILD_WEEKLY_LEADERBOARD,
+}
+
+
+class Week:
+    """ISO week in UTC, the period of the weekly board."""
+
+    def __init__(self, now: datetime | None = None):
+        today = (now or datetime.now(UTC)).astimezone(UTC).date()
+        monday = today - timedelta(days=today.weekday())
+        year, number, _ = today.isocalendar()
+        self.label = f"{year}-W{number:02d}"
+        self.start = datetime.combine(monday, time.min, tzinfo=UTC)
+        self.end = self.start + timedelta(days=7)
+
+
+def _board_key(board: LeaderboardBoard, week: Week) -> str:
+    if board == LeaderboardBoard.WEEKLY:
+        return f"leaderboard:weekly:{week.label}"
+    return "leaderboard:global"
+
+
+def _board_store(
+    client: Redis,
+    board: LeaderboardBoard,
+    week: Week,
+) -> RedisLeaderboard:
+    weekly = board == LeaderboardBoard.WEEKLY
+    return RedisLeaderboard(
+        client,
+        _board_key(board, week),
+        ttl=int(WEEKLY_BOARD_TTL.total_seconds()) if weekly else None,
+    )
+
+
+def _global_scores() -> Select:
+    return select(UserStats.user_id, UserStats.xp_total).where(UserStats.xp_total > 0)
+
+
+def _weekly_xp(week: Week) -> Select:
+    xp = func.sum(func.greatest(NodeCompletion.earned_xp, 0))
+    return (
+        select(NodeCompletion.user_id, xp.label("xp"))
+        .where(
+            NodeCompletion.completed_at >= week.start,
+            NodeCompletion.completed_at < week.end,
+        )
+        .group_by(NodeCompletion.user_id)
+        .having(xp > 0)
+    )
+
+
+class LeaderboardService:
+    """Global XP and weekly XP rankings.
+
+    Boards live in Redis sorted sets when ``REDIS_URL`` is configured. A
+    read finding a board missing queues its rebuild as a job. Without Redis,
+    or until the rebuild finished, rankings are read from Postgres.
+    """
+
+    def __init__(self, session: AsyncSession, redis: Redis | None):
+        self.session = session
+        self.redis = redis
+
+    async def get_top(self, board: LeaderboardBoard, limit: int) -> LeaderboardPage:
+        week = Week()
+        store = await self._store(board, week)
+        if store is not None:
+            ranked = await store.top(limit)
+        elif board == LeaderboardBoard.WEEKLY:
+            ranked = await self._weekly_ranked(week, first=1, last=limit)
+        else:
+            ranked = await self._global_top(limit)
+        return LeaderboardPage(
+            board=board,
+            period=self._period(board, week),
+            entries=await self._entries(ranked),
+        )
+
+    async def get_position(
+        self,
+        user_id: UUID,
+        board: LeaderboardBoard,
+        radius: int,
+    ) -> LeaderboardPosition:
+        week = Week()
+        store = await self._store(board, week)
+        if store is not None:
+            rank, xp, total, ranked = await store.position(user_id, radius)
+        elif board == LeaderboardBoard.WEEKLY:
+            rank, xp, total, ranked = await self._weekly_position(user_id, week, radius)
+        else:
+            rank, xp, total, ranked = await self._global_position(user_id, radius)
+        return LeaderboardPosition(
+            board=board,
+            period=self._period(board, week),
+            rank=rank,
+            xp=xp,
+            total=total,
+            neighbours=await self._entries(ranked),
+        )
+
+    async def _store(
+        self,
+        board: LeaderboardBoard,
+        week: Week,
+    ) -> RedisLeaderboard | None:
+        if self.redis is None:
+            return None
+        store = _board_store(self.redis, board, week)
+        try:
+            if await store.is_built():
+                return store
+            if await store.request_rebuild():
+                # The read may be served by the replica; queue on the primary.
+                await enqueue_detached(_REBUILD_JOBS[board])
+        except RedisError as exc:
+            logger.warning("Leaderboard %s unavailable: %s", store.key, exc)
+        return None
+
+    async def _global_top(self, limit: int) -> list[RankedMember]:
+        stmt = _global_scores().order_by(
+            UserStats.xp_total.desc(),
+            UserStats.user_id.desc(),
+        )
+        rows = await self.session.execute(stmt.limit(limit))
+        return [(index + 1, *row) for index, row in enumerate(rows)]
+
+    async def _global_position(
+        self,
+        user_id: UUID,
+        radius: int,
+    ) -> tuple[int | None, int, int, list[RankedMember]]:
+        """Keyset walk of ``idx_user_stats_xp`` around the user's row."""
+        total = await self.session.scalar(
+            select(func.count()).select_from(_global_scores().subquery())
+        )
+        xp = await self.session.scalar(
+            select(UserStats.xp_total).where(UserStats.user_id == user_id)
+        )
+        if not xp:
+            return None, 0, int(total or 0), []
+
+        key = tuple_(UserStats.xp_total, UserStats.user_id)
+        mine = tuple_(xp, user_id)
+        ahead = await self.session.scalar(
+            select(func.count()).where(UserStats.xp_total > 0, key > mine)
+        )
+        rank = int(ahead or 0) + 1
+        above = await self.session.execute(
+            _global_scores()
+            .where(key > mine)
+            .order_by(UserStats.xp_total, UserStats.user_id)
+            .limit(radius)
+        )
+        below = await self.session.execute(
+            _global_scores()
+            .where(key < mine)
+            .order_by(UserStats.xp_total.desc(), UserStats.user_id.desc())
+            .limit(radius)
+        )
+        ranked = [(rank - index - 1, *row) for index, row in enumerate(above)]
+        ranked.reverse()
+        ranked.append((rank, user_id, xp))
+        ranked.extend((rank + index + 1, *row) for index, row in enumerate(below))
+        return rank, xp, int(total or 0), ranked
+
+    def _weekly_ranked_query(self, week: Week):
+        weekly = _weekly_xp(week).subquery()
+        rank = func.row_number().over(
+            order_by=(weekly.c.xp.desc(), weekly.c.user_id.desc())
+        )
+        return select(
+            rank.label("rank"),
+            weekly.c.user_id,
+            weekly.c.xp,
+        ).subquery()
+
+    async def _weekly_ranked(
+        self,
+        week: Week,
+        *,
+        first: int,
+        last: int,
+    ) -> list[RankedMember]:
+        ranked = self._weekly_ranked_query(week)
+        rows = await self.session.execute(
+            select(ranked)
+            .where(ranked.c.rank.between(first, last))
+            .order_by(ranked.c.rank)
+        )
+        return [(int(rank), user_id, int(xp)) for rank, user_id, xp in rows]
+
+    async def _weekly_position(
+        self,
+        user_id: UUID,
+        week: Week,
+        radius: int,
+    ) -> tuple[int | None, int, int, list[RankedMember]]:
+        ranked = self._weekly_ranked_query(week)
+        row = (
+            await self.session.execute(
+                select(
+                    ranked.c.rank,
+                    ranked.c.xp,
+                    select(func.count()).select_from(ranked).scalar_subquery(),
+                ).where(ranked.c.user_id == user_id)
+            )
+        ).first()
+        if row is None:
+            total = await self.session.scalar(select(func.count()).select_from(ranked))
+            return None, 0, int(total or 0), []
+
+        rank, xp, total = int(row[0]), int(row[1]), int(row[2])
+        neighbours = await self._weekly_ranked(
+            week,
+            first=max(rank - radius, 1),
+            last=rank + radius,
+        )
+        return rank, xp, total, neighbours
+
+    async def _entries(self, ranked: list[RankedMember]) -> list[LeaderboardEntry]:
+        if not ranked:
+            return []
+        stmt = select(User.id, User.full_name, User.profile_picture).where(
+            User.id.in_([user_id for _, user_id, _ in ranked])
+        )
+        profiles = {row.id: row for row in await self.session.execute(stmt)}
+        entries: list[LeaderboardEntry] = []
+        for rank, user_id, xp in ranked:
+            profile = profiles.get(user_id)
+            entries.append(
+                LeaderboardEntry(
+                    rank=rank,
+                    user_id=user_id,
+                    full_name=profile.full_name if profile else None,
+                    profile_picture=profile.profile_picture if profile else None,
+                    xp=int(xp),
+                )
+            )
+        return entries
+
+    @staticmethod
+    def _period(board: LeaderboardBoard, week: Week) -> str | None:
+        return week.label if board == LeaderboardBoard.WEEKLY else None
+
+
+async def record_xp(session: AsyncSession, user_id: UUID, xp_total: int) -> None:
+    """Push a user's new XP to the Redis boards after a committed completion.
+
+    Scores are written as absolute values (total and this week's XP), so a
+    failed or out-of-order update is corrected by the user's next one.
+    """
+    client = get_redis()
+    if client is None:
+        return
+
+    week = Week()
+    weekly_xp = await session.scalar(
+        select(
+            func.coalesce(func.sum(func.greatest(NodeCompletion.earned_xp, 0)), 0)
+        ).where(
+            NodeCompletion.user_id == user_id,
+            NodeCompletion.completed_at >= week.start,
+            NodeCompletion.completed_at < week.end,
+        )
+    )
+    try:
+        await RedisLeaderboard(
+            client,
+            _board_key(LeaderboardBoard.GLOBAL, week),
+        ).set_score(user_id, xp_total)
+        if weekly_xp:
+            await RedisLeaderboard(
+                client,
+                _board_key(LeaderboardBoard.WEEKLY, week),
+            ).set_score(user_id, int(weekly_xp))
+    except RedisError as exc:
+        logger.warning("Failed to update leaderboards for %s: %s", user_id, exc)
+
+
+async def rebuild_leaderboard(session: AsyncSession, board: LeaderboardBoard) -> None:
+    """Load a missing board from Postgres; run by the job worker.
+
+    Streams every ``user_stats`` row, or the week's completions, so it never
+    runs inside a request.
+    """
+    client = get_redis()
+    if client is None:
+        return
+    week = Week()
+    store = _board_store(client, board, week)
+    if await store.is_built():
+        return
+    source = _weekly_xp(week) if board == LeaderboardBoard.WEEKLY else _global_scores()
+    await store.rebuild(_stream(session, source))
+
+
+async def _stream(
+    session: AsyncSession,
+    stmt: Select,
+) -> AsyncIterator[Sequence[tuple]]:
+    result = await session.stream(stmt.execution_options(yield_per=REBUILD_BATCH_SIZE))
+    async for partition in result.partitions():
+        yield [tuple(row) for row in partition]
+
+
+async def drop_leaderboards() -> None:
+    """Discard the Redis boards and queue their rebuild."""
+    client = get_redis()
+    if client is None:
+        return
+    week = Week()
+    await client.delete(*(_board_key(board, week) for board in LeaderboardBoard))
+    for kind in _REBUILD_JOBS.values():
+        await enqueue_detached(kind)
+
+
+def get_leaderboard_service(
+    session: AsyncSession = Depends(get_async_session),
+) -> LeaderboardService:
+    return LeaderboardService(session, get_redis())
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterable, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+__all__ = ["RankedMember", "RedisLeaderboard"]
+
+RankedMember = tuple[int, UUID, int]  # rank, user id, score
+
+# Writes only land on boards that have been built; a missing board is
+# rebuilt from Postgres instead of starting out partial. While a rebuild
+# holds its lock (KEYS[2]) writes also go to its scratch set (KEYS[3]), so
+# scores committed after its snapshot are not lost with the rename.
+_ZADD_LIVE = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+end
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('ZADD', KEYS[3], ARGV[1], ARGV[2])
+end
+return true
+"""
+
+# Takes the rebuild lock and empties the scratch set of an earlier, failed
+# rebuild in one step, so no write made under the new lock is discarded.
+_ACQUIRE_REBUILD = """
+if redis.call('SET', KEYS[1], 1, 'NX', 'EX', ARGV[1]) then
+    redis.call('DEL', KEYS[2])
+    return 1
+end
+return 0
+"""
+
+REBUILD_LOCK_TTL_SEC = 5 * 60
+# How long a queued rebuild stops readers from queueing another one.
+REBUILD_REQUEST_TTL_SEC = 60
+
+
+class RedisLeaderboard:
+    """One leaderboard kept in a Redis sorted set.
+
+    Rank lookups are ``ZREVRANK`` (O(log n)); equal scores are ordered by
+    user id descending, which matches the Postgres fallback.
+    """
+
+    def __init__(self, client: Redis, key: str, *, ttl: int | None = None):
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+        self.lock = f"{key}:lock"
+        self.scratch = f"{key}:rebuild"
+        self.requested = f"{key}:requested"
+        self._zadd_live = client.register_script(_ZADD_LIVE)
+        self._acquire_rebuild = client.register_script(_ACQUIRE_REBUILD)
+
+    async def is_built(self) -> bool:
+        return bool(await self.client.exists(self.key))
+
+    async def request_rebuild(self) -> bool:
+        """``True`` for the one reader that should queue a rebuild."""
+        if await self.client.exists(self.lock):
+            return False
+        requested = await self.client.set(
+            self.requested,
+            1,
+            nx=True,
+            ex=REBUILD_REQUEST_TTL_SEC,
+        )
+        return bool(requested)
+
+    async def set_score(self, user_id: UUID, score: int) -> None:
+        await self._zadd_live(
+            keys=[self.key, self.lock, self.scratch],
+            args=[score, str(user_id)],
+        )
+
+    async def top(self, limit: int) -> list[RankedMember]:
+        members = await self.client.zrevrange(self.key, 0, limit - 1, withscores=True)
+        return self._ranked(members, offset=0)
+
+    async def position(
+        self,
+        user_id: UUID,
+        radius: int,
+    ) -> tuple[int | None, int, int, list[RankedMember]]:
+        """Rank, score, board size and the members around ``user_id``."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(self.key, str(user_id))
+            pipe.zscore(self.key, str(user_id))
+            pipe.zcard(self.key)
+            index, score, total = await pipe.execute()
+        if index is None:
+            return None, 0, total, []
+
+        start = max(index - radius, 0)
+        members = await self.client.zrevrange(
+            self.key,
+            start,
+            index + radius,
+            withscores=True,
+        )
+        return index + 1, int(score), total, self._ranked(members, offset=start)
+
+    async def rebuild(
+        self,
+        batches: AsyncIterable[Sequence[tuple[UUID, int]]],
+    ) -> bool:
+        """Replace the board with ``batches``; ``False`` if a rebuild is running.
+
+        Members are loaded into a scratch key which is renamed over the board,
+        so readers never see a half-built set. Scores written while the
+        rebuild runs are newer than ``batches``, which only raise them (GT).
+        The lock is renewed with every batch.
+        """
+        acquired = await self._acquire_rebuild(
+            keys=[self.lock, self.scratch],
+            args=[REBUILD_LOCK_TTL_SEC],
+        )
+        if not acquired:
+            return False
+        try:
+            async for batch in batches:
+                if batch:
+                    await self.client.zadd(
+                        self.scratch,
+                        {str(user_id): score for user_id, score in batch},
+                        gt=True,
+                    )
+                await self.client.expire(self.lock, REBUILD_LOCK_TTL_SEC)
+            if await self.client.exists(self.scratch):
+                await self.client.rename(self.scratch, self.key)
+                if self.ttl is not None:
+                    await self.client.expire(self.key, self.ttl)
+        finally:
+            await self.client.delete(self.lock, self.requested)
+        return True
+
+    async def drop(self) -> None:
+        await self.client.delete(self.key)
+
+    @staticmethod
+    def _ranked(
+        members: Sequence[tuple[bytes, float]],
+        *,
+        offset: int,
+    ) -> list[RankedMember]:
+        return [
+            (offset + index + 1, UUID(member.decode()), int(score))
+            for index, (member, score) in enumerate(members)
+        ]
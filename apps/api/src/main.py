@@ -1,26 +1,47 @@
-from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncGenerator
 
-import sentry_sdk
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
+from src.activity import activity_router
+from src.attachments import attachments_router
 from src.auth import auth_router, oauth_google_router
 from src.badges import badges_router
 from src.completions import completions_router
 from src.config import app_configs, settings
+from src.dashboard import dashboard_router
+from src.database import ReadAfterWriteMiddleware, engine, replica_engine
 from src.docs import docs_router
+from src.events import events_router
+from src.export import export_router
 from src.gamification import gamification_router
+from src.habits import habits_router
+from src.jobs.worker import JobWorker
+from src.leaderboard import leaderboard_router
+from src.metrics import METRICS_PATH, MetricsMiddleware, metrics_endpoint
 from src.nodes import nodes_router
+from src.pool_metrics import pool_snapshot
+from src.query_stats import QueryStatsMiddleware
 from src.time_tracking import time_tracking_router
 from src.tracks import tracks_router
+from src.user_events import broker
 
 
 @asynccontextmanager
 async def lifespan(_application: FastAPI) -> AsyncGenerator:
     # Startup
+    worker = None
+    if settings.JOBS_IN_PROCESS:
+        worker = asyncio.create_task(JobWorker().run_forever())
     yield
     # Shutdown
+    if worker is not None:
+        worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await worker
+    await broker.close()
 
 
 app = FastAPI(**app_configs, lifespan=lifespan)
@@ -34,7 +55,18 @@ app.add_middleware(
     allow_headers=settings.CORS_HEADERS,
 )
 
+if replica_engine is not None:
+    app.add_middleware(ReadAfterWriteMiddleware)
+
+# Added last, so they wrap every other middleware; metrics read the query
+# stats, so QueryStatsMiddleware is the outermost.
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_route(METRICS_PATH, metrics_endpoint, include_in_schema=False)
+
 if settings.ENVIRONMENT.is_deployed:
+    import sentry_sdk
+
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
         environment=settings.ENVIRONMENT,
@@ -48,10 +80,26 @@ app.include_router(nodes_router, prefix="/api/v1")
 app.include_router(time_tracking_router, prefix="/api/v1")
 app.include_router(completions_router, prefix="/api/v1")
 app.include_router(gamification_router, prefix="/api/v1")
+app.include_router(events_router, prefix="/api/v1")
+app.include_router(dashboard_router, prefix="/api/v1")
+app.include_router(export_router, prefix="/api/v1")
+app.include_router(habits_router, prefix="/api/v1")
+app.include_router(leaderboard_router, prefix="/api/v1")
+app.include_router(activity_router, prefix="/api/v1")
 app.include_router(badges_router, prefix="/api/v1")
 app.include_router(docs_router, prefix="/api/v1")
+app.include_router(attachments_router, prefix="/api/v1")
 
 
 @app.get("/healthcheck", include_in_schema=False)
 async def healthcheck() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/healthcheck/pool", include_in_schema=False)
+async def pool_healthcheck() -> dict[str, Any]:
+    """Connection pool state of the worker that serves the request."""
+    pools = {"primary": pool_snapshot(engine.pool)}
+    if replica_engine is not None:
+        pools["replica"] = pool_snapshot(replica_engine.pool)
+    return pools
@@ -0,0 +1,132 @@
+"""Prometheus metrics of the HTTP layer.
+
+Under gunicorn every worker writes its samples to ``PROMETHEUS_MULTIPROC_DIR``
+and ``/metrics`` aggregates the files of all workers, so a scrape sees the
+whole instance regardless of which worker serves it. Without the variable
+the default in-process registry is used.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.query_stats import current_query_stats, route_template
+
+__all__ = ["METRICS_PATH", "MetricsMiddleware", "metrics_endpoint"]
+
+METRICS_PATH = "/metrics"
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.075,
+    0.1,
+    0.25,
+    0.5,
+    0.75,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by route template and status.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL statements per HTTP request.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """Records count, latency and SQL usage of every HTTP request.
+
+    SQL usage is read from the stats of ``QueryStatsMiddleware``, which must
+    wrap this middleware.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            route = route_template(scope)
+            REQUESTS.labels(method, route, status).inc()
+            REQUEST_LATENCY.labels(method, route, status).observe(elapsed)
+            queries = current_query_stats()
+            if queries is not None:
+                DB_QUERIES.labels(method, route).observe(queries.count)
+                DB_DURATION.labels(method, route).observe(queries.duration)
+
+
+def _registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+async def metrics_endpoint(_request: Request) -> Response:
+    return Response(generate_latest(_registry()), media_type=CONTENT_TYPE_LATEST)
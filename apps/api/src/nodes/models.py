@@ -24,6 +24,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.database import Base
 
 if TYPE_CHECKING:
+    from src.docs.models import Doc
     from src.tracks.models import Track
 
 __all__ = [
@@ -79,6 +80,21 @@ class Node(Base):
         nullable=False,
         server_default="0",
     )
+    # Maintained through ``src.counters``, like the track counters.
+    completion_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+    last_completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+    tracked_minutes: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -93,9 +109,14 @@ class Node(Base):
     habit_schedule: Mapped[Optional["HabitSchedule"]] = relationship(
         back_populates="node",
         uselist=False,
+        lazy="joined",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
+    docs: Mapped[list["Doc"]] = relationship(
+        viewonly=True,
+        order_by="Doc.created_at.desc()",
+    )
 
     __table_args__ = (
         Index("idx_node_track", "track_id"),
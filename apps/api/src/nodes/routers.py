@@ -5,6 +5,10 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 
 from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+from src.docs.schemas import DocPublic
+from src.fieldsets import Embed, Selection, fieldset
+from src.nodes.models import Node
 from src.nodes.schemas import (
     HabitSchedulePayload,
     HabitScheduleResponse,
@@ -17,15 +21,26 @@ from src.nodes.services import NodeService, get_node_service
 
 router = APIRouter(tags=["nodes"])
 
+node_fields = fieldset(NodePublic, embeds={"docs": Embed("docs", DocPublic)})
 
-@router.get("/tracks/{track_id}/nodes", response_model=list[NodePublic])
+
+@router.get(
+    "/tracks/{track_id}/nodes",
+    response_model=list[NodePublic],
+    dependencies=[Depends(prefer_replica)],
+)
 async def list_nodes(
     track_id: UUID,
     current_user: CurrentUser,
     service: NodeService = Depends(get_node_service),
-) -> list[NodePublic]:
-    nodes = await service.list_nodes(current_user.id, track_id)
-    return [NodePublic.model_validate(node) for node in nodes]
+    selection: Selection = Depends(node_fields),
+) -> list[NodePublic] | Response:
+    nodes = await service.list_nodes(
+        current_user.id,
+        track_id,
+        options=selection.options(Node),
+    )
+    return selection.render(nodes)
 
 
 @router.post(
@@ -43,7 +58,11 @@ async def create_node(
     return NodePublic.model_validate(node)
 
 
-@router.get("/nodes/{node_id}", response_model=NodePublic)
+@router.get(
+    "/nodes/{node_id}",
+    response_model=NodePublic,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_node(
     node_id: UUID,
     current_user: CurrentUser,
@@ -123,7 +142,11 @@ async def upsert_habit_schedule(
     return HabitScheduleResponse.model_validate(schedule)
 
 
-@router.get("/nodes/{node_id}/habit-schedule", response_model=HabitScheduleResponse)
+@router.get(
+    "/nodes/{node_id}/habit-schedule",
+    response_model=HabitScheduleResponse,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_habit_schedule(
     node_id: UUID,
     current_user: CurrentUser,
@@ -93,6 +93,9 @@ class NodePublic(BaseModel):
     is_locked: bool
     position: int
     habit_schedule: HabitScheduleResponse | None = None
+    completion_count: int = 0
+    last_completed_at: datetime | None = None
+    tracked_minutes: int = 0
     created_at: datetime
     updated_at: datetime | None = None
 
@@ -6,9 +6,13 @@ from uuid import UUID
 from fastapi import Depends
 from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
-from src.database import get_async_session
+from src.completions.models import NodeCompletion
+from src.counters import adjust_track_counters
+from src.database import after_commit, get_async_session
 from src.exceptions import BadRequest, NotFound
+from src.habits.cache import invalidate_habit_stats
 from src.nodes.models import HabitSchedule, Node, NodeType
 from src.nodes.schemas import (
     HabitSchedulePayload,
@@ -28,12 +32,19 @@ class NodeService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def list_nodes(self, user_id: UUID, track_id: UUID) -> list[Node]:
+    async def list_nodes(
+        self,
+        user_id: UUID,
+        track_id: UUID,
+        *,
+        options: Sequence[ORMOption] = (),
+    ) -> list[Node]:
         await self._ensure_track_owned(user_id, track_id)
         stmt: Select[tuple[Node]] = (
             select(Node)
             .where(Node.track_id == track_id)
             .order_by(Node.position, Node.created_at)
+            .options(*options)
         )
         nodes = await self.session.scalars(stmt)
         return list(nodes)
@@ -60,12 +71,15 @@ class NodeService:
             base_xp=payload.base_xp,
             position=position,
             is_locked=payload.is_locked,
+            # Loaded up front so serializing the new node does not lazy-load it.
+            habit_schedule=None,
+            last_completed_at=None,
         )
-        async with self.session.begin():
-            self.session.add(node)
         if payload.type == NodeType.HABIT and payload.habit_schedule is not None:
-            await self._upsert_schedule(node, payload.habit_schedule)
-        await self.session.refresh(node)
+            self._upsert_schedule(node, payload.habit_schedule)
+        self.session.add(node)
+        await self.session.flush()
+        await adjust_track_counters(self.session, track_id, nodes=1)
         return node
 
     async def get_node(self, user_id: UUID, node_id: UUID) -> Node:
@@ -100,21 +114,34 @@ class NodeService:
         if payload.type is not None:
             node.type = payload.type
 
-        async with self.session.begin():
-            self.session.add(node)
-
         if original_type == NodeType.HABIT and node.type != NodeType.HABIT:
-            await self._remove_schedule(node)
+            node.habit_schedule = None
         elif node.type == NodeType.HABIT and payload.habit_schedule is not None:
-            await self._upsert_schedule(node, payload.habit_schedule)
+            self._upsert_schedule(node, payload.habit_schedule)
+        await self.session.flush()
 
-        await self.session.refresh(node)
+        if NodeType.HABIT in (original_type, node.type):
+            after_commit(self.session, invalidate_habit_stats, user_id)
         return node
 
     async def delete_node(self, user_id: UUID, node_id: UUID) -> None:
         node = await self.get_node(user_id, node_id)
-        async with self.session.begin():
-            await self.session.delete(node)
+        # Counted before the delete cascades to the completions.
+        completions = (
+            select(func.count())
+            .where(NodeCompletion.node_id == node.id)
+            .scalar_subquery()
+        )
+        await adjust_track_counters(
+            self.session,
+            node.track_id,
+            nodes=-1,
+            completions=-completions,
+        )
+        await self.session.delete(node)
+        await self.session.flush()
+        if node.type == NodeType.HABIT:
+            after_commit(self.session, invalidate_habit_stats, user_id)
 
     async def reorder_nodes(
         self,
@@ -136,10 +163,7 @@ class NodeService:
 
         for item in updates:
             nodes[item.node_id].position = item.position
-
-        async with self.session.begin():
-            for node in nodes.values():
-                self.session.add(node)
+        await self.session.flush()
 
     async def set_lock_state(
         self,
@@ -149,8 +173,7 @@ class NodeService:
     ) -> Node:
         node = await self.get_node(user_id, node_id)
         node.is_locked = locked
-        async with self.session.begin():
-            self.session.add(node)
+        await self.session.flush()
         return node
 
     async def get_habit_schedule(self, user_id: UUID, node_id: UUID) -> HabitSchedule:
@@ -170,15 +193,19 @@ class NodeService:
         node = await self.get_node(user_id, node_id)
         if node.type != NodeType.HABIT:
             raise BadRequest(detail="Node is not configured as a habit")
-        schedule = await self._upsert_schedule(node, payload)
-        await self.session.refresh(schedule)
+        schedule = self._upsert_schedule(node, payload)
+        await self.session.flush()
+        after_commit(self.session, invalidate_habit_stats, user_id)
         return schedule
 
     async def delete_habit_schedule(self, user_id: UUID, node_id: UUID) -> None:
         node = await self.get_node(user_id, node_id)
         if node.habit_schedule is None:
             return
-        await self._remove_schedule(node)
+        # delete-orphan removes the schedule row on flush.
+        node.habit_schedule = None
+        await self.session.flush()
+        after_commit(self.session, invalidate_habit_stats, user_id)
 
     async def _ensure_track_owned(self, user_id: UUID, track_id: UUID) -> None:
         stmt = select(Track.id).where(Track.id == track_id, Track.user_id == user_id)
@@ -191,37 +218,19 @@ class NodeService:
         current = await self.session.scalar(stmt)
         return (current or 0) + 1
 
-    async def _upsert_schedule(
-        self,
-        node: Node,
-        payload: HabitSchedulePayload,
-    ) -> HabitSchedule:
+    @staticmethod
+    def _upsert_schedule(node: Node, payload: HabitSchedulePayload) -> HabitSchedule:
         meta = payload.to_meta()
         if node.habit_schedule is None:
-            schedule = HabitSchedule(
-                node_id=node.id,
-                frequency=payload.frequency,
-                meta=meta,
-            )
-            async with self.session.begin():
-                self.session.add(schedule)
+            schedule = HabitSchedule(frequency=payload.frequency, meta=meta)
             node.habit_schedule = schedule
             return schedule
 
         schedule = node.habit_schedule
         schedule.frequency = payload.frequency
         schedule.meta = meta
-        async with self.session.begin():
-            self.session.add(schedule)
         return schedule
 
-    async def _remove_schedule(self, node: Node) -> None:
-        if node.habit_schedule is None:
-            return
-        async with self.session.begin():
-            await self.session.delete(node.habit_schedule)
-        node.habit_schedule = None
-
 
 def get_node_service(
     session: AsyncSession = Depends(get_async_session),
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, ExceptionContext
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+__all__ = [
+    "CHECKOUT_WAIT_BUCKETS",
+    "InstrumentedAsyncQueuePool",
+    "PoolMetrics",
+    "instrument_engine",
+    "pool_snapshot",
+]
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf.
+CHECKOUT_WAIT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class PoolMetrics:
+    """Counters of one connection pool in this worker process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.wait_count = 0
+        self.checkout_timeouts = 0
+        self.pre_ping_failures = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        index = bisect.bisect_left(CHECKOUT_WAIT_BUCKETS, seconds)
+        with self._lock:
+            self.wait_buckets[index] += 1
+            self.wait_sum += seconds
+            self.wait_count += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def record_pre_ping_failure(self) -> None:
+        with self._lock:
+            self.pre_ping_failures += 1
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(
+                (*CHECKOUT_WAIT_BUCKETS, float("inf")),
+                self.wait_buckets,
+            ):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            data: dict[str, Any] = {
+                "pid": os.getpid(),
+                "checkout_wait_seconds": {
+                    "buckets": buckets,
+                    "sum": self.wait_sum,
+                    "count": self.wait_count,
+                },
+                "checkout_timeouts": self.checkout_timeouts,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            data.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=pool.overflow(),
+            )
+        return data
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout, including waits for a slot."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - started)
+
+
+def pool_snapshot(pool: Pool) -> dict[str, Any]:
+    metrics = getattr(pool, "metrics", None) or PoolMetrics()
+    return metrics.snapshot(pool)
+
+
+def _on_error(context: ExceptionContext) -> None:
+    if context.is_pre_ping and context.engine is not None:
+        metrics = getattr(context.engine.pool, "metrics", None)
+        if metrics is not None:
+            metrics.record_pre_ping_failure()
+
+
+def instrument_engine(engine: Engine) -> None:
+    event.listen(engine, "handle_error", _on_error)
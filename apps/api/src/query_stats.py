@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExceptionContext, ExecutionContext
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+__all__ = [
+    "QueryBudgetExceeded",
+    "QueryStats",
+    "QueryStatsMiddleware",
+    "collect_query_stats",
+    "current_query_stats",
+    "query_budget",
+    "route_template",
+    "track_queries",
+]
+
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def route_template(scope: Scope | None) -> str:
+    # Set by FastAPI once a route matched; unmatched paths share one label so
+    # scanners cannot blow up the number of distinct values.
+    route = scope.get("route") if scope is not None else None
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class QueryStats:
+    """Statements executed on behalf of one unit of work, usually a request."""
+
+    __slots__ = ("budget", "count", "duration", "over_budget", "scope")
+
+    def __init__(
+        self,
+        scope: Scope | None = None,
+        budget: int | None = None,
+    ) -> None:
+        self.scope = scope
+        self.budget = budget
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.over_budget = False
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.duration += seconds
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+@contextmanager
+def collect_query_stats(scope: Scope | None = None) -> Iterator[QueryStats]:
+    """Attribute every statement executed in this context to a fresh
+    ``QueryStats``.
+
+    SQLAlchemy runs driver calls in greenlets that share the caller's
+    context, so statements issued through ``AsyncSession`` are counted too.
+    """
+    stats = QueryStats(scope, budget=settings.DATABASE_QUERY_BUDGET)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def query_budget(limit: int) -> Callable[[], None]:
+    """Route dependency overriding ``DATABASE_QUERY_BUDGET`` for one route."""
+
+    def set_budget() -> None:
+        stats = _current.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return set_budget
+
+
+def _check_budget(stats: QueryStats) -> None:
+    if stats.budget is None or stats.count < stats.budget or stats.over_budget:
+        return
+    stats.over_budget = True
+    message = f"{stats.route} exceeded its budget of {stats.budget} queries"
+    if settings.ENVIRONMENT.is_testing:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
+
+
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    stats = _current.get()
+    if stats is not None:
+        _check_budget(stats)
+    # Keyed by statement so a failure after ``_after_cursor_execute`` popped
+    # it leaves the stack alone.
+    started = conn.info.setdefault("query_started", [])
+    started.append((context, time.perf_counter()))
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext,
+    executemany: bool,
+) -> None:
+    _, started_at = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started_at
+    stats = _current.get()
+    if stats is not None:
+        stats.record(elapsed)
+    if elapsed * 1000 >= settings.DATABASE_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else "-",
+            statement,
+        )
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # A failed statement never reaches ``_after_cursor_execute``.
+    conn = context.connection
+    if conn is None or context.execution_context is None:
+        return
+    started = conn.info.get("query_started")
+    if started and started[-1][0] is context.execution_context:
+        started.pop()
+
+
+def track_queries(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """Collects SQL usage per request and reports it in ``Server-Timing``.
+
+    Statements issued after the response started, e.g. by a streaming body,
+    are still counted but cannot be included in the header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_query_stats(scope) as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("server-timing", stats.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
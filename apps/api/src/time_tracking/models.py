@@ -52,6 +52,13 @@ class TimeEntry(Base):
     __table_args__ = (
         Index("idx_time_entry_user", "user_id"),
         Index("idx_time_entry_node", "node_id"),
+        # At most one running timer per user; also serves the active lookup.
+        Index(
+            "idx_time_entry_active",
+            "user_id",
+            unique=True,
+            postgresql_where=ended_at.is_(None),
+        ),
         Index(
             "idx_time_entry_date",
             func.date_trunc("day", started_at),
@@ -2,9 +2,13 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+from src.fieldsets import Embed, Selection, fieldset
+from src.nodes.schemas import NodePublic
+from src.time_tracking.models import TimeEntry
 from src.time_tracking.schemas import (
     ManualTimeEntryRequest,
     StartTimeEntryRequest,
@@ -18,6 +22,11 @@ from src.time_tracking.services import (
 
 router = APIRouter(prefix="/time-entries", tags=["time-tracking"])
 
+entry_fields = fieldset(
+    TimeEntryPublic,
+    embeds={"node": Embed("node", NodePublic, many=False)},
+)
+
 
 @router.post(
     "/start",
@@ -33,6 +42,19 @@ async def start_time_entry(
     return TimeEntryPublic.model_validate(entry)
 
 
+@router.get(
+    "/active",
+    response_model=TimeEntryPublic | None,
+    dependencies=[Depends(prefer_replica)],
+)
+async def get_active_entry(
+    current_user: CurrentUser,
+    service: TimeTrackingService = Depends(get_time_tracking_service),
+) -> TimeEntryPublic | None:
+    entry = await service.get_active_entry(current_user.id)
+    return TimeEntryPublic.model_validate(entry) if entry else None
+
+
 @router.post("/{entry_id}/stop", response_model=TimeEntryPublic)
 async def stop_time_entry(
     entry_id: UUID,
@@ -53,22 +75,32 @@ async def create_manual_entry(
     return TimeEntryPublic.model_validate(entry)
 
 
-@router.get("", response_model=list[TimeEntryPublic])
+@router.get(
+    "",
+    response_model=list[TimeEntryPublic],
+    dependencies=[Depends(prefer_replica)],
+)
 async def list_entries(
     current_user: CurrentUser,
     service: TimeTrackingService = Depends(get_time_tracking_service),
     node_id: UUID | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
-) -> list[TimeEntryPublic]:
+    selection: Selection = Depends(entry_fields),
+) -> list[TimeEntryPublic] | Response:
     entries = await service.list_entries(
         current_user.id,
         node_id=node_id,
         limit=limit,
+        options=selection.options(TimeEntry),
     )
-    return [TimeEntryPublic.model_validate(entry) for entry in entries]
+    return selection.render(entries)
 
 
-@router.get("/summary", response_model=list[TimeEntrySummaryItem])
+@router.get(
+    "/summary",
+    response_model=list[TimeEntrySummaryItem],
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_summary(
     current_user: CurrentUser,
     service: TimeTrackingService = Depends(get_time_tracking_service),
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 from datetime import UTC, date, datetime, timedelta
+from typing import Sequence
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import Select, func, select
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
-from src.badges.services import BadgeService
+from src.activity.services import record_activity
+from src.counters import adjust_node_counters
 from src.database import get_async_session
 from src.exceptions import BadRequest, Conflict, NotFound
+from src.jobs.models import JobKind
+from src.jobs.queue import enqueue
 from src.nodes.models import Node
 from src.time_tracking.models import TimeEntry
-from src.time_tracking.schemas import ManualTimeEntryRequest
+from src.time_tracking.schemas import ManualTimeEntryRequest, TimeEntryPublic
 from src.tracks.models import Track
+from src.user_events import EventType, publish
 
 __all__ = [
     "TimeTrackingService",
@@ -22,39 +29,56 @@ __all__ = [
 
 
 class TimeTrackingService:
-    def __init__(
-        self,
-        session: AsyncSession,
-        badge_service: BadgeService | None = None,
-    ):
+    def __init__(self, session: AsyncSession):
         self.session = session
-        self.badge_service = badge_service
 
     async def start_entry(self, user_id: UUID, node_id: UUID) -> TimeEntry:
         await self._ensure_node_owned(user_id, node_id)
-        active_entry = await self._get_active_entry(user_id)
-        if active_entry:
-            raise Conflict(detail="An active timer already exists")
-        entry = TimeEntry(
-            user_id=user_id,
-            node_id=node_id,
-            started_at=datetime.now(UTC),
+        # idx_time_entry_active turns a concurrent second start into a no-op.
+        stmt = (
+            insert(TimeEntry)
+            .values(user_id=user_id, node_id=node_id, started_at=datetime.now(UTC))
+            .on_conflict_do_nothing(
+                index_elements=[TimeEntry.user_id],
+                index_where=TimeEntry.ended_at.is_(None),
+            )
+            .returning(TimeEntry)
         )
-        async with self.session.begin():
-            self.session.add(entry)
-        await self.session.refresh(entry)
+        entry = await self.session.scalar(stmt)
+        if entry is None:
+            raise Conflict(detail="An active timer already exists")
+        await self._publish_timer(entry)
         return entry
 
+    async def get_active_entry(self, user_id: UUID) -> TimeEntry | None:
+        stmt = select(TimeEntry).where(
+            TimeEntry.user_id == user_id,
+            TimeEntry.ended_at.is_(None),
+        )
+        return await self.session.scalar(stmt)
+
     async def stop_entry(self, user_id: UUID, entry_id: UUID) -> TimeEntry:
-        entry = await self._get_entry(user_id, entry_id)
-        if entry.ended_at is not None:
+        # Only the request whose UPDATE still finds the timer running stops
+        # it; a concurrent stop waits for it and then matches no row, so the
+        # minutes are recorded once.
+        stmt = (
+            update(TimeEntry)
+            .where(
+                TimeEntry.id == entry_id,
+                TimeEntry.user_id == user_id,
+                TimeEntry.ended_at.is_(None),
+            )
+            .values(ended_at=datetime.now(UTC))
+            .returning(TimeEntry)
+            .execution_options(populate_existing=True)
+        )
+        entry = await self.session.scalar(stmt)
+        if entry is None:
+            await self._get_entry(user_id, entry_id)
             raise BadRequest(detail="Timer already stopped")
-        entry.ended_at = datetime.now(UTC)
-        async with self.session.begin():
-            self.session.add(entry)
-            await self.session.flush()
-            await self._evaluate_time_badges(user_id)
-        await self.session.refresh(entry)
+        await self._record_minutes(entry)
+        await enqueue(self.session, JobKind.EVALUATE_BADGES, user_id)
+        await self._publish_timer(entry)
         return entry
 
     async def create_manual_entry(
@@ -71,11 +95,10 @@ class TimeTrackingService:
             started_at=payload.started_at,
             ended_at=payload.ended_at,
         )
-        async with self.session.begin():
-            self.session.add(entry)
-            await self.session.flush()
-            await self._evaluate_time_badges(user_id)
-        await self.session.refresh(entry)
+        self.session.add(entry)
+        await self.session.flush()
+        await self._record_minutes(entry)
+        await enqueue(self.session, JobKind.EVALUATE_BADGES, user_id)
         return entry
 
     async def list_entries(
@@ -84,9 +107,10 @@ class TimeTrackingService:
         *,
         node_id: UUID | None = None,
         limit: int = 50,
+        options: Sequence[ORMOption] = (),
     ) -> list[TimeEntry]:
-        stmt: Select[tuple[TimeEntry]] = select(TimeEntry).where(
-            TimeEntry.user_id == user_id
+        stmt: Select[tuple[TimeEntry]] = (
+            select(TimeEntry).where(TimeEntry.user_id == user_id).options(*options)
         )
         if node_id:
             stmt = stmt.where(TimeEntry.node_id == node_id)
@@ -115,9 +139,7 @@ class TimeTrackingService:
             .order_by(func.date_trunc("day", TimeEntry.started_at).desc())
         )
         rows = await self.session.execute(stmt)
-        return [
-            (row.node_id, row.day.date(), int(row.minutes)) for row in rows
-        ]
+        return [(row.node_id, row.day.date(), int(row.minutes)) for row in rows]
 
     async def total_logged_minutes(self, user_id: UUID) -> int:
         stmt = select(func.coalesce(func.sum(TimeEntry.duration_min), 0)).where(
@@ -147,27 +169,28 @@ class TimeTrackingService:
             raise NotFound(detail="Time entry not found")
         return entry
 
-    async def _get_active_entry(self, user_id: UUID) -> TimeEntry | None:
-        stmt = (
-            select(TimeEntry)
-            .where(TimeEntry.user_id == user_id, TimeEntry.ended_at.is_(None))
-            .order_by(TimeEntry.started_at.desc())
-            .limit(1)
+    async def _publish_timer(self, entry: TimeEntry) -> None:
+        # A stopped timer is sent with its ended_at set.
+        await publish(
+            self.session,
+            entry.user_id,
+            EventType.TIMER,
+            TimeEntryPublic.model_validate(entry),
         )
-        return await self.session.scalar(stmt)
 
-    async def _evaluate_time_badges(self, user_id: UUID) -> None:
-        if not self.badge_service:
-            return
-        total_minutes = await self.total_logged_minutes(user_id)
-        await self.badge_service.evaluate_badges(
-            user_id,
-            time_minutes=total_minutes,
+    async def _record_minutes(self, entry: TimeEntry) -> None:
+        # duration_min is computed by the database and returned by the flush.
+        minutes = entry.duration_min or 0
+        await adjust_node_counters(self.session, entry.node_id, minutes=minutes)
+        await record_activity(
+            self.session,
+            entry.user_id,
+            entry.started_at.astimezone(UTC).date(),
+            minutes=minutes,
         )
 
 
 def get_time_tracking_service(
     session: AsyncSession = Depends(get_async_session),
 ) -> TimeTrackingService:
-    badge_service = BadgeService(session)
-    return TimeTrackingService(session, badge_service)
+    return TimeTrackingService(session)
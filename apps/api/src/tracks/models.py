@@ -37,6 +37,18 @@ class Track(Base):
         nullable=False,
         server_default="0",
     )
+    # Maintained through ``src.counters``; ``python -m src.tracks.recount``
+    # repairs drift.
+    node_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
+    completion_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="0",
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -50,6 +62,7 @@ class Track(Base):
     user: Mapped["User"] = relationship(lazy="joined")
     nodes: Mapped[list["Node"]] = relationship(
         back_populates="track",
+        order_by="[Node.position, Node.created_at]",
         cascade="all, delete-orphan",
         passive_deletes=True,
     )
@@ -0,0 +1,174 @@
+"""Repair the counters on ``track`` and ``node``.
+
+    python -m src.tracks.recount [--chunk-size N] [--dry-run]
+
+Writers keep the counters current through ``src.counters``; this recounts
+them from ``node``, ``node_completion`` and ``time_entry`` after manual
+fixes or a bug. Rows are locked chunk by chunk before counting, so writes in
+flight either finish first and are counted or wait and apply on top of the
+repair.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections.abc import Mapping, Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.completions.models import NodeCompletion
+from src.database import Base, engine
+from src.nodes.models import Node
+from src.time_tracking.models import TimeEntry
+from src.tracks.models import Track
+
+__all__ = ["recount_counters"]
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1_000
+
+
+def _track_counts() -> dict[str, ColumnElement[Any]]:
+    return {
+        "node_count": select(func.count())
+        .where(Node.track_id == Track.id)
+        .scalar_subquery(),
+        "completion_count": select(func.count())
+        .select_from(NodeCompletion)
+        .join(Node, Node.id == NodeCompletion.node_id)
+        .where(Node.track_id == Track.id, NodeCompletion.user_id == Track.user_id)
+        .scalar_subquery(),
+    }
+
+
+def _node_counts() -> dict[str, ColumnElement[Any]]:
+    return {
+        "completion_count": select(func.count())
+        .where(NodeCompletion.node_id == Node.id)
+        .scalar_subquery(),
+        "last_completed_at": select(func.max(NodeCompletion.completed_at))
+        .where(NodeCompletion.node_id == Node.id)
+        .scalar_subquery(),
+        "tracked_minutes": select(func.coalesce(func.sum(TimeEntry.duration_min), 0))
+        .where(TimeEntry.node_id == Node.id)
+        .scalar_subquery(),
+    }
+
+
+async def _repair_chunk(
+    connection: AsyncConnection,
+    model: type[Base],
+    counts: Mapping[str, ColumnElement[Any]],
+    after: UUID | None,
+    chunk_size: int,
+) -> tuple[list[UUID], int]:
+    """Lock and recount the next chunk; returns its ids and the rows fixed."""
+    stmt = select(model.id).order_by(model.id).limit(chunk_size).with_for_update()
+    if after is not None:
+        stmt = stmt.where(model.id > after)
+    ids = list(await connection.scalars(stmt))
+    if not ids:
+        return [], 0
+
+    result = await connection.execute(
+        update(model)
+        .where(
+            model.id.in_(ids),
+            or_(
+                *(
+                    getattr(model, name).is_distinct_from(count)
+                    for name, count in counts.items()
+                )
+            ),
+        )
+        .values(**counts, updated_at=model.updated_at)
+    )
+    return ids, result.rowcount
+
+
+async def _recount(
+    connection: AsyncConnection,
+    model: type[Base],
+    counts: Mapping[str, ColumnElement[Any]],
+    *,
+    chunk_size: int,
+    dry_run: bool,
+) -> int:
+    checked = repaired = 0
+    after: UUID | None = None
+    while True:
+        ids, fixed = await _repair_chunk(connection, model, counts, after, chunk_size)
+        if dry_run:
+            await connection.rollback()
+        else:
+            await connection.commit()
+        if not ids:
+            break
+        after = ids[-1]
+        checked += len(ids)
+        repaired += fixed
+        logger.info(
+            "Checked %d %s rows, %d repaired",
+            checked,
+            model.__tablename__,
+            repaired,
+        )
+    return repaired
+
+
+async def recount_counters(
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> int:
+    """Recount every track and node; returns the number that had drifted."""
+    started = time.perf_counter()
+    repaired = 0
+    async with engine.connect() as connection:
+        for model, counts in ((Track, _track_counts()), (Node, _node_counts())):
+            repaired += await _recount(
+                connection,
+                model,
+                counts,
+                chunk_size=chunk_size,
+                dry_run=dry_run,
+            )
+
+    logger.info(
+        "Repaired %d rows in %.1fs%s",
+        repaired,
+        time.perf_counter() - started,
+        " (dry run)" if dry_run else "",
+    )
+    return repaired
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="rows locked and recounted per transaction",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="report drifted rows but roll back the repairs",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(recount_counters(chunk_size=args.chunk_size, dry_run=args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
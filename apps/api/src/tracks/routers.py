@@ -5,43 +5,46 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, Response, status
 
 from src.auth.dependencies import CurrentUser
+from src.database import prefer_replica
+from src.docs.schemas import DocPublic
+from src.fieldsets import Embed, Selection, fieldset
+from src.nodes.schemas import NodePublic
+from src.tracks.models import Track
 from src.tracks.schemas import (
     TrackCreate,
     TrackListItem,
     TrackReorderRequest,
-    TrackStats,
     TrackUpdate,
 )
-from src.tracks.services import TrackService, get_track_service
+from src.tracks.services import TrackAggregate, TrackService, get_track_service
 
 router = APIRouter(prefix="/tracks", tags=["tracks"])
 
+track_fields = fieldset(
+    TrackListItem,
+    sources={"stats": ("node_count", "completion_count")},
+    embeds={
+        "nodes": Embed("nodes", NodePublic),
+        "docs": Embed("docs", DocPublic),
+    },
+)
 
-@router.get("", response_model=list[TrackListItem])
+
+@router.get(
+    "",
+    response_model=list[TrackListItem],
+    dependencies=[Depends(prefer_replica)],
+)
 async def list_tracks(
     current_user: CurrentUser,
     service: TrackService = Depends(get_track_service),
-) -> list[TrackListItem]:
-    aggregates = await service.list_tracks(current_user.id)
-    response: list[TrackListItem] = []
-    for aggregate in aggregates:
-        track = aggregate.track
-        response.append(
-            TrackListItem(
-                id=track.id,
-                name=track.name,
-                color=track.color,
-                icon=track.icon,
-                position=track.position,
-                created_at=track.created_at,
-                updated_at=track.updated_at,
-                stats=TrackStats(
-                    node_count=aggregate.node_count,
-                    completion_count=aggregate.completion_count,
-                ),
-            )
-        )
-    return response
+    selection: Selection = Depends(track_fields),
+) -> list[TrackListItem] | Response:
+    aggregates = await service.list_tracks(
+        current_user.id,
+        options=selection.options(Track),
+    )
+    return selection.render(aggregates)
 
 
 @router.post(
@@ -55,39 +58,21 @@ async def create_track(
     service: TrackService = Depends(get_track_service),
 ) -> TrackListItem:
     track = await service.create_track(current_user.id, payload)
-    return TrackListItem(
-        id=track.id,
-        name=track.name,
-        color=track.color,
-        icon=track.icon,
-        position=track.position,
-        created_at=track.created_at,
-        updated_at=track.updated_at,
-        stats=TrackStats(node_count=0, completion_count=0),
-    )
+    return TrackAggregate(track).to_list_item()
 
 
-@router.get("/{track_id}", response_model=TrackListItem)
+@router.get(
+    "/{track_id}",
+    response_model=TrackListItem,
+    dependencies=[Depends(prefer_replica)],
+)
 async def get_track(
     track_id: UUID,
     current_user: CurrentUser,
     service: TrackService = Depends(get_track_service),
 ) -> TrackListItem:
     aggregate = await service.get_track_with_stats(current_user.id, track_id)
-    track = aggregate.track
-    return TrackListItem(
-        id=track.id,
-        name=track.name,
-        color=track.color,
-        icon=track.icon,
-        position=track.position,
-        created_at=track.created_at,
-        updated_at=track.updated_at,
-        stats=TrackStats(
-            node_count=aggregate.node_count,
-            completion_count=aggregate.completion_count,
-        ),
-    )
+    return aggregate.to_list_item()
 
 
 @router.patch("/{track_id}", response_model=TrackListItem)
@@ -98,20 +83,7 @@ async def update_track(
     service: TrackService = Depends(get_track_service),
 ) -> TrackListItem:
     track = await service.update_track(current_user.id, track_id, payload)
-    aggregate = await service.get_track_with_stats(current_user.id, track_id)
-    return TrackListItem(
-        id=track.id,
-        name=track.name,
-        color=track.color,
-        icon=track.icon,
-        position=track.position,
-        created_at=track.created_at,
-        updated_at=track.updated_at,
-        stats=TrackStats(
-            node_count=aggregate.node_count,
-            completion_count=aggregate.completion_count,
-        ),
-    )
+    return TrackAggregate(track).to_list_item()
 
 
 @router.delete(
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Sequence
+from typing import Any, Sequence
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy import Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.interfaces import ORMOption
 
-from src.completions.models import NodeCompletion
-from src.database import get_async_session
+from src.attachment_blobs import purge_orphaned_blobs
+from src.database import after_commit, get_async_session
 from src.exceptions import NotFound
-from src.nodes.models import Node
+from src.habits.cache import invalidate_habit_stats
 from src.tracks.models import Track
-from src.tracks.schemas import TrackCreate, TrackReorderItem, TrackUpdate
+from src.tracks.schemas import (
+    TrackCreate,
+    TrackListItem,
+    TrackReorderItem,
+    TrackStats,
+    TrackUpdate,
+)
 
 __all__ = [
     "TrackAggregate",
@@ -24,43 +31,43 @@ __all__ = [
 
 @dataclass(slots=True)
 class TrackAggregate:
+    """A track with its counters as ``stats``, shaped like ``TrackListItem``."""
+
     track: Track
-    node_count: int
-    completion_count: int
+
+    @property
+    def stats(self) -> TrackStats:
+        return TrackStats(
+            node_count=self.track.node_count,
+            completion_count=self.track.completion_count,
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Reads like a track, so schemas validate it from attributes.
+        return getattr(self.track, name)
+
+    def to_list_item(self) -> TrackListItem:
+        return TrackListItem.model_validate(self)
 
 
 class TrackService:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def list_tracks(self, user_id: UUID) -> list[TrackAggregate]:
-        stmt: Select[tuple[Track, int, int]] = (
-            select(
-                Track,
-                func.count(func.distinct(Node.id)).label("node_count"),
-                func.count(NodeCompletion.id).label("completion_count"),
-            )
-            .outerjoin(Node, Node.track_id == Track.id)
-            .outerjoin(
-                NodeCompletion,
-                (NodeCompletion.node_id == Node.id)
-                & (NodeCompletion.user_id == user_id),
-            )
+    async def list_tracks(
+        self,
+        user_id: UUID,
+        *,
+        options: Sequence[ORMOption] = (),
+    ) -> list[TrackAggregate]:
+        stmt: Select[tuple[Track]] = (
+            select(Track)
             .where(Track.user_id == user_id)
-            .group_by(Track.id)
             .order_by(Track.position, Track.created_at)
+            .options(*options)
         )
-        rows = await self.session.execute(stmt)
-        aggregates: list[TrackAggregate] = []
-        for row in rows:
-            aggregates.append(
-                TrackAggregate(
-                    track=row.Track,
-                    node_count=int(row.node_count or 0),
-                    completion_count=int(row.completion_count or 0),
-                )
-            )
-        return aggregates
+        tracks = await self.session.scalars(stmt)
+        return [TrackAggregate(track) for track in tracks]
 
     async def create_track(self, user_id: UUID, payload: TrackCreate) -> Track:
         next_position = await self._next_position(user_id)
@@ -71,8 +78,8 @@ class TrackService:
             icon=payload.icon,
             position=next_position,
         )
-        async with self.session.begin():
-            self.session.add(track)
+        self.session.add(track)
+        await self.session.flush()
         return track
 
     async def get_track(self, user_id: UUID, track_id: UUID) -> Track:
@@ -90,30 +97,7 @@ class TrackService:
         user_id: UUID,
         track_id: UUID,
     ) -> TrackAggregate:
-        stmt: Select[tuple[Track, int, int]] = (
-            select(
-                Track,
-                func.count(func.distinct(Node.id)).label("node_count"),
-                func.count(NodeCompletion.id).label("completion_count"),
-            )
-            .outerjoin(Node, Node.track_id == Track.id)
-            .outerjoin(
-                NodeCompletion,
-                (NodeCompletion.node_id == Node.id)
-                & (NodeCompletion.user_id == user_id),
-            )
-            .where(Track.id == track_id, Track.user_id == user_id)
-            .group_by(Track.id)
-        )
-        row = await self.session.execute(stmt)
-        record = row.first()
-        if record is None:
-            raise NotFound(detail="Track not found")
-        return TrackAggregate(
-            track=record.Track,
-            node_count=int(record.node_count or 0),
-            completion_count=int(record.completion_count or 0),
-        )
+        return TrackAggregate(await self.get_track(user_id, track_id))
 
     async def update_track(
         self,
@@ -130,14 +114,17 @@ class TrackService:
             track.icon = payload.icon
         if payload.position is not None:
             track.position = payload.position
-        async with self.session.begin():
-            self.session.add(track)
+        await self.session.flush()
         return track
 
     async def delete_track(self, user_id: UUID, track_id: UUID) -> None:
         track = await self.get_track(user_id, track_id)
-        async with self.session.begin():
-            await self.session.delete(track)
+        await self.session.delete(track)
+        await self.session.flush()
+        # Deleting the track deletes its docs and so their attachments.
+        await purge_orphaned_blobs(self.session, user_id)
+        # And its nodes, habits among them.
+        after_commit(self.session, invalidate_habit_stats, user_id)
 
     async def reorder_tracks(
         self,
@@ -156,10 +143,7 @@ class TrackService:
 
         for item in updates:
             tracks[item.track_id].position = item.position
-
-        async with self.session.begin():
-            for track in tracks.values():
-                self.session.add(track)
+        await self.session.flush()
 
     async def _next_position(self, user_id: UUID) -> int:
         stmt = select(func.max(Track.position)).where(Track.user_id == user_id)
@@ -0,0 +1,186 @@
+"""Live per-user events over Postgres ``LISTEN/NOTIFY``.
+
+Writers ``publish`` inside their transaction, so an event is delivered
+exactly when the change commits. Every process keeps one listening
+connection and fans notifications out to the subscriptions of its own
+clients; each subscription buffers a bounded number of messages.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from enum import Enum
+from uuid import UUID
+
+import asyncpg
+from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+
+__all__ = [
+    "EventBroker",
+    "EventType",
+    "Subscription",
+    "broker",
+    "format_event",
+    "publish",
+]
+
+CHANNEL = "user_events"
+
+logger = logging.getLogger(__name__)
+
+
+class EventType(str, Enum):
+    STATS = "stats"
+    TIMER = "timer"
+    BADGE = "badge"
+    # Events may have been missed; clients refetch their state.
+    RESYNC = "resync"
+
+
+def format_event(event: EventType, data: BaseModel | dict | None) -> str:
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    return f"event: {event.value}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def publish(
+    session: AsyncSession,
+    user_id: UUID,
+    event: EventType,
+    data: BaseModel | None,
+) -> None:
+    """Send ``event`` to the user's open streams once the transaction commits."""
+    payload = json.dumps(
+        {
+            "user_id": str(user_id),
+            "event": event.value,
+            "data": data.model_dump(mode="json") if data is not None else None,
+        },
+        separators=(",", ":"),
+    )
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    """Messages for one stream; the oldest are dropped when it falls behind.
+
+    Events carry full state (stats, the timer), so a newer one supersedes
+    what a slow client missed.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+
+    def push(self, message: str) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    async def next(self, timeout: float) -> str | None:
+        """The next message, or ``None`` after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+
+class EventBroker:
+    def __init__(self, dsn: str, *, buffer_size: int):
+        self.dsn = dsn
+        self.buffer_size = buffer_size
+        self._subscriptions: dict[UUID, set[Subscription]] = defaultdict(set)
+        self._listener: asyncio.Task[None] | None = None
+        self._listening = asyncio.Event()
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: UUID) -> AsyncIterator[Subscription]:
+        """Register a stream; the listener starts with the first one.
+
+        Waits briefly for the listener, so state read after subscribing
+        cannot miss an event committed in between.
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        subscription = Subscription(self.buffer_size)
+        self._subscriptions[user_id].add(subscription)
+        try:
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._listening.wait(), 5)
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions[user_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[user_id]
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _listen(self) -> None:
+        delay, reconnect = 1.0, False
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                try:
+                    await connection.add_listener(CHANNEL, self._on_notification)
+                    self._listening.set()
+                    if reconnect:
+                        self._broadcast(format_event(EventType.RESYNC, None))
+                    delay, reconnect = 1.0, True
+                    await lost.wait()
+                finally:
+                    self._listening.clear()
+                    await connection.close(timeout=5)
+                logger.warning("Event listener lost its connection")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as exc:
+                logger.warning("Event listener cannot connect: %s", exc)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def _on_notification(
+        self,
+        _connection: asyncpg.Connection,
+        _pid: int,
+        _channel: str,
+        payload: str,
+    ) -> None:
+        if not self._subscriptions:
+            return
+        message = json.loads(payload)
+        subscriptions = self._subscriptions.get(UUID(message["user_id"]))
+        if not subscriptions:
+            return
+        formatted = format_event(EventType(message["event"]), message["data"])
+        for subscription in subscriptions:
+            subscription.push(formatted)
+
+    def _broadcast(self, message: str) -> None:
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.push(message)
+
+
+def _listen_dsn() -> str:
+    url = make_url(
+        str(settings.DATABASE_LISTEN_ASYNC_URL or settings.DATABASE_ASYNC_URL)
+    )
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+broker = EventBroker(_listen_dsn(), buffer_size=settings.EVENTS_BUFFER_SIZE)
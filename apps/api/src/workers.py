@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from uvicorn.workers import UvicornWorker
+
+__all__ = ["UvloopWorker"]
+
+
+class UvloopWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools.
+
+    ``UvicornWorker`` uses them only if they can be imported; pinning turns a
+    missing ``uvicorn[standard]`` extra into a boot error instead of a quiet
+    fallback to asyncio and h11.
+    """
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "loop": "uvloop",
+        "http": "httptools",
+    }